@@ -0,0 +1,58 @@
+"""Compare the mixer level separation formulations on the 5-product study.
+
+Each formulation is built and solved from the same initial point; the table
+reports status, objective, Ipopt iterations (where the log has them) and
+wall time. ``bigm`` needs a MINLP solver such as Bonmin or Couenne and
+``gdp`` is solved through its gdp.bigm transformation with the same solver.
+
+    python benchmarks/level_separation.py --executable /path/to/ipopt
+    python benchmarks/level_separation.py --modes bigm gdp --solver bonmin
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from pyomo.environ import TransformationFactory, value  # noqa: E402
+
+from portfolio_optimisation import (  # noqa: E402
+    DEFAULT_LEVEL_PAIRS, build_model, is_optimal, load_composition, make_solver, solve
+)
+from portfolio_optimisation.solve import ipopt_iterations  # noqa: E402
+
+
+def run(df, mode, solver):
+    model = build_model(df, level_pairs=DEFAULT_LEVEL_PAIRS, level_separation=mode)
+    if mode == 'gdp':
+        TransformationFactory('gdp.bigm').apply_to(model)
+    with tempfile.NamedTemporaryFile('r', suffix='.log') as log:
+        t0 = time.perf_counter()
+        result = solve(model, solver, logfile=log.name)
+        seconds = time.perf_counter() - t0
+        iterations = ipopt_iterations(log.read())
+    objective = value(model.objective) if is_optimal(result) else float('nan')
+    return str(result.solver.termination_condition), objective, iterations, seconds
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--modes', nargs='+', default=['abs', 'ordered'])
+    parser.add_argument('--solver', default='ipopt')
+    parser.add_argument('--executable', default=None)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args(argv)
+
+    df = load_composition()
+    solver = make_solver(args.solver, args.executable)
+    print(f"{'mode':<10}{'status':<18}{'objective':>12}{'iters':>8}{'seconds':>10}")
+    for mode in args.modes:
+        for _ in range(args.repeat):
+            status, objective, iterations, seconds = run(df, mode, solver)
+            print(f'{mode:<10}{status:<18}{objective:>12.4f}{str(iterations):>8}{seconds:>10.3f}')
+
+
+if __name__ == '__main__':
+    main()
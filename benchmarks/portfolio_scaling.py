@@ -0,0 +1,189 @@
+"""Time every phase of a run on synthetic portfolios of growing size.
+
+For each products x RMs case the phases are timed separately: composition
+load, synthetic portfolio generation, model build, presolve, NL write, the
+optional heuristic, the solve (when a solver is available), result
+extraction and optional chart rendering. Ipopt iterations, objective and
+problem size are recorded alongside, so a run can be stored with ``--json``
+and compared against a stored baseline with ``--baseline``; the script exits
+with status 1 when a phase got slower than ``--threshold`` times the
+baseline or an objective moved. ``--profile`` adds the per-component
+expression profile of every case, to see which blocks grow fastest.
+``--scaling`` solves every case a second time from the same start with the
+automatic scale factors, to compare iterations and solve time.
+
+    python benchmarks/portfolio_scaling.py --products 5 20 --rms 23 200
+    python benchmarks/portfolio_scaling.py --json new.jsonl --baseline old.jsonl
+    python benchmarks/portfolio_scaling.py --products 5 --rms 23 --heuristic --report --executable /path/to/ipopt
+    python benchmarks/portfolio_scaling.py --products 5 50 --rms 200 --profile --no-solve
+    python benchmarks/portfolio_scaling.py --products 5 20 --rms 23 200 --heuristic --scaling
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from dataclasses import replace
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from portfolio_optimisation import (  # noqa: E402
+    SolverConfig, SolverSession, build_model, extract_result, get_point, heuristic_start, is_optimal,
+    load_composition, presolve, profile_model, render_figures, set_point
+)
+from portfolio_optimisation.solve import ipopt_iterations  # noqa: E402
+from portfolio_optimisation.synthetic import synthetic_portfolio  # noqa: E402
+
+PHASES = ('load', 'generate', 'build', 'presolve', 'nl_write', 'profile', 'heuristic', 'solve', 'extract', 'report',
+          'scaling', 'scaled_solve')
+
+
+class _Timer:
+    def __init__(self, record):
+        self.record = record
+
+    def __call__(self, phase, fn, *args, **kwargs):
+        t0 = time.perf_counter()
+        out = fn(*args, **kwargs)
+        self.record[phase] = time.perf_counter() - t0
+        return out
+
+
+def _nl_write(model):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'model.nl')
+        model.write(path, format='nl')
+        return os.path.getsize(path)
+
+
+def _solve_case(record, timed, model, config, prefix=''):
+    # With config.scaling the session computes the scale factors, timed as the 'scaling' phase
+    session = timed('scaling', SolverSession, model, config) if config.scaling else SolverSession(model, config)
+    try:
+        result = timed(f'{prefix}solve', session.solve, capture_log=True)
+        record[f'{prefix}status'] = 'optimal' if is_optimal(result) else str(result.solver.termination_condition)
+    except Exception as exc:  # report the failure and keep benchmarking the other cases
+        record[f'{prefix}status'] = f'error: {exc}'
+    record[f'{prefix}iterations'] = ipopt_iterations(session.last_log)
+
+
+def run_case(n_products, n_rms, config, heuristic=False, report=False, profile=False, scaling=False, seed=0):
+    record = {'products': n_products, 'rms': n_rms}
+    timed = _Timer(record)
+    df = timed('load', load_composition)
+    df, build_kwargs = timed('generate', synthetic_portfolio, df, n_products, n_rms, seed)
+    model = timed('build', build_model, df, **build_kwargs)
+    presolved = timed('presolve', presolve, model)
+    record['fixed'] = len(presolved.fixed)
+    record['nl_bytes'] = timed('nl_write', _nl_write, model)
+    if profile:
+        record['components'] = {p.name: {'nodes': p.nodes, 'hessian_nnz': p.hessian_nnz, 'nl_bytes': p.nl_bytes}
+                                for p in timed('profile', profile_model, model)}
+
+    if heuristic:
+        start = timed('heuristic', heuristic_start, model, quick=True)
+        set_point(model, start.point)
+        record['heuristic_objective'] = start.objective
+
+    record['status'], record['iterations'], record['objective'] = 'skipped', None, None
+    start = get_point(model)
+    if config is not None:
+        _solve_case(record, timed, model, config)
+
+    solution = timed('extract', extract_result, model)
+    if record['status'] == 'optimal':
+        record['objective'] = solution.objective
+    if report:
+        timed('report', render_figures, solution)
+
+    if scaling and config is not None:
+        # Same start, scale factors computed on the presolved model
+        set_point(model, start)
+        try:
+            _solve_case(record, timed, model, replace(config, scaling=True), prefix='scaled_')
+        except (RuntimeError, ValueError) as exc:  # no backend reading scaling_factor suffixes
+            record['scaled_status'] = f'error: {exc}'
+        if record['scaled_status'] == 'optimal':
+            record['scaled_objective'] = extract_result(model).objective
+    return record
+
+
+def compare(records, baseline, threshold):
+    """Lines describing phases slower than ``threshold`` x baseline and changed objectives."""
+    previous = {(r['products'], r['rms']): r for r in baseline}
+    problems = []
+    for r in records:
+        old = previous.get((r['products'], r['rms']))
+        if old is None:
+            continue
+        case = f"{r['products']}x{r['rms']}"
+        for phase in PHASES:
+            # Ignore phases too short to time reliably
+            if phase in r and phase in old and old[phase] > 0.01 and r[phase] > threshold * old[phase]:
+                problems.append(f'{case} {phase}: {old[phase]:.3f}s -> {r[phase]:.3f}s')
+        if r.get('objective') is not None and old.get('objective') is not None:
+            if abs(r['objective'] - old['objective']) > 1e-4 * max(1.0, abs(old['objective'])):
+                problems.append(f"{case} objective: {old['objective']:.6f} -> {r['objective']:.6f}")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--products', nargs='+', type=int, default=[5, 20, 50, 200])
+    parser.add_argument('--rms', nargs='+', type=int, default=[23, 200, 1000])
+    parser.add_argument('--solver', default=None, help='solver backend, default: first available')
+    parser.add_argument('--executable', default=None)
+    parser.add_argument('--no-solve', action='store_true')
+    parser.add_argument('--heuristic', action='store_true', help='time the quick heuristic before the solve')
+    parser.add_argument('--report', action='store_true', help='time rendering of all charts')
+    parser.add_argument('--profile', action='store_true', help='record the expression profile of each case')
+    parser.add_argument('--scaling', action='store_true', help='solve again with the automatic scale factors')
+    parser.add_argument('--json', help='append one JSON line per case to this file')
+    parser.add_argument('--baseline', help='JSON lines file of an earlier run to compare against')
+    parser.add_argument('--threshold', type=float, default=1.25)
+    args = parser.parse_args(argv)
+
+    config = None
+    if not args.no_solve:
+        config = SolverConfig(backend=args.solver, executable=args.executable)
+        try:
+            config.resolve_backend()
+        except RuntimeError as exc:
+            print(f'not solving: {exc}')
+            config = None
+
+    columns = ('products', 'rms') + PHASES + ('nl_bytes', 'iterations', 'objective', 'status')
+    if args.scaling:
+        columns += ('scaled_iterations', 'scaled_objective', 'scaled_status')
+    widths = [max(11, len(c) + 1) for c in columns]
+    print(''.join(f'{c:>{w}}' for c, w in zip(columns, widths)))
+    records = []
+    for n_products in args.products:
+        for n_rms in args.rms:
+            record = run_case(n_products, n_rms, config, args.heuristic, args.report, args.profile, args.scaling)
+            records.append(record)
+            cells = []
+            for c, w in zip(columns, widths):
+                v = record.get(c)
+                cells.append(f'{v:>{w}.3f}' if isinstance(v, float) else f'{str(v if v is not None else "-"):>{w}}')
+            print(''.join(cells))
+            # The five components taking most of the .nl file
+            top = sorted(record.get('components', {}).items(), key=lambda kv: -kv[1]['nl_bytes'])[:5]
+            for name, sizes in top:
+                print(f"{'':>22}{name:<32}" + ''.join(f'{k} {v:<12}' for k, v in sizes.items()))
+            if args.json:
+                with open(args.json, 'a') as f:
+                    f.write(json.dumps(record) + '\n')
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            problems = compare(records, [json.loads(line) for line in f if line.strip()], args.threshold)
+        for line in problems:
+            print(f'REGRESSION {line}')
+        return 1 if problems else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
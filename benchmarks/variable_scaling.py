@@ -0,0 +1,132 @@
+"""Compare Ipopt iterations and solve time with and without the automatic scale factors.
+
+Every case is built and presolved, started from the same point (the quick
+heuristic unless ``--no-heuristic``) and solved three ways: unscaled, with
+Ipopt's user scaling read from the ``scaling_factor`` suffix
+(``SolverConfig(scaling=True)``, NL Ipopt and cyipopt only) and through the
+scaled copy of ``scaled_solve``. The table reports status, Ipopt iterations,
+solve time, objective and ``max_violation`` on the original model, per
+repetition. The script exits with status 1 when a scaled solve ends at
+another objective than the unscaled one or leaves the original model
+infeasible. The cases are the 5-product study and, with ``--products`` and
+``--rms``, synthetic portfolios.
+
+    python benchmarks/variable_scaling.py --executable /path/to/ipopt
+    python benchmarks/variable_scaling.py --products 5 20 --rms 23 200 --repeat 3 --json scaling.jsonl
+"""
+import argparse
+import json
+import os
+import sys
+from dataclasses import replace
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from portfolio_optimisation import (  # noqa: E402
+    DEFAULT_LEVEL_PAIRS, SolverConfig, SolverSession, Telemetry, build_model, default_products, extract_result,
+    heuristic_start, is_optimal, load_composition, presolve, scaled_solve, set_point
+)
+from portfolio_optimisation.synthetic import synthetic_portfolio  # noqa: E402
+
+METHODS = ('unscaled', 'suffix', 'scaled_solve')
+TOL = 1e-6
+
+
+def _build(df, build_kwargs, start):
+    model = build_model(df, **build_kwargs)
+    presolve(model)
+    if start is not None:
+        set_point(model, start)
+    return model
+
+
+def run(df, build_kwargs, method, config, start):
+    """Solve one fresh copy of the case; returns the record of the solve."""
+    events = []
+    telemetry = Telemetry(events.append)
+    model = _build(df, build_kwargs, start)
+    try:
+        if method == 'scaled_solve':
+            result = scaled_solve(model, config.create(), telemetry=telemetry)
+        else:
+            # The session computes the scale factors on the presolved model
+            session = SolverSession(model, replace(config, scaling=method == 'suffix'), telemetry=telemetry)
+            result = session.solve()
+    except (RuntimeError, ValueError) as exc:  # no backend reading scaling_factor suffixes
+        return {'method': method, 'status': f'error: {exc}'}
+    solve = [e for e in events if e['event'] == 'phase' and e['name'] == 'solve'][-1]
+    record = {'method': method, 'status': solve['status'], 'iterations': solve['iterations'],
+              'seconds': solve['seconds']}
+    if is_optimal(result):
+        solution = extract_result(model)
+        record.update(objective=solution.objective, max_violation=solution.max_violation)
+    return record
+
+
+def check(records, rtol):
+    """Lines describing scaled solves that moved the optimum or broke feasibility."""
+    problems = []
+    reference = [r['objective'] for r in records if r['method'] == 'unscaled' and 'objective' in r]
+    for r in records:
+        if 'objective' not in r:
+            continue
+        case = f"{r['case']} {r['method']}"
+        if r['max_violation'] > TOL:
+            problems.append(f"{case}: max_violation {r['max_violation']:.2e} on the original model")
+        if reference and abs(r['objective'] - reference[0]) > rtol * max(1.0, abs(reference[0])):
+            problems.append(f"{case}: objective {r['objective']:.6f}, unscaled {reference[0]:.6f}")
+    return problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--products', nargs='+', type=int, default=[])
+    parser.add_argument('--rms', nargs='+', type=int, default=[23])
+    parser.add_argument('--solver', default=None, help='solver backend, default: first available')
+    parser.add_argument('--executable', default=None)
+    parser.add_argument('--methods', nargs='+', choices=METHODS, default=list(METHODS))
+    parser.add_argument('--no-heuristic', action='store_true', help="start from the model's initial values")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--rtol', type=float, default=1e-6, help='objective tolerance against the unscaled solve')
+    parser.add_argument('--json', help='append one JSON line per solve to this file')
+    args = parser.parse_args(argv)
+
+    config = SolverConfig(backend=args.solver, executable=args.executable)
+    try:
+        config.resolve_backend()
+    except RuntimeError as exc:
+        print(f'not solving: {exc}')
+        return 0
+
+    df = load_composition()
+    cases = [('study', df, dict(products=default_products(), level_pairs=list(DEFAULT_LEVEL_PAIRS)))]
+    for n_products in args.products:
+        for n_rms in args.rms:
+            cases.append((f'{n_products}x{n_rms}',) + synthetic_portfolio(df, n_products, n_rms))
+
+    print(f"{'case':<12}{'method':<14}{'status':<18}{'iters':>8}{'seconds':>10}{'objective':>14}{'violation':>12}")
+    problems = []
+    for case, case_df, build_kwargs in cases:
+        start = None
+        if not args.no_heuristic:
+            start = heuristic_start(_build(case_df, build_kwargs, None), quick=True).point
+        records = []
+        for method in args.methods:
+            for _ in range(args.repeat):
+                record = {'case': case, **run(case_df, build_kwargs, method, config, start)}
+                records.append(record)
+                print(f"{case:<12}{method:<14}{record['status'][:17]:<18}{str(record.get('iterations', '-')):>8}"
+                      f"{record.get('seconds', float('nan')):>10.3f}{record.get('objective', float('nan')):>14.6f}"
+                      f"{record.get('max_violation', float('nan')):>12.2e}")
+                if args.json:
+                    with open(args.json, 'a') as f:
+                        f.write(json.dumps(record) + '\n')
+        problems += check(records, args.rtol)
+
+    for line in problems:
+        print(f'MISMATCH {line}')
+    return 1 if problems else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
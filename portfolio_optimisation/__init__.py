@@ -0,0 +1,26 @@
+from .cache import CacheKey, SolutionCache, cache_key, result_point
+from .data import load_composition
+from .decomposition import DecompositionResult, decomposition_solve
+from .evaluate import BatchEvaluator
+from .heuristic import HeuristicResult, heuristic_solve, heuristic_start
+from .incremental import (
+    activate_product, add_product, deactivate_product, drop_product, inactive_products, set_rm_bound, set_sub_bound,
+    set_systemic_constraint
+)
+from .model import build_model, mixer_SUB, portfolio_cost, prod_SUB, product_spec, total_prod_SUB, update_parameters
+from .multimixer import MultiMixerResult, build_multi_mixer_model, identical_mixers, multi_mixer_solve
+from .multistart import get_point, multistart, set_point
+from .portfolio import DEFAULT_LEVEL_PAIRS, MixerSpec, ProductSpec, default_products, product_table
+from .presolve import PresolveResult, fix_forbidden, presolve
+from .profiler import ComponentProfile, profile_model
+from .relaxation import GapCertificate, gap_certificate
+from .report import render_figures, report, scenario_reports, write_report, write_reports
+from .results import PortfolioResult, extract_result
+from .scaling import Scaling, apply_scaling, scaling_factors
+from .scenarios import read_scenarios, run_scenarios, scenario_grid
+from .solve import (
+    SolverConfig, SolverSession, available_backends, enable_warm_start, is_optimal, make_solver, resolve,
+    scaled_solve, solve
+)
+from .surrogate import QuadraticSurface
+from .telemetry import JsonLinesSink, Telemetry, parse_ipopt_log
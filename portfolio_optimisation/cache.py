@@ -0,0 +1,222 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import zlib
+from dataclasses import asdict, dataclass, is_dataclass
+
+import numpy as np
+from pyomo.environ import value
+
+from .evaluate import BatchEvaluator
+from .results import PortfolioResult
+
+# Evaluator arrays that, with the index labels, fix the optimisation problem of a built model
+_ARRAYS = ('composition', 'mixer_costs', 'post_mixer_costs', 'sri_threshold', 'mixer_forbidden', 'prod_forbidden')
+_SCALARS = ('quality_threshold', 'contaminant', 'contaminant_factor', 'contaminant_limit', 'contaminant_active',
+            'cost_scale', 'epsilon')
+_BOUNDS = ('mixer_bounds', 'rm_bounds', 'sub_bounds')
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS solutions (
+    key TEXT PRIMARY KEY,
+    composition TEXT NOT NULL,
+    source TEXT,
+    status TEXT,
+    objective REAL,
+    result BLOB NOT NULL,
+    bytes INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS solutions_accessed ON solutions (accessed);
+CREATE INDEX IF NOT EXISTS solutions_source ON solutions (source, composition);
+'''
+
+
+@dataclass(frozen=True)
+class CacheKey:
+    """SHA-256 digests of a model's inputs (with the solver settings) and of its composition alone."""
+    key: str
+    composition: str
+
+
+class _Digest:
+    # SHA-256 over named, typed fields, so equal inputs hash equally however they were given
+
+    def __init__(self):
+        self.hash = hashlib.sha256()
+
+    def add(self, name, data):
+        if isinstance(data, np.ndarray):
+            # + 0.0 folds -0.0 into 0.0
+            array = np.ascontiguousarray(data + 0.0 if data.dtype.kind == 'f' else data.astype(np.int64))
+            header = f'{name}:{array.dtype.str}:{array.shape}'
+            self.hash.update(header.encode() + b'\0' + array.tobytes())
+        else:
+            self.hash.update(f'{name}:{json.dumps(data, sort_keys=True, default=str)}'.encode() + b'\0')
+
+    def hexdigest(self):
+        return self.hash.hexdigest()
+
+
+def _composition_digest(ev):
+    digest = _Digest()
+    digest.add('rms', ev.rms)
+    digest.add('subs', ev.subs)
+    digest.add('composition', ev.composition)
+    return digest.hexdigest()
+
+
+def cache_key(model, solver=None, evaluator=None):
+    """Content hash of everything that determines the solution of ``model``.
+
+    The inputs are read back from the built model, like ``BatchEvaluator``
+    does: RM, SUB and product labels in model order, the composition
+    matrix, costs, thresholds, the contaminant limit and whether model_9 is
+    active, every RM and SUB bound, the forbidden RMs, the level pairs, the
+    level separation and, for ``'ordered'``, the level order. A model built from the same data, whether
+    directly, through ``update_parameters`` or through the incremental
+    edits, gets the same key. ``solver`` is any JSON-ready description of
+    the solve (a ``SolverConfig`` counts), so two methods never share an
+    entry. The starting point is not part of the key.
+    """
+    ev = BatchEvaluator(model) if evaluator is None else evaluator
+    digest = _Digest()
+    digest.add('labels', [ev.rms, ev.subs, ev.prods])
+    for name in _ARRAYS:
+        digest.add(name, np.asarray(getattr(ev, name)))
+    digest.add('scalars', [float(getattr(ev, name)) for name in _SCALARS])
+    # Bound rows and level pairs come in construction order, which depends on the edit history
+    for name in _BOUNDS:
+        positions, lower, upper = getattr(ev, name)
+        order = np.argsort(positions, kind='stable')
+        digest.add(name, np.stack([positions[order].astype(float), lower[order], upper[order]]))
+    # (p, q) and (q, p) separate the same levels; 'ordered' takes the direction from the level order
+    digest.add('level_pairs', sorted(sorted(pair) for pair in zip(ev.pair_i.tolist(), ev.pair_j.tolist())))
+    digest.add('level_separation', value(model.level_separation))
+    if model.component('level_rank') is not None:
+        # The order, not the rank values: drops and fractional inserts leave gaps in the ranks
+        rank = [value(model.level_rank[p]) for p in ev.prods]
+        digest.add('level_order', sorted(ev.prods, key=lambda p: rank[ev.prods.index(p)]))
+    digest.add('solver', asdict(solver) if is_dataclass(solver) else solver)
+    return CacheKey(digest.hexdigest(), _composition_digest(ev))
+
+
+def default_cache_path():
+    from .data import default_cache_dir
+    return default_cache_dir() / 'solutions.sqlite'
+
+
+class SolutionCache:
+    """Solved portfolios on local disk, looked up by ``cache_key``.
+
+    Entries are ``PortfolioResult``s stored compressed in one SQLite file
+    (default ``solutions.sqlite`` in the composition cache directory), so
+    several processes of a sweep can share it. Whenever an entry is added
+    the least recently used ones are evicted until at most ``max_entries``
+    remain and, with ``max_bytes``, their stored results fit in that many
+    bytes. An entry added with a ``source`` (the composition file) replaces
+    every entry of the same source made from different composition data,
+    so editing the composition file invalidates its old solutions.
+    """
+
+    def __init__(self, path=None, max_entries=1024, max_bytes=None, timeout=30.0):
+        self.path = str(default_cache_path() if path is None else path)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.connection = sqlite3.connect(self.path, timeout=timeout)
+        with self.connection:
+            self.connection.execute('PRAGMA journal_mode=WAL')
+            self.connection.executescript(_SCHEMA)
+
+    def get(self, key):
+        """The stored ``PortfolioResult`` of ``key`` (a ``CacheKey`` or its digest), or ``None``."""
+        key = getattr(key, 'key', key)
+        row = self.connection.execute('SELECT result FROM solutions WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        with self.connection:
+            self.connection.execute('UPDATE solutions SET accessed = ?, hits = hits + 1 WHERE key = ?',
+                                    (time.time(), key))
+        return PortfolioResult.from_dict(json.loads(zlib.decompress(row[0])))
+
+    def put(self, key, result, source=None):
+        """Store ``result`` under ``key`` (a ``CacheKey``), then evict.
+
+        With ``source`` the entries of that source made from another
+        composition are dropped first.
+        """
+        blob = zlib.compress(json.dumps(result.to_dict()).encode())
+        now = time.time()
+        with self.connection:
+            if source is not None:
+                self.connection.execute('DELETE FROM solutions WHERE source = ? AND composition != ?',
+                                        (str(source), key.composition))
+            self.connection.execute(
+                'INSERT OR REPLACE INTO solutions (key, composition, source, status, objective, result, bytes, '
+                'created, accessed) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (key.key, key.composition, None if source is None else str(source), result.status,
+                 float(result.objective), blob, len(blob), now, now))
+        self.evict()
+
+    def invalidate(self, composition=None, source=None):
+        """Drop the entries made from ``composition`` (a digest) and/or of ``source``; returns how many."""
+        if composition is None and source is None:
+            raise ValueError('give a composition digest or a source to invalidate')
+        clauses, args = [], []
+        if composition is not None:
+            clauses.append('composition = ?')
+            args.append(composition)
+        if source is not None:
+            clauses.append('source = ?')
+            args.append(str(source))
+        with self.connection:
+            return self.connection.execute(f'DELETE FROM solutions WHERE {" AND ".join(clauses)}', args).rowcount
+
+    def evict(self):
+        """Drop least recently used entries beyond ``max_entries`` and ``max_bytes``; returns how many."""
+        rows = self.connection.execute('SELECT key, bytes FROM solutions ORDER BY accessed DESC').fetchall()
+        keep, total = 0, 0
+        for _, size in rows:
+            if (self.max_entries is not None and keep >= self.max_entries) or (
+                    self.max_bytes is not None and total + size > self.max_bytes):
+                break
+            keep += 1
+            total += size
+        stale = [(key,) for key, _ in rows[keep:]]
+        if stale:
+            with self.connection:
+                self.connection.executemany('DELETE FROM solutions WHERE key = ?', stale)
+        return len(stale)
+
+    def clear(self):
+        with self.connection:
+            self.connection.execute('DELETE FROM solutions')
+
+    def stats(self):
+        """Entry count, stored bytes and total hits."""
+        entries, size, hits = self.connection.execute(
+            'SELECT COUNT(*), COALESCE(SUM(bytes), 0), COALESCE(SUM(hits), 0) FROM solutions').fetchone()
+        return {'entries': entries, 'bytes': size, 'hits': hits}
+
+    def __len__(self):
+        return self.connection.execute('SELECT COUNT(*) FROM solutions').fetchone()[0]
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def result_point(result):
+    """Decision variable arrays (as ``get_point`` returns them) of a ``PortfolioResult``."""
+    return {'Mixer_RM_qty': result.mixer.copy(), 'Mixer_Level': result.levels.copy(), 'prod_RM_qty': result.prod.copy()}
@@ -0,0 +1,274 @@
+"""Command line interface of the portfolio optimisation package.
+
+    portfolio-optimisation solve --report report.pdf --output results
+    portfolio-optimisation solve --quick --products products.csv --output result.json
+    portfolio-optimisation sweep scenarios.csv sweep.parquet --workers 8 --reports reports
+    portfolio-optimisation report result.json report.html
+    portfolio-optimisation solve --telemetry events.jsonl
+    portfolio-optimisation profile --products products.csv
+    portfolio-optimisation solve --decompose --workers 8 --products products.csv
+    portfolio-optimisation solve --certify --workers 8
+    portfolio-optimisation solve --cache solutions.sqlite
+
+``python -m portfolio_optimisation`` runs the same commands. Set
+``IPOPT_EXECUTABLE`` (or pass ``--executable``) to use a specific Ipopt binary.
+"""
+import argparse
+import os
+import sys
+
+# Statuses of a usable solution
+SOLVED = ('optimal', 'heuristic', 'decomposed')
+# Largest constraint violation of a usable heuristic recipe
+FEASIBILITY_TOL = 1e-6
+
+
+def _solver_config(args):
+    from .solve import SolverConfig
+    return SolverConfig(backend=args.solver, executable=args.executable or os.environ.get('IPOPT_EXECUTABLE'),
+                        scaling=args.scaling)
+
+
+def _telemetry(args):
+    from .telemetry import JsonLinesSink, Telemetry
+    return Telemetry(JsonLinesSink(args.telemetry)) if args.telemetry else None
+
+
+def _composition_source(args):
+    # Names the composition data in the solution cache, see SolutionCache.put
+    source = args.composition or os.environ.get('PORTFOLIO_COMPOSITION_PATH')
+    if source is None:
+        return 'default'
+    return source if str(source).startswith(('http://', 'https://')) else os.path.abspath(source)
+
+
+def _solve_method(args):
+    # Cache description of how cmd_solve gets its solution
+    from dataclasses import asdict
+    if args.quick and not args.decompose:
+        return {'method': 'quick', 'solver': None}
+    method = 'decompose' if args.decompose else 'presolve' if args.no_heuristic else 'heuristic'
+    return {'method': method, 'solver': asdict(_solver_config(args))}
+
+
+def _build(args, telemetry=None):
+    from .data import load_composition
+    from .portfolio import DEFAULT_LEVEL_PAIRS, default_products, product_table
+    from .telemetry import phase
+    with phase(telemetry, 'load', source=args.composition or 'default'):
+        df = load_composition(args.composition)
+    if args.products:
+        import pandas as pd
+        products, level_pairs = product_table(pd.read_csv(args.products)), None
+    else:
+        products, level_pairs = default_products(), DEFAULT_LEVEL_PAIRS
+    build_kwargs = dict(products=products, level_pairs=level_pairs, level_separation=args.level_separation)
+    return df, build_kwargs
+
+
+def _print_solution(solution):
+    print(f'Status: {solution.status}   Objective: {solution.objective:.4f}   '
+          f'Max violation: {solution.max_violation:.2e}')
+    print('Mixer: ' + ', '.join(f'{rm} {qty:.4f}' for rm, qty in zip(solution.rms, solution.mixer) if qty > 1e-4))
+    for i, prod in enumerate(solution.prods):
+        print(f'Prod {prod}: level {solution.levels[i]:.4f}, SRI {solution.sri[i]:.2f}, '
+              f'{solution.contaminant_sub} {solution.contaminant[i]:.3f}')
+
+
+def _write_solution(solution, output, fmt):
+    if output.endswith('.json'):
+        return [solution.to_json(output)]
+    return solution.to_parquet(output) if fmt == 'parquet' else solution.to_csv(output)
+
+
+def _solve(args, df, build_kwargs, model, telemetry):
+    # Solution and solved model of cmd_solve; ``model`` is the built model unless decomposing
+    from .heuristic import heuristic_solve
+    from .presolve import presolve
+    from .results import extract_result
+    from .scaling import apply_scaling
+    from .solve import solve
+    from .telemetry import phase
+
+    if args.decompose:
+        from .decomposition import decomposition_solve
+        decomposed, model = decomposition_solve(df, solver_config=_solver_config(args), max_workers=args.workers,
+                                                telemetry=telemetry, **build_kwargs)
+        solution = extract_result(model)
+        solution.status = 'decomposed' if decomposed.feasible else 'infeasible'
+        return solution, model
+
+    solver = None if args.quick else _solver_config(args).create()
+    # The scale factors are computed after presolve, from the tightened bounds
+    scaling = args.scaling and solver is not None
+    if args.no_heuristic:
+        with phase(telemetry, 'presolve'):
+            presolve(model)
+        if scaling:
+            with phase(telemetry, 'scaling'):
+                apply_scaling(model)
+        result = solve(model, solver, tee=args.tee, telemetry=telemetry)
+    else:
+        _, result = heuristic_solve(model, solver, quick=args.quick, tee=args.tee, telemetry=telemetry,
+                                    scaling=scaling)
+    with phase(telemetry, 'extract'):
+        solution = extract_result(model, result)
+    if args.quick:
+        solution.status = 'heuristic' if solution.max_violation <= FEASIBILITY_TOL else 'infeasible'
+    return solution, model
+
+
+def cmd_solve(args):
+    from .model import build_model
+    from .report import report
+    from .telemetry import phase
+
+    telemetry = _telemetry(args)
+    df, build_kwargs = _build(args, telemetry)
+    model = None if args.decompose else build_model(df, telemetry=telemetry, **build_kwargs)
+    if args.cache is None:
+        solution, model = _solve(args, df, build_kwargs, model, telemetry)
+    else:
+        from .cache import SolutionCache, cache_key, result_point
+        from .multistart import set_point
+        with phase(telemetry, 'cache') as info:
+            keyed = model if model is not None else build_model(df, **build_kwargs)
+            cache = SolutionCache(args.cache or None)
+            key = cache_key(keyed, _solve_method(args))
+            solution = cache.get(key)
+            info.update(hit=solution is not None)
+        if solution is not None:
+            model = keyed
+            set_point(model, result_point(solution))
+            print('Solution read from the cache')
+        else:
+            solution, model = _solve(args, df, build_kwargs, model, telemetry)
+            if solution.status in SOLVED:
+                cache.put(key, solution, source=_composition_source(args))
+        cache.close()
+
+    _print_solution(solution)
+    if args.certify:
+        from .relaxation import gap_certificate
+        # Only a feasible recipe bounds the optimum from above
+        feasible = solution.status in SOLVED and solution.max_violation <= FEASIBILITY_TOL
+        with phase(telemetry, 'certificate') as info:
+            certificate = gap_certificate(model, solution.objective if feasible else None,
+                                          max_workers=args.workers, telemetry=telemetry)
+            info.update(status=certificate.status, lower_bound=certificate.lower_bound, gap=certificate.gap)
+        print(f'Lower bound: {certificate.lower_bound:.4f} ({certificate.status})   '
+              f'Gap: {certificate.gap:.4g} ({100 * certificate.relative_gap:.2f}%)')
+    if args.output:
+        _write_solution(solution, args.output, args.format)
+    if args.report:
+        report(solution, args.report, telemetry=telemetry)
+    if args.show:
+        report(solution)
+    return 0 if solution.status in SOLVED else 1
+
+
+def cmd_sweep(args):
+    from .report import scenario_reports
+    from .scenarios import read_scenarios, run_scenarios
+
+    df, build_kwargs = _build(args)
+    written = run_scenarios(df, read_scenarios(args.scenarios), args.output, max_workers=args.workers,
+                            chunk_size=args.chunk_size, solver_config=_solver_config(args),
+                            telemetry_dir=args.telemetry, cache=args.cache,
+                            cache_source=_composition_source(args), **build_kwargs)
+    print(f'{written} scenarios written to {args.output}')
+    if args.reports:
+        paths = scenario_reports(df, args.output, args.reports, fmt=args.report_format,
+                                 max_workers=args.workers, **build_kwargs)
+        print(f'{len(paths)} reports written to {args.reports}')
+    return 0
+
+
+def cmd_report(args):
+    from .report import report
+    from .results import PortfolioResult
+    report(PortfolioResult.from_json(args.result), args.output)
+    return 0
+
+
+def cmd_profile(args):
+    from .model import build_model
+    from .profiler import profile_frame, profile_model
+
+    df, build_kwargs = _build(args)
+    frame = profile_frame(profile_model(build_model(df, **build_kwargs), nl=not args.no_nl))
+    if args.sort:
+        frame = frame.sort_values(args.sort, ascending=False, ignore_index=True)
+    print(frame.to_string(index=False))
+    return 0
+
+
+def _add_model_arguments(parser):
+    from .model import LEVEL_SEPARATIONS
+    from .solve import BACKENDS
+    parser.add_argument('--composition', help='RM composition table (xlsx path or URL)')
+    parser.add_argument('--products', help='CSV product table (name, sri_threshold, mixer_level_init)')
+    parser.add_argument('--level-separation', choices=LEVEL_SEPARATIONS, default='abs')
+    parser.add_argument('--solver', choices=list(BACKENDS), help='solver backend (default: first available)')
+    parser.add_argument('--executable', help='solver executable for the NL interface')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='portfolio-optimisation', description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    p = commands.add_parser('solve', help='build and solve one portfolio')
+    _add_model_arguments(p)
+    p.add_argument('--quick', action='store_true', help='stop at the heuristic recipe, no NLP solve')
+    p.add_argument('--no-heuristic', action='store_true', help='solve from the default starting point')
+    p.add_argument('--tee', action='store_true', help='stream the solver log')
+    p.add_argument('--scaling', action='store_true',
+                   help='scale variables and rows from the composition ranges and SUB bounds')
+    p.add_argument('--decompose', action='store_true',
+                   help='per-product subproblems around a mixer master, for large portfolios')
+    p.add_argument('--certify', action='store_true',
+                   help='bound the global optimum with a convex relaxation and print the gap')
+    p.add_argument('--workers', type=int,
+                   help='processes for the --decompose product subproblems and the --certify bound LPs')
+    p.add_argument('--output', help='result directory (tables) or .json file')
+    p.add_argument('--format', choices=('csv', 'parquet'), default='csv')
+    p.add_argument('--report', help='write the charts to this .pdf or .html file')
+    p.add_argument('--show', action='store_true', help='open the charts with pyplot')
+    p.add_argument('--telemetry', help='append phase timings and solver iterations as JSON lines to this file')
+    p.add_argument('--cache', nargs='?', const='', metavar='PATH',
+                   help='reuse solutions of identical inputs from this SQLite file (default: in the cache directory)')
+    p.set_defaults(func=cmd_solve)
+
+    p = commands.add_parser('sweep', help='solve a CSV of scenarios in parallel')
+    _add_model_arguments(p)
+    p.add_argument('scenarios', help='CSV with one dotted-name column per parameter')
+    p.add_argument('output', help='.parquet or .csv result file')
+    p.add_argument('--workers', type=int)
+    p.add_argument('--chunk-size', type=int)
+    p.add_argument('--scaling', action='store_true',
+                   help='scale variables and rows from the composition ranges and SUB bounds')
+    p.add_argument('--reports', help='directory for one report per solved scenario')
+    p.add_argument('--report-format', choices=('pdf', 'html'), default='pdf')
+    p.add_argument('--telemetry', help='directory for one JSON lines event file per worker')
+    p.add_argument('--cache', nargs='?', const='', metavar='PATH',
+                   help='reuse scenario solutions of identical inputs from this SQLite file')
+    p.set_defaults(func=cmd_sweep)
+
+    p = commands.add_parser('profile', help='expression size, derivative non-zeros and NL bytes per component')
+    _add_model_arguments(p)
+    p.add_argument('--sort', choices=('nodes', 'nonlinear_terms', 'variables', 'jacobian_nnz', 'hessian_nnz',
+                                      'nl_bytes'), help='sort column (default: nl_bytes)')
+    p.add_argument('--no-nl', action='store_true', help='skip writing the .nl file')
+    p.set_defaults(func=cmd_profile)
+
+    p = commands.add_parser('report', help='render a saved .json result')
+    p.add_argument('result')
+    p.add_argument('output', help='.pdf or .html file')
+    p.set_defaults(func=cmd_report)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
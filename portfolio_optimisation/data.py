@@ -0,0 +1,83 @@
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+# Local copy of the RM Composition Table shipped with the repository
+DEFAULT_COMPOSITION_PATH = Path(__file__).resolve().parent.parent / 'RM Composition.xlsx'
+
+# Remote copy, only used when asked for explicitly
+COMPOSITION_URL = 'https://github.com/robithh/Research_Project/raw/main/RM%20Composition.xlsx'
+
+
+def default_cache_dir():
+    return Path(os.environ.get('PORTFOLIO_CACHE_DIR', Path.home() / '.cache' / 'portfolio_optimisation'))
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _read_excel(path):
+    import pandas as pd
+    return pd.read_excel(path, index_col='INGREDIENT')
+
+
+def _write_cache(cache_file, df):
+    cache_file.parent.mkdir(parents=True, exist_ok=True)
+    # Write to a temporary file first so concurrent runs never read a partial cache
+    fd, tmp = tempfile.mkstemp(dir=cache_file.parent, suffix='.npz')
+    with os.fdopen(fd, 'wb') as f:
+        np.savez(
+            f,
+            values=df.to_numpy(dtype=float),
+            index=np.array(df.index, dtype=str),
+            columns=np.array(df.columns, dtype=str),
+        )
+    os.replace(tmp, cache_file)
+
+
+def _read_cache(cache_file):
+    import pandas as pd
+    with np.load(cache_file, allow_pickle=False) as data:
+        df = pd.DataFrame(data['values'], index=data['index'].tolist(), columns=data['columns'].tolist())
+    df.index.name = 'INGREDIENT'
+    return df
+
+
+def load_composition(path=None, cache_dir=None, use_cache=True):
+    """Load the RM Composition Table as a DataFrame (SUB rows, RM columns).
+
+    ``path`` defaults to ``$PORTFOLIO_COMPOSITION_PATH`` or the local
+    ``RM Composition.xlsx``. The first load of a given file is converted to an
+    NPZ cache named after its SHA-256, so later runs skip openpyxl entirely
+    and an edited file is picked up automatically. URLs are read uncached.
+    """
+    path = path or os.environ.get('PORTFOLIO_COMPOSITION_PATH') or DEFAULT_COMPOSITION_PATH
+    if str(path).startswith(('http://', 'https://')):
+        return _read_excel(path)
+
+    path = Path(path)
+    if not use_cache:
+        return _read_excel(path)
+
+    cache_dir = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+    cache_file = cache_dir / f'composition-{file_hash(path)}.npz'
+    if cache_file.exists():
+        try:
+            return _read_cache(cache_file)
+        except (OSError, ValueError, KeyError):
+            pass  # corrupt or foreign cache file, rebuild it below
+
+    df = _read_excel(path)
+    try:
+        _write_cache(cache_file, df)
+    except OSError:
+        pass  # read-only cache location, keep working uncached
+    return df
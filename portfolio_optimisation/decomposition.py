@@ -0,0 +1,390 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+
+import numpy as np
+from pyomo.environ import ConcreteModel, Constraint, Expression, Objective, Param, Set, Var, minimize, value
+
+from .evaluate import BatchEvaluator
+from .heuristic import heuristic_start
+from .model import (
+    _mixer_SUB_rule, build_model, model_1, model_2, model_3, model_4, model_5, model_6, model_9, update_parameters
+)
+from .multistart import set_point
+from .portfolio import default_products
+from .solve import SolverConfig, SolverSession, is_optimal
+from .telemetry import phase
+
+# Mixer rows, constant in a product subproblem where the mixer recipe is fixed
+MIXER_CONSTRAINTS = ('model_5_constraint', 'mixer_total_quantity_constraint', 'mixer_lower_bound',
+                     'mixer_component')
+
+
+@dataclass
+class DecompositionResult:
+    point: dict
+    objective: float
+    max_violation: float
+    feasible: bool
+    price: float
+    budgets: dict
+    iterations: int
+    seconds: float
+    history: list = field(default_factory=list)
+
+
+def build_subproblem(df, spec, **build_kwargs):
+    """Single-product model of ``spec`` for a fixed mixer recipe.
+
+    The mixer rows are deactivated (fix ``Mixer_RM_qty`` before solving) and
+    the objective is the product's share of the portfolio cost plus
+    ``budget_price`` times its contaminant; ``contaminant_limit`` is the
+    product's budget of the systemic constraint.
+    """
+    sub = build_model(df, **{**build_kwargs, 'products': [spec], 'level_pairs': []})
+    for name in MIXER_CONSTRAINTS:
+        sub.component(name).deactivate()
+    sub.budget_price = Param(initialize=0.0, mutable=True)
+    sub.objective.deactivate()
+    sub.priced_objective = Objective(expr=sub.objective.expr + sub.budget_price * model_9(sub))
+    return sub
+
+
+def level_windows(levels, pairs, epsilon):
+    """Level bounds per product that keep every listed pair at least ``epsilon`` apart.
+
+    Each pair is split at the midpoint of its current levels, so products can
+    move independently inside their windows. A window always contains the
+    current level; it shrinks to that level for a product packed exactly
+    ``epsilon`` from its neighbours, which only the master can move.
+    """
+    levels = np.asarray(levels, dtype=float)
+    lo, hi = np.zeros(len(levels)), np.ones(len(levels))
+    for i, j in pairs:
+        low, high = (i, j) if levels[i] <= levels[j] else (j, i)
+        mid = (levels[low] + levels[high]) / 2
+        hi[low] = min(hi[low], mid - epsilon / 2)
+        lo[high] = max(lo[high], mid + epsilon / 2)
+    return np.minimum(lo, levels), np.maximum(hi, levels)
+
+
+def separate_levels(levels, pairs, epsilon):
+    """Spread ``levels`` (keeping their order) so that every listed pair is ``epsilon`` apart."""
+    levels = np.array(levels, dtype=float)
+    if all(abs(levels[i] - levels[j]) >= epsilon for i, j in pairs):
+        return levels
+    order = np.argsort(levels, kind='stable')
+    spread = levels[order]
+    for k in range(1, len(spread)):
+        spread[k] = max(spread[k], spread[k - 1] + epsilon)
+    spread -= max(spread[-1] - 1.0, 0.0)
+    levels[order] = np.clip(spread, 0.0, 1.0)
+    return levels
+
+
+def build_master(model):
+    """Mixer master of a full portfolio ``model``: mixer recipe and levels over fixed recipe shapes.
+
+    Every product keeps the proportions ``shape`` of its post mixer recipe,
+    so its RM amounts are ``(1 - level) * shape`` and the product total holds
+    by construction. Only the mixer RMs and the levels are variables, while
+    model_4, model_5, the RM and SUB bounds and model_9 are kept exactly. The
+    level pairs are separated in the order given by the mutable ``pair_sign``.
+    """
+    m = ConcreteModel()
+    m.SUB = Set(initialize=list(model.SUB))
+    m.RM = Set(initialize=list(model.RM))
+    m.PROD = Set(initialize=list(model.PROD))
+    m.LEVEL_PAIRS = Set(dimen=2, initialize=list(model.LEVEL_PAIRS))
+    m.SUB_RM = Set(m.SUB, within=m.RM, initialize={sub: list(model.SUB_RM[sub]) for sub in model.SUB})
+
+    m.composition = Param(m.SUB, m.RM, initialize={k: value(v) for k, v in model.composition.items()}, default=0)
+    m.mixercosts = Param(m.RM, initialize={rm: value(model.mixercosts[rm]) for rm in model.RM}, mutable=True)
+    m.sri_threshold = Param(m.PROD, initialize={p: value(model.sri_threshold[p]) for p in model.PROD},
+                            mutable=True)
+    m.mixer_quality_threshold = Param(initialize=value(model.mixer_quality_threshold), mutable=True)
+    m.contaminant_limit = Param(initialize=value(model.contaminant_limit), mutable=True)
+    m.shape = Param(m.PROD, m.RM, initialize=0.0, mutable=True)
+    m.shape_SUB = Param(m.PROD, m.SUB, initialize=0.0, mutable=True)
+    m.shape_cost = Param(m.PROD, initialize=0.0, mutable=True)
+    m.pair_sign = Param(m.LEVEL_PAIRS, initialize=1.0, mutable=True)
+
+    m.Mixer_RM_qty = Var(m.RM, bounds=(0, 1))
+    m.Mixer_Level = Var(m.PROD, bounds=(0, 1))
+    for rm in model.mixer_component:
+        m.Mixer_RM_qty[rm].fix(0)
+
+    m.Mixer_SUB = Expression(m.SUB, rule=_mixer_SUB_rule)
+    m.Total_Prod_SUB = Expression(m.PROD, m.SUB, rule=lambda m, p, sub: (
+        m.Mixer_Level[p] * m.Mixer_SUB[sub] + (1 - m.Mixer_Level[p]) * m.shape_SUB[p, sub]))
+    m.model_5_constraint = Constraint(expr=model_5(m) >= m.mixer_quality_threshold)
+    m.model_6 = Expression(rule=model_6)
+    m.mixer_total_quantity_constraint = Constraint(expr=sum(m.Mixer_RM_qty[rm] for rm in m.RM) == 1.0)
+    m.mixer_lower_bound = Constraint(list(model.mixer_lower_bound), rule=lambda m, rm: (
+        m.Mixer_RM_qty[rm] >= model.mixer_lower_bound[rm].lb))
+
+    m.model_1 = Expression(m.PROD, rule=model_1)
+    m.model_2 = Expression(m.PROD, rule=model_2)
+    m.model_3 = Expression(m.PROD, rule=model_3)
+    m.model_4 = Expression(m.PROD, rule=model_4)
+    m.model_4_constraint = Constraint(m.PROD, rule=lambda m, p: m.model_4[p] >= m.sri_threshold[p])
+    m.prod_RM_bound = Constraint(list(model.prod_RM_bound), rule=lambda m, p, rm: (
+        model.prod_RM_bound[p, rm].lb,
+        m.Mixer_Level[p] * m.Mixer_RM_qty[rm] + (1 - m.Mixer_Level[p]) * m.shape[p, rm],
+        model.prod_RM_bound[p, rm].ub))
+    m.prod_SUB_bound = Constraint(list(model.prod_SUB_bound), rule=lambda m, p, sub: (
+        model.prod_SUB_bound[p, sub].lb, m.Total_Prod_SUB[p, sub], model.prod_SUB_bound[p, sub].ub))
+    sub = model.contaminant_sub.value
+    m.model_9_constraint = Constraint(expr=value(model.contaminant_factor) * sum(
+        m.Total_Prod_SUB[p, sub] for p in m.PROD) <= m.contaminant_limit)
+    m.Mixer_Order = Constraint(m.LEVEL_PAIRS, rule=lambda m, p, q: (
+        m.pair_sign[p, q] * (m.Mixer_Level[q] - m.Mixer_Level[p]) >= value(model.epsilon)))
+
+    m.objective = Objective(expr=value(model.cost_scale) * sum(
+        m.Mixer_Level[p] * m.model_6 + (1 - m.Mixer_Level[p]) * m.shape_cost[p] for p in m.PROD), sense=minimize)
+    return m
+
+
+def project_budgets(demand, limit):
+    """Closest non-negative per-product budgets to ``demand`` that sum to ``limit``."""
+    demand = np.asarray(demand, dtype=float)
+    ordered = np.sort(demand)[::-1]
+    shifts = (np.cumsum(ordered) - limit) / np.arange(1, len(ordered) + 1)
+    shift = shifts[np.flatnonzero(ordered - shifts > 0)[-1]]
+    return np.maximum(demand - shift, 0.0)
+
+
+# Each worker process builds the subproblem of a product the first time it solves it
+_worker = {}
+
+
+def _init_worker(df, specs, build_kwargs, solver_config):
+    _worker.update(df=df, specs=specs, build_kwargs=build_kwargs, config=solver_config, sessions={})
+
+
+def _session(prod):
+    sessions = _worker['sessions']
+    if prod not in sessions:
+        sub = build_subproblem(_worker['df'], _worker['specs'][prod], **_worker['build_kwargs'])
+        sessions[prod] = SolverSession(sub, _worker['config'])
+    return sessions[prod]
+
+
+def _solve_products(mixer, tasks):
+    rows = []
+    for prod, lo, hi, level, recipe, price, budget in tasks:
+        session = _session(prod)
+        sub = session.model
+        for rm, qty in zip(sub.RM, mixer):
+            sub.Mixer_RM_qty[rm].fix(qty)
+        sub.Mixer_Level[prod].setlb(lo)
+        sub.Mixer_Level[prod].setub(hi)
+        sub.Mixer_Level[prod].set_value(min(max(level, lo), hi))
+        for rm, qty in zip(sub.RM, recipe):
+            sub.prod_RM_qty[prod, rm].set_value(qty, skip_validation=True)
+        sub.budget_price = price
+        update_parameters(sub, contaminant_limit=budget)
+        try:
+            result = session.solve()
+            status = 'optimal' if is_optimal(result) else str(result.solver.termination_condition)
+        except Exception as exc:  # a failed product keeps its previous recipe
+            status = f'error: {exc}'
+        row = {'prod': prod, 'status': status}
+        if status == 'optimal':
+            row.update(level=value(sub.Mixer_Level[prod]),
+                       recipe=np.array([sub.prod_RM_qty[prod, rm].value for rm in sub.RM], dtype=float))
+        rows.append(row)
+    return rows
+
+
+class _Products:
+    # Runs the product subproblems over a process pool (or in process for one worker)
+
+    def __init__(self, df, specs, build_kwargs, solver_config, max_workers):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        initargs = (df, specs, build_kwargs, solver_config)
+        if self.max_workers == 1:
+            _init_worker(*initargs)
+            self.pool = None
+        else:
+            self.pool = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                            initargs=initargs)
+
+    def solve(self, mixer, tasks):
+        if self.pool is None:
+            return _solve_products(mixer, tasks)
+        size = -(-len(tasks) // self.max_workers)
+        chunks = [tasks[k:k + size] for k in range(0, len(tasks), size)]
+        return [row for rows in self.pool.map(_solve_products, [mixer] * len(chunks), chunks) for row in rows]
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+
+
+def decomposition_solve(df, solver_config=None, max_workers=None, iterations=30, tol=1e-5, feasibility_tol=1e-6,
+                        radius=0.2, start=None, telemetry=None, **build_kwargs):
+    """Solve a large portfolio by alternating per-product subproblems and a small mixer master.
+
+    With the mixer recipe fixed the products only interact through the mixer
+    level separation and the ``model_9`` contaminant budget, so every
+    iteration
+
+    1. solves one subproblem per product in parallel (``build_subproblem``):
+       its level stays inside a window that separates it from its listed
+       pairs (``level_windows``) and its contaminant is priced at ``price``,
+    2. moves the price by the excess or slack of the products' demand (a
+       dual subgradient step whose length halves whenever the sign changes)
+       and, if the demand exceeds the limit, re-solves the products with
+       hard budgets projected from it (``project_budgets``),
+    3. solves the master (``build_master``) over the mixer recipe and all
+       levels with the product recipe shapes fixed, inside a trust region of
+       ``radius``. A master step that does not improve the portfolio is
+       rejected and the radius halved; an accepted step doubles it again, up
+       to the initial ``radius``.
+
+    The loop stops when the objective and the price change by less than
+    ``tol`` (relative) at a feasible point or after ``iterations``. ``start`` is a ``get_point``
+    dict, by default the quick heuristic recipe. ``level_separation`` is
+    ignored: windows and the master keep the pairs apart. Returns
+    ``(DecompositionResult, model)`` with the best point loaded in the full
+    model, ready for ``extract_result`` or a final monolithic polish.
+    """
+    t0 = time.perf_counter()
+    build_kwargs = {k: v for k, v in build_kwargs.items() if k not in ('level_separation', 'level_order')}
+    specs = {p.name: p for p in (build_kwargs.get('products') or default_products())}
+    solver_config = solver_config or SolverConfig()
+    model = build_model(df, **build_kwargs)
+    ev = BatchEvaluator(model)
+    pairs = list(zip(ev.pair_i, ev.pair_j))
+    limit = ev.contaminant_limit
+
+    if start is None:
+        with phase(telemetry, 'heuristic'):
+            start = heuristic_start(model, quick=True).point
+    mixer = np.array(start['Mixer_RM_qty'], dtype=float)
+    levels = separate_levels(start['Mixer_Level'], pairs, ev.epsilon)
+    recipes = np.array(start['prod_RM_qty'], dtype=float)
+
+    def evaluate(mixer, levels, recipes):
+        out = ev.evaluate(mixer, levels, recipes[None])
+        contaminant = ev.contaminant_factor * out['total_SUB'][0, :, ev.contaminant]
+        return float(out['objective'][0]), float(out['max_violation'][0]), contaminant
+
+    master = build_master(model)
+    # scaling_factors reads the full model structure, which the master does not have
+    master_session = SolverSession(master, replace(solver_config, scaling=False))
+    products = _Products(df, specs, build_kwargs, solver_config, max_workers)
+
+    objective, violation, contaminant = evaluate(mixer, levels, recipes)
+    best = (violation > feasibility_tol, objective if violation <= feasibility_tol else violation,
+            mixer, levels, recipes)
+    price, step, last_excess, max_radius = 0.0, objective / limit, 0.0, radius
+    budgets = contaminant
+    history = []
+
+    def solve_products(iteration, windows, budgets):
+        # Solve every product, keeping the previous recipe of the ones that fail
+        tasks = [(p, windows[0][i], windows[1][i], levels[i], recipes[i], price, budgets[i])
+                 for i, p in enumerate(ev.prods)]
+        with phase(telemetry, 'decomposition.products', iteration=iteration):
+            rows = products.solve(mixer, tasks)
+        new_levels, new_recipes = levels.copy(), recipes.copy()
+        for i, row in enumerate(rows):
+            if row['status'] == 'optimal':
+                new_levels[i], new_recipes[i] = row['level'], row['recipe']
+        return (new_levels, new_recipes), sum(row['status'] != 'optimal' for row in rows)
+
+    def improves(new, objective, violation):
+        # Cheaper without leaving the feasible region, or closer to it from an infeasible point
+        if violation > feasibility_tol:
+            return new[1] < violation
+        return new[1] <= feasibility_tol and new[0] < objective
+
+    def solve_master(iteration):
+        # Mixer recipe and levels over the current recipe shapes; returns the new point or None
+        post = recipes.sum(axis=1)
+        shape = recipes / np.where(post > 1e-12, post, 1.0)[:, None]
+        for i, p in enumerate(ev.prods):
+            for j, rm in enumerate(ev.rms):
+                master.shape[p, rm] = shape[i, j]
+            for k, sub in enumerate(ev.subs):
+                master.shape_SUB[p, sub] = shape[i] @ ev.composition[k]
+            master.shape_cost[p] = shape[i] @ ev.post_mixer_costs
+            # A product without post mixer RMs cannot lower its level
+            master.Mixer_Level[p].setlb(max(0.0, levels[i] - radius) if post[i] > 1e-12 else levels[i])
+            master.Mixer_Level[p].setub(min(1.0, levels[i] + radius))
+            master.Mixer_Level[p].set_value(levels[i])
+        for (p, q), i, j in zip(master.LEVEL_PAIRS, ev.pair_i, ev.pair_j):
+            master.pair_sign[p, q] = 1.0 if levels[i] <= levels[j] else -1.0
+        for j, rm in enumerate(ev.rms):
+            if not master.Mixer_RM_qty[rm].fixed:
+                master.Mixer_RM_qty[rm].setlb(max(0.0, mixer[j] - radius))
+                master.Mixer_RM_qty[rm].setub(min(1.0, mixer[j] + radius))
+                master.Mixer_RM_qty[rm].set_value(mixer[j])
+        with phase(telemetry, 'decomposition.master', iteration=iteration) as info:
+            try:
+                result = master_session.solve()
+                info['status'] = 'optimal' if is_optimal(result) else str(result.solver.termination_condition)
+            except Exception as exc:  # keep the current mixer and levels
+                info['status'] = f'error: {exc}'
+        if info['status'] != 'optimal':
+            return None
+        new_levels = np.array([master.Mixer_Level[p].value for p in ev.prods], dtype=float)
+        return (np.array([master.Mixer_RM_qty[rm].value for rm in ev.rms], dtype=float), new_levels,
+                (1 - new_levels)[:, None] * shape)
+
+    try:
+        for iteration in range(1, iterations + 1):
+            with phase(telemetry, 'decomposition.iteration', iteration=iteration) as info:
+                previous, previous_price = objective, price
+
+                # 1. Product subproblems at the current contaminant price, each free to use the whole limit
+                windows = level_windows(levels, pairs, ev.epsilon)
+                candidate, failed = solve_products(iteration, windows, [limit] * len(ev.prods))
+                demand = evaluate(mixer, *candidate)[2]
+
+                # 2. Price step on the excess demand; over the limit, re-solve with the demand
+                #    projected onto the budget as hard per-product limits
+                excess = float(demand.sum() - limit)
+                if excess * last_excess < 0:
+                    step /= 2
+                last_excess = excess
+                price = max(0.0, price + step * excess / limit)
+                budgets = demand
+                if excess > 0:
+                    budgets = project_budgets(demand, limit)
+                    candidate, failed = solve_products(iteration, windows, budgets)
+                levels, recipes = candidate
+                objective, violation, contaminant = evaluate(mixer, levels, recipes)
+
+                # 3. Master step on the mixer recipe and the levels
+                candidate = solve_master(iteration)
+                accepted = candidate is not None and improves(new := evaluate(*candidate), objective, violation)
+                if accepted:
+                    (mixer, levels, recipes), (objective, violation, contaminant) = candidate, new
+                radius = min(2 * radius, max_radius) if accepted else radius / 2
+
+                key = (violation > feasibility_tol, objective if violation <= feasibility_tol else violation)
+                if key < best[:2]:
+                    best = key + (mixer, levels, recipes)
+                record = {'iteration': iteration, 'objective': objective, 'max_violation': violation,
+                          'contaminant': float(contaminant.sum()), 'price': price, 'radius': radius,
+                          'failed': failed, 'master': accepted}
+                history.append(record)
+                info.update(record)
+            if (violation <= feasibility_tol and abs(objective - previous) <= tol * max(1.0, abs(objective))
+                    and abs(price - previous_price) <= tol * max(1.0, price)):
+                break
+    finally:
+        products.close()
+
+    infeasible, _, mixer, levels, recipes = best
+    point = {'Mixer_RM_qty': mixer, 'Mixer_Level': levels, 'prod_RM_qty': recipes}
+    set_point(model, point)
+    objective, violation, _ = evaluate(mixer, levels, recipes)
+    result = DecompositionResult(point, objective, violation, not infeasible, price,
+                                 dict(zip(ev.prods, budgets.tolist())), len(history),
+                                 time.perf_counter() - t0, history)
+    return result, model
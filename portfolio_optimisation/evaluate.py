@@ -0,0 +1,159 @@
+import numpy as np
+from pyomo.environ import value
+
+from .surrogate import MODEL_1, MODEL_2, MODEL_3, MODEL_5
+
+
+def _bounds(constraint, index, shape):
+    # Flat positions (within ``shape``) and lower/upper bounds of an indexed constraint
+    positions, lower, upper = [], [], []
+    for key, con in constraint.items():
+        positions.append(np.ravel_multi_index(index(key), shape))
+        lower.append(value(con.lower) if con.has_lb() else -np.inf)
+        upper.append(value(con.upper) if con.has_ub() else np.inf)
+    return np.array(positions, dtype=int), np.array(lower, dtype=float), np.array(upper, dtype=float)
+
+
+def _violation(xs, lower, upper):
+    # Largest amount by which each candidate's bounded entries lie outside their bounds
+    return np.maximum(np.maximum(lower - xs, xs - upper), 0.0).max(axis=1, initial=0.0)
+
+
+class BatchEvaluator:
+    """Score many candidate recipes against a built model without calling a solver.
+
+    The composition matrix, costs, thresholds and constraint bounds are read
+    from ``model`` once (current mutable Param values included), then
+    ``evaluate`` computes every SUB total, model_1..9, the objective and all
+    constraint violations for a whole batch with array operations.
+    """
+
+    def __init__(self, model):
+        self.rms, self.subs, self.prods = list(model.RM), list(model.SUB), list(model.PROD)
+        rm_pos = {rm: j for j, rm in enumerate(self.rms)}
+        sub_pos = {sub: i for i, sub in enumerate(self.subs)}
+        prod_pos = {p: i for i, p in enumerate(self.prods)}
+        n_rm, n_sub, n_prod = len(self.rms), len(self.subs), len(self.prods)
+
+        self.composition = np.zeros((n_sub, n_rm))
+        for (sub, rm), content in model.composition.items():
+            self.composition[sub_pos[sub], rm_pos[rm]] = value(content)
+        self.mixer_costs = np.array([value(model.mixercosts[rm]) for rm in self.rms])
+        self.post_mixer_costs = np.array([value(model.postmixer_costs[rm]) for rm in self.rms])
+        self.sri_threshold = np.array([value(model.sri_threshold[p]) for p in self.prods])
+        self.quality_threshold = value(model.mixer_quality_threshold)
+        self.contaminant = sub_pos[model.contaminant_sub.value]
+        self.contaminant_factor = value(model.contaminant_factor)
+        self.contaminant_limit = value(model.contaminant_limit)
+        self.contaminant_active = model.model_9_constraint.active
+        self.cost_scale = value(model.cost_scale)
+        self.epsilon = value(model.epsilon)
+
+        self.mixer_bounds = _bounds(model.mixer_lower_bound, lambda rm: (rm_pos[rm],), (n_rm,))
+        self.mixer_forbidden = np.flatnonzero([rm in model.mixer_component for rm in self.rms])
+        self.prod_forbidden = np.flatnonzero([(p, rm) in model.prod_component
+                                              for p in self.prods for rm in self.rms])
+        self.rm_bounds = _bounds(
+            model.prod_RM_bound, lambda k: (prod_pos[k[0]], rm_pos[k[1]]), (n_prod, n_rm))
+        self.sub_bounds = _bounds(
+            model.prod_SUB_bound, lambda k: (prod_pos[k[0]], sub_pos[k[1]]), (n_prod, n_sub))
+        pairs = list(model.LEVEL_PAIRS)
+        self.pair_i = np.array([prod_pos[p] for p, _ in pairs], dtype=int)
+        self.pair_j = np.array([prod_pos[q] for _, q in pairs], dtype=int)
+        # With the 'ordered' separation each pair has a fixed direction: +1 when the level of
+        # pair_j must lie epsilon above pair_i, -1 for the reverse. Otherwise None: 'bigm' and
+        # 'gdp' points without their binaries are feasible exactly when |L_p - L_q| >= epsilon.
+        self.level_separation = value(model.level_separation)
+        self.pair_sign = None
+        if self.level_separation == 'ordered':
+            rank = [value(model.level_rank[p]) for p in self.prods]
+            self.pair_sign = np.array([1.0 if rank[i] < rank[j] else -1.0
+                                       for i, j in zip(self.pair_i, self.pair_j)])
+
+        # Column of each surface feature in the SUB totals (or the mixer RMs for model_5)
+        self.sri_columns = [[sub_pos[f] for f in s.features] for s in (MODEL_1, MODEL_2, MODEL_3)]
+        self.model_5_columns = [(sub_pos[f], False) if f in sub_pos else (rm_pos[f], True)
+                                for f in MODEL_5.features]
+        self.sub_02 = sub_pos['SUB_02']
+
+    def evaluate(self, mixer, levels, prod, tol=1e-6, chunk_size=1024):
+        """Evaluate candidates given as arrays.
+
+        ``mixer`` is (n, RM), ``levels`` is (n, PROD) and ``prod`` is
+        (n, PROD, RM), ordered like ``model.RM`` and ``model.PROD``. Returns a
+        dict of arrays; ``max_violation`` and ``feasible`` summarise all
+        constraints per candidate. Candidates are processed in chunks so the
+        intermediate arrays stay in cache.
+        """
+        mixer = np.atleast_2d(np.asarray(mixer, dtype=float))
+        levels = np.atleast_2d(np.asarray(levels, dtype=float))
+        prod = np.asarray(prod, dtype=float).reshape(mixer.shape[0], len(self.prods), len(self.rms))
+
+        n = mixer.shape[0]
+        result, violations = {}, {}
+        for k in range(0, n, chunk_size):
+            chunk = self._evaluate_chunk(mixer[k:k + chunk_size], levels[k:k + chunk_size],
+                                         prod[k:k + chunk_size])
+            for out, values in ((result, chunk), (violations, chunk.pop('violations'))):
+                for key, arr in values.items():
+                    if key not in out:
+                        out[key] = np.empty((n,) + arr.shape[1:])
+                    out[key][k:k + chunk_size] = arr
+        result['violations'] = violations
+        result['feasible'] = result['max_violation'] <= tol
+        return result
+
+    def _evaluate_chunk(self, mixer, levels, prod):
+        mixer_sub = mixer @ self.composition.T
+        total_sub = levels[:, :, None] * mixer_sub[:, None, :] + prod @ self.composition.T
+
+        features = np.stack([mixer[:, c] if is_rm else mixer_sub[:, c]
+                             for c, is_rm in self.model_5_columns], axis=-1)
+        switch = mixer_sub[:, self.sub_02] / (mixer_sub[:, self.sub_02] + 0.00001)
+        model_5 = (1 - switch) * MODEL_5.evaluate(features) + 10 * switch
+        model_1, model_2, model_3 = (
+            s.evaluate(total_sub[:, :, cols])
+            for s, cols in zip((MODEL_1, MODEL_2, MODEL_3), self.sri_columns)
+        )
+        model_4 = 0.3 * model_1 + 0.2 * model_2 + 0.5 * model_3
+        model_6 = mixer @ self.mixer_costs
+        model_7 = prod @ self.post_mixer_costs
+        model_9 = self.contaminant_factor * total_sub[:, :, self.contaminant].sum(axis=1)
+        objective = self.cost_scale * (levels * model_6[:, None] + model_7).sum(axis=1)
+
+        # Bounded entries only: mixer share plus post mixer amount of the bounded RMs
+        prod_flat = prod.reshape(prod.shape[0], -1)
+        positions, rm_lower, rm_upper = self.rm_bounds
+        total_rm = (levels[:, positions // len(self.rms)] * mixer[:, positions % len(self.rms)]
+                    + prod_flat[:, positions])
+        sub_positions, sub_lower, sub_upper = self.sub_bounds
+        mixer_positions, mixer_lower, mixer_upper = self.mixer_bounds
+        gap = levels[:, self.pair_j] - levels[:, self.pair_i]
+        separation = np.abs(gap) if self.pair_sign is None else self.pair_sign * gap
+        violations = {
+            'variable_bounds': np.maximum(
+                np.maximum(-mixer, mixer - 1).max(axis=1),
+                np.maximum(np.maximum(-levels, levels - 1).max(axis=1),
+                           np.maximum(-prod, prod - 1).max(axis=(1, 2)))).clip(min=0),
+            'mixer_total': np.abs(mixer.sum(axis=1) - 1.0),
+            'mixer_lower_bound': _violation(mixer[:, mixer_positions], mixer_lower, mixer_upper),
+            'mixer_component': np.abs(mixer[:, self.mixer_forbidden]).max(axis=1, initial=0.0),
+            'model_5': np.maximum(self.quality_threshold - model_5, 0.0),
+            'prod_total': np.abs(prod.sum(axis=2) + levels - 1.0).max(axis=1),
+            'model_4': np.maximum(self.sri_threshold - model_4, 0.0).max(axis=1),
+            'prod_component': np.abs(prod_flat[:, self.prod_forbidden]).max(axis=1, initial=0.0),
+            'prod_RM_bound': _violation(total_rm, rm_lower, rm_upper),
+            'prod_SUB_bound': _violation(total_sub.reshape(prod.shape[0], -1)[:, sub_positions],
+                                         sub_lower, sub_upper),
+            'model_9': np.maximum(model_9 - self.contaminant_limit, 0.0) * self.contaminant_active,
+            'mixer_inequality': np.maximum(self.epsilon - separation, 0.0).max(axis=1, initial=0.0),
+        }
+        max_violation = np.max(np.stack(list(violations.values())), axis=0)
+
+        return {
+            'mixer_SUB': mixer_sub, 'total_SUB': total_sub,
+            'model_1': model_1, 'model_2': model_2, 'model_3': model_3, 'model_4': model_4,
+            'model_5': model_5, 'model_6': model_6, 'model_7': model_7, 'model_9': model_9,
+            'objective': objective, 'violations': violations,
+            'max_violation': max_violation,
+        }
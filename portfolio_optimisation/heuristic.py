@@ -0,0 +1,313 @@
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from .evaluate import BatchEvaluator
+from .multistart import get_point, set_point
+from .presolve import presolve
+from .scaling import apply_scaling
+from .solve import solve
+from .surrogate import MODEL_1, MODEL_2, MODEL_3, MODEL_5
+from .telemetry import phase
+
+# Weights of model_1, model_2 and model_3 in the SRI model_4
+SRI_WEIGHTS = (0.3, 0.2, 0.5)
+
+
+@dataclass
+class HeuristicResult:
+    point: dict
+    order: list
+    objective: float
+    max_violation: float
+    feasible: bool
+    lps: int
+    seconds: float
+
+
+class _SequentialLP:
+    # Sequential linear programming over x = [Mixer_RM_qty, Mixer_Level, prod_RM_qty]
+    # with an l1 penalty on the linearised nonlinear constraints and a box trust region.
+    # Constraints that are linear in the original model are kept as hard rows.
+
+    def __init__(self, model, penalty):
+        from scipy import sparse
+        self.sparse = sparse
+        self.ev = ev = BatchEvaluator(model)
+        self.penalty = penalty
+        R, P = len(ev.rms), len(ev.prods)
+        self.R, self.P, self.S = R, P, len(ev.subs)
+        self.n = R + P + P * R
+        self.pairs = list(zip(ev.pair_i, ev.pair_j))
+        self.epsilon = ev.epsilon
+
+        # Variable bounds with forbidden RMs, mixer lower bounds, presolved bounds and fixed variables folded in
+        self.lower, self.upper = np.zeros(self.n), np.ones(self.n)
+        positions, lower, upper = ev.mixer_bounds
+        self.lower[positions] = np.maximum(self.lower[positions], lower)
+        self.upper[positions] = np.minimum(self.upper[positions], upper)
+        self.upper[ev.mixer_forbidden] = 0.0
+        self.upper[R + P + ev.prod_forbidden] = 0.0
+        for k, var in enumerate(self._variables(model)):
+            if var.fixed:
+                self.lower[k] = self.upper[k] = var.value
+            else:
+                self.lower[k] = max(self.lower[k], var.lb if var.lb is not None else 0.0)
+                self.upper[k] = min(self.upper[k], var.ub if var.ub is not None else 1.0)
+
+        # Mixer sums to one, each product sums to one together with its mixer level
+        rows = np.concatenate([np.zeros(R, dtype=int), np.repeat(np.arange(1, P + 1), R + 1)])
+        cols = np.concatenate([np.arange(R), np.concatenate(
+            [np.r_[R + p, R + P + p * R + np.arange(R)] for p in range(P)])])
+        self.A_eq = sparse.csr_matrix((np.ones(len(rows)), (rows, cols)), shape=(P + 1, self.n))
+        self.b_eq = np.ones(P + 1)
+
+    def _variables(self, model):
+        ev = self.ev
+        return ([model.Mixer_RM_qty[rm] for rm in ev.rms] + [model.Mixer_Level[p] for p in ev.prods]
+                + [model.prod_RM_qty[p, rm] for p in ev.prods for rm in ev.rms])
+
+    def split(self, x):
+        R, P = self.R, self.P
+        return x[:R], x[R:R + P], x[R + P:].reshape(P, R)
+
+    def initial_point(self, model):
+        """Current model values, with a spread recipe where the model holds none."""
+        point = get_point(model)
+        x = np.concatenate([point['Mixer_RM_qty'], point['Mixer_Level'], point['prod_RM_qty'].ravel()])
+        m, levels, q = self.split(x)
+        mixer_lb, mixer_ub = self.split(self.lower)[0], self.split(self.upper)[0]
+        if np.isnan(m).any():
+            m[:] = mixer_lb + (mixer_ub > 0) * max(1 - mixer_lb.sum(), 0) / max((mixer_ub > 0).sum(), 1)
+        levels[np.isnan(levels)] = 0.5
+        if np.isnan(q).any():
+            allowed = self.split(self.upper)[2] > 0
+            q[:] = allowed * ((1 - levels) / np.maximum(allowed.sum(axis=1), 1))[:, None]
+        return np.clip(x, self.lower, self.upper)
+
+    def evaluate(self, x):
+        m, levels, q = self.split(x)
+        out = self.ev.evaluate(m[None], levels[None], q[None])
+        violation = sum(v[0] for v in out['violations'].values())
+        return out['objective'][0], out['max_violation'][0], out['objective'][0] + self.penalty * violation
+
+    def linearize(self, x):
+        # Elastic rows A x <= b (after linearisation at x) and the linear objective gradient
+        sparse, ev = self.sparse, self.ev
+        R, P, S = self.R, self.P, self.S
+        m, levels, q = self.split(x)
+        C = ev.composition
+        mixer_sub = C @ m
+        total_sub = levels[:, None] * mixer_sub + q @ C.T
+
+        # Jacobian of the flattened (PROD, SUB) totals; total = J x + offset is exact at x
+        J = sparse.hstack([sparse.kron(levels[:, None], C), sparse.kron(sparse.eye(P), mixer_sub[:, None]),
+                           sparse.kron(sparse.eye(P), C)]).tocsr()
+        offset = -(levels[:, None] * mixer_sub).ravel()
+        blocks, rhs = [], []
+
+        positions, lower, upper = ev.sub_bounds
+        for bound, sign in ((upper, 1.0), (lower, -1.0)):
+            finite = np.isfinite(bound)
+            blocks.append(sign * J[positions[finite]])
+            rhs.append(sign * (bound[finite] - offset[positions[finite]]))
+
+        # model_4 >= sri_threshold, linear in the totals around the current point
+        grad = np.zeros((P, S))
+        model_4 = np.zeros(P)
+        for weight, surface, cols in zip(SRI_WEIGHTS, (MODEL_1, MODEL_2, MODEL_3), ev.sri_columns):
+            model_4 += weight * surface.evaluate(total_sub[:, cols])
+            grad[:, cols] += weight * surface.gradient(total_sub[:, cols])
+        G = sparse.csr_matrix((grad.ravel(), np.arange(P * S), np.arange(0, P * S + 1, S)), shape=(P, P * S))
+        blocks.append(-(G @ J))
+        rhs.append(model_4 - ev.sri_threshold + G @ (offset - total_sub.ravel()))
+
+        # model_9 contaminant budget
+        if ev.contaminant_active:
+            cont = np.arange(P) * S + ev.contaminant
+            blocks.append(sparse.csr_matrix(ev.contaminant_factor * J[cont].sum(axis=0)))
+            rhs.append([ev.contaminant_limit - ev.contaminant_factor * offset[cont].sum()])
+
+        # Product RM bounds on L_p * m_r + q_pr
+        positions, lower, upper = ev.rm_bounds
+        p, r = positions // R, positions % R
+        k = np.arange(len(positions))
+        A = sparse.csr_matrix((np.r_[levels[p], m[r], np.ones(len(k))],
+                               (np.r_[k, k, k], np.r_[r, R + p, R + P + positions])), shape=(len(k), self.n))
+        offset_rm = -levels[p] * m[r]
+        for bound, sign in ((upper, 1.0), (lower, -1.0)):
+            finite = np.isfinite(bound)
+            blocks.append(sign * A[finite])
+            rhs.append(sign * (bound[finite] - offset_rm[finite]))
+
+        # model_5 >= mixer quality threshold, with the SUB_02 switch differentiated exactly
+        features = np.array([m[c] if is_rm else mixer_sub[c] for c, is_rm in ev.model_5_columns])
+        surface, surface_grad = MODEL_5.evaluate(features), MODEL_5.gradient(features)
+        d_surface = np.zeros(R)
+        for g, (c, is_rm) in zip(surface_grad, ev.model_5_columns):
+            if is_rm:
+                d_surface[c] += g
+            else:
+                d_surface += g * C[c]
+        sub_02 = mixer_sub[ev.sub_02]
+        switch = sub_02 / (sub_02 + 0.00001)
+        model_5 = (1 - switch) * surface + 10 * switch
+        d_model_5 = (1 - switch) * d_surface + (10 - surface) * 0.00001 / (sub_02 + 0.00001) ** 2 * C[ev.sub_02]
+        blocks.append(sparse.csr_matrix(np.r_[-d_model_5, np.zeros(self.n - R)]))
+        rhs.append([model_5 - ev.quality_threshold - d_model_5 @ m])
+
+        # Objective cost_scale * sum_p (L_p * model_6 + model_7_p), linearised in the bilinear part
+        cost = ev.cost_scale * np.r_[levels.sum() * ev.mixer_costs, np.full(P, ev.mixer_costs @ m),
+                                     np.tile(ev.post_mixer_costs, P)]
+        return sparse.vstack(blocks).tocsr(), np.concatenate([np.atleast_1d(b) for b in rhs]), cost
+
+    def ordering_rows(self, order):
+        # L_low - L_high <= -epsilon for every separated pair, following ``order``
+        if order is None or not self.pairs:
+            return self.sparse.csr_matrix((0, self.n)), np.zeros(0)
+        rank = {p: i for i, p in enumerate(order)}
+        rows = [(i, j) if rank[i] < rank[j] else (j, i) for i, j in self.pairs]
+        k = np.arange(len(rows))
+        low, high = np.array(rows).T
+        A = self.sparse.csr_matrix((np.r_[np.ones(len(k)), -np.ones(len(k))],
+                                    (np.r_[k, k], np.r_[self.R + low, self.R + high])),
+                                   shape=(len(k), self.n))
+        return A, np.full(len(k), -self.epsilon)
+
+    def step(self, x, order, radius):
+        from scipy.optimize import linprog
+        sparse = self.sparse
+        A_el, b_el, cost = self.linearize(x)
+        A_ord, b_ord = self.ordering_rows(order)
+        n_el = A_el.shape[0]
+        A_ub = sparse.vstack([sparse.hstack([A_el, -sparse.eye(n_el)]),
+                              sparse.hstack([A_ord, sparse.csr_matrix((A_ord.shape[0], n_el))])]).tocsr()
+        A_eq = sparse.hstack([self.A_eq, sparse.csr_matrix((self.A_eq.shape[0], n_el))]).tocsr()
+        bounds = np.column_stack([np.r_[np.maximum(self.lower, x - radius), np.zeros(n_el)],
+                                  np.r_[np.minimum(self.upper, x + radius), np.full(n_el, np.inf)]])
+        res = linprog(np.r_[cost, np.full(n_el, self.penalty)], A_ub=A_ub, b_ub=np.r_[b_el, b_ord],
+                      A_eq=A_eq, b_eq=self.b_eq, bounds=bounds, method='highs')
+        return res.x[:self.n] if res.status == 0 else None
+
+    def run(self, x, order, iterations):
+        """Trust-region SLP from ``x``; returns the final point and the number of LPs solved."""
+        radius, merit, lps = 1.0, None, 0
+        for _ in range(iterations):
+            candidate = self.step(x, order, radius)
+            lps += 1
+            if candidate is None:
+                if merit is None:  # hard constraints infeasible even over the full box
+                    break
+                radius *= 0.5
+            else:
+                candidate_merit = self.evaluate(candidate)[2]
+                if merit is None or candidate_merit < merit - 1e-12:
+                    step = np.abs(candidate - x).max()
+                    x, merit = candidate, candidate_merit
+                    if step < 1e-9:
+                        break
+                    # Grow the region when the step reached its edge
+                    if step >= 0.99 * radius:
+                        radius = min(2 * radius, 1.0)
+                else:
+                    radius *= 0.5
+            if radius < 1e-7:
+                break
+        return x, lps
+
+
+def _candidate_orders(levels, prods, initial_levels, swaps):
+    # Order by the relaxed levels, its adjacent transpositions and the order of the initial levels
+    order = [prods[i] for i in np.argsort(levels, kind='stable')]
+    orders = [order]
+    if swaps:
+        for k in range(len(order) - 1):
+            orders.append(order[:k] + [order[k + 1], order[k]] + order[k + 2:])
+        orders.append([prods[i] for i in np.argsort(initial_levels, kind='stable')])
+    unique = []
+    for o in orders:
+        if o not in unique:
+            unique.append(o)
+    return unique
+
+
+def _search(slp, x0, iterations, swaps):
+    # Relaxed pass without the level separation, then one ordered pass per candidate order from its point
+    relaxed, lps = slp.run(x0, None, iterations)
+    position = {p: i for i, p in enumerate(slp.ev.prods)}
+    candidates = []
+    for order in _candidate_orders(slp.split(relaxed)[1], slp.ev.prods, slp.split(x0)[1], swaps):
+        x, n = slp.run(relaxed, [position[p] for p in order], iterations)
+        lps += n
+        candidates.append((order, x))
+    return candidates, lps
+
+
+def heuristic_start(model, quick=False, iterations=None, penalty=1000.0, tol=1e-6):
+    """Find a good starting recipe for ``model`` with sequential LP relaxations.
+
+    The bilinear mixer terms, the SRI models and ``model_5`` are linearised
+    around the current point and the resulting LP is solved with HiGHS inside
+    a trust region, with forbidden RMs and fixed variables removed through
+    their bounds. A first pass drops the mixer level separation; its levels
+    give a product order, which is then enforced (together with its adjacent
+    swaps and the order of the initial levels) as linear ordering rows. The
+    best candidate by feasibility, then objective, is returned and can be
+    loaded with ``set_point``; ``result.order`` also suits
+    ``build_model(..., level_separation='ordered', level_order=result.order)``.
+
+    ``quick=True`` tries only the relaxed order, with 60 instead of 80
+    iterations per pass. The full search also runs the quick one, so it never
+    returns a worse candidate.
+    """
+    t0 = time.perf_counter()
+    slp = _SequentialLP(model, penalty)
+    x0 = slp.initial_point(model)
+    passes = [(iterations or 60, False)]
+    if not quick:
+        full = (iterations or 80, True)
+        passes = [full] if full[0] == passes[0][0] else passes + [full]
+
+    candidates, lps = [], 0
+    for n_iterations, swaps in passes:
+        found, n = _search(slp, x0, n_iterations, swaps)
+        lps += n
+        for order, x in found:
+            objective, max_violation, _ = slp.evaluate(x)
+            candidates.append((max_violation > tol, objective if max_violation <= tol else max_violation,
+                               order, x, objective, max_violation))
+    infeasible, _, order, x, objective, max_violation = min(candidates, key=lambda c: c[:2])
+
+    m, levels, q = slp.split(x)
+    point = {'Mixer_RM_qty': m.copy(), 'Mixer_Level': levels.copy(), 'prod_RM_qty': q.copy()}
+    return HeuristicResult(point, order, float(objective), float(max_violation), not infeasible, lps,
+                           time.perf_counter() - t0)
+
+
+def heuristic_solve(model, solver=None, quick=False, tee=False, telemetry=None, scaling=False, **heuristic_kwargs):
+    """Run ``heuristic_start``, load its point and polish it with the NLP solver.
+
+    ``presolve`` fixes the forbidden RMs out of the problem and tightens the
+    variable bounds before the heuristic runs. With
+    ``quick=True`` the solver is skipped and the model keeps the heuristic
+    recipe, a fast "good enough" answer for interactive use; the solver
+    result is then None. Returns ``(heuristic_result, solver_result)``.
+    With ``scaling=True`` the scale factors are written after presolve, from
+    the tightened bounds, for a solver made by ``SolverConfig(scaling=True)``.
+    The presolve, heuristic, scaling and solve phases are reported to
+    ``telemetry``.
+    """
+    with phase(telemetry, 'presolve') as info:
+        presolved = presolve(model)
+        info.update(fixed=len(presolved.fixed), tightened=presolved.tightened)
+    with phase(telemetry, 'heuristic', quick=quick) as info:
+        result = heuristic_start(model, quick=quick, **heuristic_kwargs)
+        info.update(objective=result.objective, max_violation=result.max_violation, lps=result.lps)
+    set_point(model, result.point)
+    if quick:
+        return result, None
+    if scaling:
+        with phase(telemetry, 'scaling'):
+            apply_scaling(model)
+    return result, solve(model, solver, tee=tee, telemetry=telemetry)
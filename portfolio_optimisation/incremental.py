@@ -0,0 +1,201 @@
+from dataclasses import replace
+
+from pyomo.environ import value
+
+from .model import _mixer_disjunction_rule, model_9, portfolio_cost, product_spec, total_prod_SUB
+
+# Components of build_model holding one entry per product, in construction order, with the set of
+# their second index (None for components indexed by PROD alone). Params are set explicitly.
+PRODUCT_COMPONENTS = (
+    ('Mixer_Level', None), ('prod_RM_qty', 'RM'), ('Prod_SUB', 'SUB'), ('Total_Prod_SUB', 'SUB'),
+    ('model_1', None), ('model_2', None), ('model_3', None), ('model_4', None), ('model_7', None),
+    ('prod_total_quantity_constraint', None), ('model_4_constraint', None),
+    ('prod_component', 'RM'), ('prod_RM_bound', 'RM'), ('prod_SUB_bound', 'SUB'),
+)
+PRODUCT_PARAMS = ('product_spec', 'sri_threshold', 'level_rank')
+
+# Components of the mixer level separation, indexed by LEVEL_PAIRS
+PAIR_COMPONENTS = ('Mixer_Inequality', 'Mixer_Inequality_Above', 'Mixer_Inequality_Below', 'Mixer_Level_Above')
+
+
+def _construct(component, index):
+    # Build one entry from the component's rule; a rule returning Constraint.Skip leaves none
+    try:
+        component[index]
+    except KeyError:
+        pass
+
+
+def _product_keys(model, second, prod):
+    return [prod] if second is None else [(prod, k) for k in model.component(second)]
+
+
+def _update_sums(model):
+    # Re-form the portfolio sums (one named Expression reference per product); nothing inside
+    # a product block or the mixer is rebuilt
+    model.objective.set_value(portfolio_cost(model))
+    model.model_9_constraint.set_value(model_9(model) <= model.contaminant_limit)
+
+
+def _add_pair(model, p, q):
+    model.LEVEL_PAIRS.add((p, q))
+    if value(model.level_separation) == 'gdp':
+        model.Mixer_Inequality[p, q] = _mixer_disjunction_rule(model, p, q)
+        return
+    for name in PAIR_COMPONENTS:
+        if model.component(name) is not None:
+            _construct(model.component(name), (p, q))
+
+
+def _drop_pair(model, p, q):
+    for name in PAIR_COMPONENTS:
+        component = model.component(name)
+        if component is None or (p, q) not in component:
+            continue
+        if value(model.level_separation) == 'gdp' and name == 'Mixer_Inequality':
+            # Disjuncts are numbered by count, so they are switched off rather than deleted
+            for disjunct in component[p, q].disjuncts:
+                disjunct.deactivate()
+        del component[p, q]
+    model.LEVEL_PAIRS.remove((p, q))
+
+
+def add_product(model, spec, level_pairs=None, rank=None):
+    """Add the product of ``spec`` (a ``ProductSpec``) to a built model.
+
+    Only the new product's entries are constructed, from the same rules as
+    ``build_model``; the mixer block, model_5 and the other products are
+    untouched, and the objective and model_9 sums gain one term each.
+    ``level_pairs`` lists the products whose mixer level must differ from
+    the new one (default: every product, like ``build_model``). With the
+    ``'ordered'`` separation ``rank`` places the product in the level order
+    (default: above every product); ``rank`` may be fractional to insert it
+    between two products. Apply GDP transformations after editing.
+    """
+    prod = spec.name
+    if prod in model.PROD:
+        raise ValueError(f'product {prod!r} is already in the model')
+    others = list(model.PROD)
+    model.PROD.add(prod)
+    model.product_spec[prod] = spec
+    model.sri_threshold[prod] = spec.sri_threshold
+    if model.component('level_rank') is not None:
+        model.level_rank[prod] = rank if rank is not None else max(
+            [value(model.level_rank[q]) for q in others], default=-1) + 1
+    for name, second in PRODUCT_COMPONENTS:
+        for key in _product_keys(model, second, prod):
+            _construct(model.component(name), key)
+    model.Mixer_Level[prod].set_value(spec.mixer_level_init)
+
+    for q in others if level_pairs is None else level_pairs:
+        if q not in others:
+            raise ValueError(f'level pair product {q!r} is not in the model')
+        _add_pair(model, q, prod)
+    _update_sums(model)
+
+
+def drop_product(model, prod):
+    """Remove a product, its level separation pairs and its terms of the objective and model_9."""
+    if prod not in model.PROD:
+        raise ValueError(f'product {prod!r} is not in the model')
+    if len(model.PROD) == 1:
+        raise ValueError('cannot drop the last product of the portfolio')
+    for p, q in [pair for pair in model.LEVEL_PAIRS if prod in pair]:
+        _drop_pair(model, p, q)
+    for name, second in reversed(PRODUCT_COMPONENTS):
+        component = model.component(name)
+        for key in _product_keys(model, second, prod):
+            if key in component:
+                del component[key]
+    for name in PRODUCT_PARAMS:
+        if model.component(name) is not None:
+            del model.component(name)[prod]
+    model.PROD.remove(prod)
+    _update_sums(model)
+
+
+def deactivate_product(model, prod):
+    """Take a product out of the portfolio, keeping what ``activate_product`` needs to put it back.
+
+    The product is dropped so that every solver, evaluator and report sees
+    a consistent smaller portfolio; its spec, level pairs, rank and current
+    recipe are kept on the model.
+    """
+    spec = product_spec(model, prod)
+    pairs = [q if p == prod else p for p, q in model.LEVEL_PAIRS if prod in (p, q)]
+    rank = value(model.level_rank[prod]) if model.component('level_rank') is not None else None
+    recipe = {rm: model.prod_RM_qty[prod, rm].value for rm in model.RM}
+    level = model.Mixer_Level[prod].value
+    drop_product(model, prod)
+    _inactive(model)[prod] = (spec, pairs, rank, level, recipe)
+
+
+def activate_product(model, prod):
+    """Put back a product taken out by ``deactivate_product``, with its last recipe as the start.
+
+    Level pairs with products dropped in the meantime are left out.
+    """
+    spec, pairs, rank, level, recipe = _inactive(model).pop(prod)
+    add_product(model, spec, level_pairs=[q for q in pairs if q in model.PROD], rank=rank)
+    model.Mixer_Level[prod].set_value(level)
+    for rm, qty in recipe.items():
+        if rm in model.RM:
+            model.prod_RM_qty[prod, rm].set_value(qty)
+
+
+def inactive_products(model):
+    """Names of the products taken out by ``deactivate_product``."""
+    return list(_inactive(model))
+
+
+def _inactive(model):
+    if not hasattr(model, '_inactive_products'):
+        model._inactive_products = {}
+    return model._inactive_products
+
+
+def _set_bound(model, prod, key, lower, upper, component, field, body):
+    # Update the product's spec and add, change or drop its bound row
+    spec = product_spec(model, prod)
+    bounds = dict(getattr(spec, field))
+    if lower is None and upper is None:
+        bounds.pop(key, None)
+    else:
+        # A side that is not passed keeps its current value
+        old_lower, old_upper = bounds.get(key, (None, None))
+        lower = old_lower if lower is None else lower
+        upper = old_upper if upper is None else upper
+        bounds[key] = (lower, upper)
+    model.product_spec[prod] = replace(spec, **{field: bounds})
+    if lower is None and upper is None:
+        if (prod, key) in component:
+            del component[prod, key]
+    elif (prod, key) in component:
+        component[prod, key].set_value((lower, body, upper))
+    else:
+        _construct(component, (prod, key))
+
+
+def set_sub_bound(model, prod, sub, lower=None, upper=None):
+    """Add or change the bounds on the total ``sub`` content of a product.
+
+    A side left as ``None`` keeps its current value; both ``None`` drops the bounds.
+    """
+    _set_bound(model, prod, sub, lower, upper, model.prod_SUB_bound, 'sub_bounds',
+               total_prod_SUB(model, prod, sub))
+
+
+def set_rm_bound(model, prod, rm, lower=None, upper=None):
+    """Add or change the bounds on the total ``rm`` amount of a product, like ``set_sub_bound``."""
+    _set_bound(model, prod, rm, lower, upper, model.prod_RM_bound, 'rm_bounds',
+               model.Mixer_Level[prod] * model.Mixer_RM_qty[rm] + model.prod_RM_qty[prod, rm])
+
+
+def set_systemic_constraint(model, active=True, limit=None):
+    """Switch the systemic contaminant constraint (model_9) on or off and optionally change its limit."""
+    if limit is not None:
+        model.contaminant_limit = limit
+    if active:
+        model.model_9_constraint.activate()
+    else:
+        model.model_9_constraint.deactivate()
@@ -0,0 +1,358 @@
+from itertools import combinations
+
+import numpy as np
+from pyomo.environ import (
+    Any, Binary, ConcreteModel, Constraint, Expression, NonNegativeReals, Objective, Param, Set, Var,
+    minimize, value
+)
+from pyomo.gdp import Disjunction
+
+from .portfolio import POST_MIXER_COSTS, MixerSpec, default_products
+from .surrogate import MODEL_1, MODEL_2, MODEL_3, MODEL_5
+from .telemetry import stages
+
+# Small positive number to enforce strict inequality between mixer levels
+EPSILON = 0.001
+
+# Formulations of the mixer level separation constraints (see build_model)
+LEVEL_SEPARATIONS = ('abs', 'bigm', 'gdp', 'ordered')
+
+
+# Rules for the named SUB total Expressions. Each sum is built once per index
+# and shared by model_5, the SRI models, the SUB bounds and model_9, so the NL
+# writer emits it as a single common subexpression.
+def _mixer_SUB_rule(model, sub):
+    return sum(model.Mixer_RM_qty[rm] * model.composition[sub, rm] for rm in model.SUB_RM[sub])
+
+
+def _prod_SUB_rule(model, prod, sub):
+    return sum(model.prod_RM_qty[prod, rm] * model.composition[sub, rm] for rm in model.SUB_RM[sub])
+
+
+def _total_prod_SUB_rule(model, prod, sub):
+    return model.Mixer_Level[prod] * model.Mixer_SUB[sub] + model.Prod_SUB[prod, sub]
+
+
+# Sparse view of the composition table: {(sub, rm): content} for non-zero entries only
+def composition_entries(df):
+    values = df.to_numpy(dtype=float)
+    rows, cols = np.nonzero(values)
+    return {(df.index[i], df.columns[j]): values[i, j] for i, j in zip(rows, cols)}
+
+
+# Define the Mixer Total SUB
+def mixer_SUB(model, sub):
+    return model.Mixer_SUB[sub]
+
+
+# Define the Post Mixer Total SUB of one product
+def prod_SUB(model, prod, sub):
+    return model.Prod_SUB[prod, sub]
+
+
+# Define the Total SUB of one product (mixer share plus post mixer additions)
+def total_prod_SUB(model, prod, sub):
+    return model.Total_Prod_SUB[prod, sub]
+
+
+# Feature lookup for the mixer quality surface: mixer SUB totals and mixer RM quantities
+def _mixer_feature(model, name):
+    return model.Mixer_SUB[name] if name in model.SUB else model.Mixer_RM_qty[name]
+
+
+# Mixer quality of a recipe given its SUB_02 total and a feature lookup. The
+# SUB_02 switch replaces the quality surface by a constant 10 once the mixer
+# contains SUB_02.
+def mixer_quality(mixer_SUB_02, feature):
+    switch = mixer_SUB_02 / (mixer_SUB_02 + 0.00001)
+    return (1 - switch) * MODEL_5.expression(feature) + 10 * switch
+
+
+# Define model_5 as a Mixer-Related Equation
+def model_5(model):
+    return mixer_quality(model.Mixer_SUB['SUB_02'], lambda f: _mixer_feature(model, f))
+
+
+# Define model_1, model_2 and model_3 as expressions (SRI Models) for one product
+def model_1(model, prod):
+    return MODEL_1.expression(lambda sub: model.Total_Prod_SUB[prod, sub])
+
+
+def model_2(model, prod):
+    return MODEL_2.expression(lambda sub: model.Total_Prod_SUB[prod, sub])
+
+
+def model_3(model, prod):
+    return MODEL_3.expression(lambda sub: model.Total_Prod_SUB[prod, sub])
+
+
+# Define model_4 as the SRI combining model_1, model_2 and model_3
+def model_4(model, prod):
+    return 0.3 * model.model_1[prod] + 0.2 * model.model_2[prod] + 0.5 * model.model_3[prod]
+
+
+# Define model_6 as an expression (Mixer Cost)
+def model_6(model):
+    return sum(model.mixercosts[rm] * model.Mixer_RM_qty[rm] for rm in model.RM)
+
+
+# Define model_7 as an expression (Post Mixer Cost) for one product
+def model_7(model, prod):
+    return sum(model.postmixer_costs[rm] * model.prod_RM_qty[prod, rm] for rm in model.RM)
+
+
+# Define model_9 as an expression (Contaminant Model)
+def model_9(model):
+    sub = model.contaminant_sub.value
+    return model.contaminant_factor * sum(total_prod_SUB(model, prod, sub) for prod in model.PROD)
+
+
+# Define the objective: mixer share and post mixer cost of every product
+def portfolio_cost(model):
+    return model.cost_scale * sum(
+        model.Mixer_Level[prod] * model.model_6 + model.model_7[prod] for prod in model.PROD
+    )
+
+
+# Product table row of one product, read by the per-product rules
+def product_spec(model, prod):
+    return model.product_spec[prod].value
+
+
+# Rules of the mixer level separation of one pair, one per formulation (see build_model)
+def _mixer_inequality_rule(model, p, q):
+    return abs(model.Mixer_Level[p] - model.Mixer_Level[q]) >= model.epsilon
+
+
+# Mixer_Level_Above[p, q] = 1 when product p sits above product q
+def _mixer_above_rule(model, p, q):
+    big_m = 1 + model.epsilon
+    return (model.Mixer_Level[p] - model.Mixer_Level[q]
+            >= model.epsilon - big_m * (1 - model.Mixer_Level_Above[p, q]))
+
+
+def _mixer_below_rule(model, p, q):
+    big_m = 1 + model.epsilon
+    return (model.Mixer_Level[q] - model.Mixer_Level[p]
+            >= model.epsilon - big_m * model.Mixer_Level_Above[p, q])
+
+
+def _mixer_disjunction_rule(model, p, q):
+    return [model.Mixer_Level[p] - model.Mixer_Level[q] >= model.epsilon,
+            model.Mixer_Level[q] - model.Mixer_Level[p] >= model.epsilon]
+
+
+def _mixer_ordered_rule(model, p, q):
+    low, high = (p, q) if value(model.level_rank[p]) < value(model.level_rank[q]) else (q, p)
+    return model.Mixer_Level[high] - model.Mixer_Level[low] >= model.epsilon
+
+
+def build_model(df, products=None, mixer=None, post_mixer_costs=None, level_pairs=None,
+                contaminant_sub='SUB_25', contaminant_factor=400, contaminant_limit=5.25,
+                epsilon=EPSILON, cost_scale=0.0004, level_separation='abs', level_order=None, telemetry=None):
+    """Build the single-mixer portfolio model for any number of products.
+
+    ``df`` is the RM composition table (SUB rows, RM columns) and ``products``
+    a list of ``ProductSpec`` rows, defaulting to products A-E. Every
+    per-product component is indexed by ``model.PROD`` so model size grows
+    linearly with the portfolio. ``level_pairs`` lists the products whose
+    mixer levels must differ by ``epsilon``; ``None`` means every pair.
+
+    ``level_separation`` selects how that separation is written:
+
+    - ``'abs'``: ``abs(L_p - L_q) >= epsilon`` (non-smooth NLP, the original form)
+    - ``'bigm'``: a binary ordering variable per pair with big-M constraints (MINLP)
+    - ``'gdp'``: a Pyomo GDP Disjunction per pair, for GDPopt or a gdp.* transformation
+    - ``'ordered'``: linear constraints following ``level_order`` (products by
+      increasing mixer level), defaulting to ``heuristic_level_order(products)``
+
+    With a ``Telemetry`` object each build stage (sets, parameters,
+    variables, sub_totals, mixer, products, model_9, inequalities,
+    objective) is reported as a ``build.<stage>`` phase.
+    """
+    if level_separation not in LEVEL_SEPARATIONS:
+        raise ValueError(f'level_separation must be one of {LEVEL_SEPARATIONS}, got {level_separation!r}')
+    products = default_products() if products is None else list(products)
+    mixer = MixerSpec() if mixer is None else mixer
+    post_mixer_costs = POST_MIXER_COSTS if post_mixer_costs is None else post_mixer_costs
+    specs = {p.name: p for p in products}
+    if level_pairs is None:
+        level_pairs = list(combinations(specs, 2))
+
+    stage = stages(telemetry, 'build')
+    stage.start('sets')
+    # Extract the non-zero composition entries and the RMs carrying each SUB
+    comp_entries = composition_entries(df)
+    sub_rms = {sub: [] for sub in df.index}
+    for sub, rm in comp_entries:
+        sub_rms[sub].append(rm)
+
+    model = ConcreteModel()
+
+    # Define Sets - substances, raw materials and products
+    model.SUB = Set(initialize=df.index.tolist())
+    model.RM = Set(initialize=df.columns.tolist())
+    model.PROD = Set(initialize=list(specs))
+    model.LEVEL_PAIRS = Set(dimen=2, initialize=level_pairs)
+
+    # RMs with non-zero content of each SUB; SUB sums only run over these
+    model.SUB_RM = Set(model.SUB, within=model.RM, initialize=sub_rms)
+
+    stage.start('parameters')
+    # Define Parameters (zero entries are not stored)
+    model.composition = Param(model.SUB, model.RM, initialize=comp_entries, default=0)
+
+    # Costs and thresholds are mutable so prices and targets can change between
+    # solves without rebuilding the model (see update_parameters)
+    model.mixercosts = Param(model.RM, initialize=mixer.costs, default=0, mutable=True)
+    model.postmixer_costs = Param(model.RM, initialize=post_mixer_costs, default=0, mutable=True)
+    model.sri_threshold = Param(model.PROD, initialize={p: s.sri_threshold for p, s in specs.items()},
+                                mutable=True)
+    model.mixer_quality_threshold = Param(initialize=mixer.quality_threshold, mutable=True)
+    model.contaminant_limit = Param(initialize=contaminant_limit, mutable=True)
+
+    # Fixed settings of the formulation, kept on the model for evaluators and reports
+    model.contaminant_sub = Param(initialize=contaminant_sub, within=Any)
+    model.contaminant_factor = Param(initialize=contaminant_factor)
+    model.epsilon = Param(initialize=epsilon)
+    model.cost_scale = Param(initialize=cost_scale)
+    model.level_separation = Param(initialize=level_separation, within=Any)
+
+    # Product table rows, read by the per-product rules so that products can be
+    # added to a built model (see incremental.py)
+    model.product_spec = Param(model.PROD, initialize=specs, within=Any, mutable=True)
+
+    stage.start('variables')
+    # Create Decision Variables
+    model.Mixer_RM_qty = Var(model.RM, within=NonNegativeReals, bounds=(0, 1))
+    model.Mixer_Level = Var(model.PROD, within=NonNegativeReals, bounds=(0, 1),
+                            initialize={p: s.mixer_level_init for p, s in specs.items()})
+    model.prod_RM_qty = Var(model.PROD, model.RM, within=NonNegativeReals, bounds=(0, 1))
+
+    stage.start('sub_totals')
+    # Shared SUB totals, built once and referenced everywhere
+    model.Mixer_SUB = Expression(model.SUB, rule=_mixer_SUB_rule)
+    model.Prod_SUB = Expression(model.PROD, model.SUB, rule=_prod_SUB_rule)
+    model.Total_Prod_SUB = Expression(model.PROD, model.SUB, rule=_total_prod_SUB_rule)
+
+    stage.start('mixer')
+    ### MODEL EXPRESSION AND CONSTRAINTS IN MIXER ###
+    model.model_5_constraint = Constraint(expr=model_5(model) >= model.mixer_quality_threshold)
+    model.model_6 = Expression(rule=model_6)
+
+    # Total Mixer Composition Constraints
+    def mixer_total_quantity_rule(model):
+        return sum(model.Mixer_RM_qty[rm] for rm in model.RM) == 1.0
+    model.mixer_total_quantity_constraint = Constraint(rule=mixer_total_quantity_rule)
+
+    # Mixer Bound Constraint
+    def mixer_lower_bound_rule(model, rm):
+        if rm not in mixer.rm_lower_bounds:
+            return Constraint.Skip
+        return model.Mixer_RM_qty[rm] >= mixer.rm_lower_bounds[rm]
+    model.mixer_lower_bound = Constraint(model.RM, rule=mixer_lower_bound_rule)
+
+    # Component Constraint in the Mixer
+    def mixer_component_rule(model, rm):
+        if rm not in mixer.forbidden_rms:
+            return Constraint.Skip
+        return model.Mixer_RM_qty[rm] == 0
+    model.mixer_component = Constraint(model.RM, rule=mixer_component_rule)
+
+    stage.start('products')
+    ### MODEL EXPRESSIONS PER PRODUCT ###
+    model.model_1 = Expression(model.PROD, rule=model_1)
+    model.model_2 = Expression(model.PROD, rule=model_2)
+    model.model_3 = Expression(model.PROD, rule=model_3)
+    model.model_4 = Expression(model.PROD, rule=model_4)
+    model.model_7 = Expression(model.PROD, rule=model_7)
+
+    ### MODEL CONSTRAINTS PER PRODUCT ###
+    # Total Product Composition Constraints
+    def prod_total_quantity_rule(model, prod):
+        return sum(model.prod_RM_qty[prod, rm] for rm in model.RM) + model.Mixer_Level[prod] == 1.0
+    model.prod_total_quantity_constraint = Constraint(model.PROD, rule=prod_total_quantity_rule)
+
+    # model_4 constraint for the SRI
+    def model_4_rule(model, prod):
+        return model.model_4[prod] >= model.sri_threshold[prod]
+    model.model_4_constraint = Constraint(model.PROD, rule=model_4_rule)
+
+    # Component Constraint in the Post Mixer
+    def prod_component_rule(model, prod, rm):
+        if rm not in product_spec(model, prod).forbidden_rms:
+            return Constraint.Skip
+        return model.prod_RM_qty[prod, rm] == 0
+    model.prod_component = Constraint(model.PROD, model.RM, rule=prod_component_rule)
+
+    # Final Products RM Component Bounds
+    def prod_RM_bound_rule(model, prod, rm):
+        lb, ub = product_spec(model, prod).rm_bounds.get(rm, (None, None))
+        if lb is None and ub is None:
+            return Constraint.Skip
+        return (lb, model.Mixer_Level[prod] * model.Mixer_RM_qty[rm] + model.prod_RM_qty[prod, rm], ub)
+    model.prod_RM_bound = Constraint(model.PROD, model.RM, rule=prod_RM_bound_rule)
+
+    # Final Products SUB Component Bounds
+    def prod_SUB_bound_rule(model, prod, sub):
+        lb, ub = product_spec(model, prod).sub_bounds.get(sub, (None, None))
+        if lb is None and ub is None:
+            return Constraint.Skip
+        return (lb, total_prod_SUB(model, prod, sub), ub)
+    model.prod_SUB_bound = Constraint(model.PROD, model.SUB, rule=prod_SUB_bound_rule)
+
+    stage.start('model_9')
+    # model_9 constraint (Systemic Constraint for Contaminant)
+    model.model_9_constraint = Constraint(
+        expr=model_9(model) <= model.contaminant_limit
+    )
+
+    stage.start('inequalities')
+    # Constraint to ensure the mixer levels of each listed pair are not equal
+    if level_separation == 'abs':
+        model.Mixer_Inequality = Constraint(model.LEVEL_PAIRS, rule=_mixer_inequality_rule)
+
+    elif level_separation == 'bigm':
+        model.Mixer_Level_Above = Var(model.LEVEL_PAIRS, within=Binary, initialize=0)
+        model.Mixer_Inequality_Above = Constraint(model.LEVEL_PAIRS, rule=_mixer_above_rule)
+        model.Mixer_Inequality_Below = Constraint(model.LEVEL_PAIRS, rule=_mixer_below_rule)
+
+    elif level_separation == 'gdp':
+        model.Mixer_Inequality = Disjunction(model.LEVEL_PAIRS, rule=_mixer_disjunction_rule)
+
+    else:
+        order = heuristic_level_order(products) if level_order is None else list(level_order)
+        # Position of each product in the level order (products by increasing mixer level)
+        model.level_rank = Param(model.PROD, initialize={prod: i for i, prod in enumerate(order)}, mutable=True)
+        model.Mixer_Inequality = Constraint(model.LEVEL_PAIRS, rule=_mixer_ordered_rule)
+
+    stage.start('objective')
+    ### OBJECTIVE FUNCTION FORMULA ###
+    model.objective = Objective(rule=portfolio_cost, sense=minimize)
+    stage.stop()
+
+    return model
+
+
+def heuristic_level_order(products):
+    """Products ordered by their initial mixer level (ties keep table order)."""
+    return [p.name for p in sorted(products, key=lambda p: p.mixer_level_init)]
+
+
+def update_parameters(model, mixer_costs=None, post_mixer_costs=None, sri_thresholds=None,
+                      mixer_quality_threshold=None, contaminant_limit=None):
+    """Change prices and targets of a built model in place.
+
+    Cost and threshold dicts are partial updates: only the RMs or products
+    they name are changed.
+    """
+    for rm, cost in (mixer_costs or {}).items():
+        model.mixercosts[rm] = cost
+    for rm, cost in (post_mixer_costs or {}).items():
+        model.postmixer_costs[rm] = cost
+    for prod, threshold in (sri_thresholds or {}).items():
+        model.sri_threshold[prod] = threshold
+    if mixer_quality_threshold is not None:
+        model.mixer_quality_threshold = mixer_quality_threshold
+    if contaminant_limit is not None:
+        model.contaminant_limit = contaminant_limit
@@ -0,0 +1,601 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field, replace
+from itertools import combinations
+
+import numpy as np
+from pyomo.environ import (
+    Any, Binary, ConcreteModel, Constraint, Expression, NonNegativeReals, Objective, Param, Set, UnitInterval, Var,
+    minimize, value
+)
+
+from .heuristic import heuristic_solve
+from .model import (
+    EPSILON, _prod_SUB_rule, build_model, composition_entries, mixer_quality, model_1, model_2, model_3, model_4,
+    model_7, model_9
+)
+from .portfolio import POST_MIXER_COSTS, MixerSpec, default_products
+from .results import extract_result
+from .solve import SolverSession, is_optimal
+from .telemetry import phase, stages
+
+# Rows that only help a branch-and-bound MINLP solver; relax-and-fix deactivates them
+SYMMETRY_CONSTRAINTS = ('mixer_symmetry',)
+
+
+@dataclass
+class MultiMixerResult:
+    """Best assignment found by ``multi_mixer_solve``.
+
+    ``groups`` maps every mixer to the ``PortfolioResult`` of its products
+    solved as a single-mixer portfolio; ``objective`` and ``max_violation``
+    are those of the full model once the assignment is loaded (and polished
+    when a solver was given). ``iterations`` counts the accepted improving
+    steps of the ``'enumerate'`` search.
+    """
+    assignment: dict
+    objective: float
+    max_violation: float
+    feasible: bool
+    groups: dict
+    strategy: str
+    evaluations: int
+    iterations: int
+    seconds: float
+    history: list = field(default_factory=list)
+
+
+def identical_mixers(n, mixer=None):
+    """``n`` copies of ``mixer`` (default ``MixerSpec()``) named M1..Mn."""
+    mixer = MixerSpec() if mixer is None else mixer
+    return [replace(mixer, name=f'M{k + 1}') for k in range(n)]
+
+
+def _same_spec(a, b):
+    return replace(a, name=b.name) == b
+
+
+def _mixer_SUB_rule(model, mixer, sub):
+    return sum(model.Mixer_RM_qty[mixer, rm] * model.composition[sub, rm] for rm in model.SUB_RM[sub])
+
+
+def _total_prod_SUB_rule(model, prod, sub):
+    return sum(model.Mixer_Share[prod, m] * model.Mixer_SUB[m, sub] for m in model.MIXER) + model.Prod_SUB[prod, sub]
+
+
+# Define model_5 for one mixer of the multi-mixer model
+def _model_5(model, mixer):
+    def feature(name):
+        return model.Mixer_SUB[mixer, name] if name in model.SUB else model.Mixer_RM_qty[mixer, name]
+    return mixer_quality(model.Mixer_SUB[mixer, 'SUB_02'], feature)
+
+
+# Define model_6 for one mixer of the multi-mixer model
+def _model_6(model, mixer):
+    return sum(model.mixercosts[mixer, rm] * model.Mixer_RM_qty[mixer, rm] for rm in model.RM)
+
+
+def build_multi_mixer_model(df, mixers, products=None, post_mixer_costs=None, level_pairs=None,
+                            contaminant_sub='SUB_25', contaminant_factor=400, contaminant_limit=5.25,
+                            epsilon=EPSILON, cost_scale=0.0004, allowed_mixers=None, symmetry_breaking=True,
+                            telemetry=None):
+    """Build the portfolio model for several mixers, each product drawing from exactly one of them.
+
+    ``mixers`` is a list of ``MixerSpec``; every mixer has its own recipe
+    ``Mixer_RM_qty[mixer, rm]``, ``model_5_constraint[mixer]`` and cost
+    ``model_6[mixer]``. ``Mixer_Assign[prod, mixer]`` is 1 for the mixer a
+    product draws from and ``Mixer_Share[prod, mixer]`` is its share of that
+    mixer, zero for the others, so ``Mixer_Level[prod]`` is the sum of the
+    shares and the SUB totals stay bilinear in recipe and share as in
+    ``build_model``. ``allowed_mixers`` (``{prod: [mixer, ...]}``) restricts
+    the assignment of some products.
+
+    Products listed in ``level_pairs`` (``None``: every pair) must differ by
+    ``epsilon`` in level only when they share a mixer; the separation uses
+    one ordering binary ``Mixer_Level_Above`` per pair with big-M rows that
+    are switched off by the assignment.
+
+    With ``symmetry_breaking`` identical mixers (equal specs but the name)
+    are used in order: the k-th product may go to a mixer of such a group
+    only if an earlier product went to the previous mixer of the group, so
+    relabelling the mixers does not give new solutions.
+    """
+    products = default_products() if products is None else list(products)
+    post_mixer_costs = POST_MIXER_COSTS if post_mixer_costs is None else post_mixer_costs
+    specs = {p.name: p for p in products}
+    mixer_specs = {m.name: m for m in mixers}
+    if level_pairs is None:
+        level_pairs = list(combinations(specs, 2))
+
+    stage = stages(telemetry, 'build')
+    stage.start('sets')
+    comp_entries = composition_entries(df)
+    sub_rms = {sub: [] for sub in df.index}
+    for sub, rm in comp_entries:
+        sub_rms[sub].append(rm)
+
+    model = ConcreteModel()
+    model.SUB = Set(initialize=df.index.tolist())
+    model.RM = Set(initialize=df.columns.tolist())
+    model.PROD = Set(initialize=list(specs))
+    model.MIXER = Set(initialize=list(mixer_specs))
+    model.LEVEL_PAIRS = Set(dimen=2, initialize=level_pairs)
+    model.SUB_RM = Set(model.SUB, within=model.RM, initialize=sub_rms)
+
+    stage.start('parameters')
+    model.composition = Param(model.SUB, model.RM, initialize=comp_entries, default=0)
+    model.mixercosts = Param(model.MIXER, model.RM, mutable=True, default=0, initialize={
+        (m, rm): cost for m, spec in mixer_specs.items() for rm, cost in spec.costs.items()})
+    model.postmixer_costs = Param(model.RM, initialize=post_mixer_costs, default=0, mutable=True)
+    model.sri_threshold = Param(model.PROD, initialize={p: s.sri_threshold for p, s in specs.items()},
+                                mutable=True)
+    model.mixer_quality_threshold = Param(model.MIXER, mutable=True, initialize={
+        m: spec.quality_threshold for m, spec in mixer_specs.items()})
+    model.contaminant_limit = Param(initialize=contaminant_limit, mutable=True)
+    model.contaminant_sub = Param(initialize=contaminant_sub, within=Any)
+    model.contaminant_factor = Param(initialize=contaminant_factor)
+    model.epsilon = Param(initialize=epsilon)
+    model.cost_scale = Param(initialize=cost_scale)
+
+    stage.start('variables')
+    model.Mixer_RM_qty = Var(model.MIXER, model.RM, within=NonNegativeReals, bounds=(0, 1))
+    model.Mixer_Level = Var(model.PROD, within=NonNegativeReals, bounds=(0, 1),
+                            initialize={p: s.mixer_level_init for p, s in specs.items()})
+    model.Mixer_Share = Var(model.PROD, model.MIXER, within=NonNegativeReals, bounds=(0, 1))
+    model.Mixer_Assign = Var(model.PROD, model.MIXER, within=Binary, initialize=0)
+    model.prod_RM_qty = Var(model.PROD, model.RM, within=NonNegativeReals, bounds=(0, 1))
+
+    stage.start('sub_totals')
+    model.Mixer_SUB = Expression(model.MIXER, model.SUB, rule=_mixer_SUB_rule)
+    model.Prod_SUB = Expression(model.PROD, model.SUB, rule=_prod_SUB_rule)
+    model.Total_Prod_SUB = Expression(model.PROD, model.SUB, rule=_total_prod_SUB_rule)
+
+    stage.start('mixer')
+    ### MODEL EXPRESSIONS AND CONSTRAINTS PER MIXER ###
+    def model_5_rule(model, m):
+        return _model_5(model, m) >= model.mixer_quality_threshold[m]
+    model.model_5_constraint = Constraint(model.MIXER, rule=model_5_rule)
+    model.model_6 = Expression(model.MIXER, rule=_model_6)
+
+    def mixer_total_quantity_rule(model, m):
+        return sum(model.Mixer_RM_qty[m, rm] for rm in model.RM) == 1.0
+    model.mixer_total_quantity_constraint = Constraint(model.MIXER, rule=mixer_total_quantity_rule)
+
+    def mixer_lower_bound_rule(model, m, rm):
+        bounds = mixer_specs[m].rm_lower_bounds
+        if rm not in bounds:
+            return Constraint.Skip
+        return model.Mixer_RM_qty[m, rm] >= bounds[rm]
+    model.mixer_lower_bound = Constraint(model.MIXER, model.RM, rule=mixer_lower_bound_rule)
+
+    def mixer_component_rule(model, m, rm):
+        if rm not in mixer_specs[m].forbidden_rms:
+            return Constraint.Skip
+        return model.Mixer_RM_qty[m, rm] == 0
+    model.mixer_component = Constraint(model.MIXER, model.RM, rule=mixer_component_rule)
+
+    stage.start('assignment')
+    ### PRODUCT TO MIXER ASSIGNMENT ###
+    def assignment_rule(model, prod):
+        return sum(model.Mixer_Assign[prod, m] for m in model.MIXER) == 1
+    model.assignment = Constraint(model.PROD, rule=assignment_rule)
+
+    # A product only draws from its assigned mixer
+    def share_rule(model, prod, m):
+        return model.Mixer_Share[prod, m] <= model.Mixer_Assign[prod, m]
+    model.share_assignment = Constraint(model.PROD, model.MIXER, rule=share_rule)
+
+    def level_rule(model, prod):
+        return model.Mixer_Level[prod] == sum(model.Mixer_Share[prod, m] for m in model.MIXER)
+    model.mixer_level_split = Constraint(model.PROD, rule=level_rule)
+
+    def assignment_forbidden_rule(model, prod, m):
+        if allowed_mixers is None or prod not in allowed_mixers or m in allowed_mixers[prod]:
+            return Constraint.Skip
+        return model.Mixer_Assign[prod, m] == 0
+    model.assignment_forbidden = Constraint(model.PROD, model.MIXER, rule=assignment_forbidden_rule)
+
+    if symmetry_breaking:
+        # Consecutive identical mixers: the i-th product may use the later one only if an
+        # earlier product uses the former
+        prods = list(specs)
+        pairs = [(a.name, b.name) for a, b in zip(mixers, mixers[1:]) if _same_spec(a, b)]
+
+        def symmetry_rule(model, i, k):
+            prev, m = pairs[k]
+            return model.Mixer_Assign[prods[i], m] <= sum(model.Mixer_Assign[prods[j], prev] for j in range(i))
+        model.mixer_symmetry = Constraint(range(len(prods)), range(len(pairs)), rule=symmetry_rule)
+
+    stage.start('products')
+    ### MODEL EXPRESSIONS AND CONSTRAINTS PER PRODUCT ###
+    model.model_1 = Expression(model.PROD, rule=model_1)
+    model.model_2 = Expression(model.PROD, rule=model_2)
+    model.model_3 = Expression(model.PROD, rule=model_3)
+    model.model_4 = Expression(model.PROD, rule=model_4)
+    model.model_7 = Expression(model.PROD, rule=model_7)
+
+    def prod_total_quantity_rule(model, prod):
+        return sum(model.prod_RM_qty[prod, rm] for rm in model.RM) + model.Mixer_Level[prod] == 1.0
+    model.prod_total_quantity_constraint = Constraint(model.PROD, rule=prod_total_quantity_rule)
+
+    def model_4_rule(model, prod):
+        return model.model_4[prod] >= model.sri_threshold[prod]
+    model.model_4_constraint = Constraint(model.PROD, rule=model_4_rule)
+
+    def prod_component_rule(model, prod, rm):
+        if rm not in specs[prod].forbidden_rms:
+            return Constraint.Skip
+        return model.prod_RM_qty[prod, rm] == 0
+    model.prod_component = Constraint(model.PROD, model.RM, rule=prod_component_rule)
+
+    def prod_RM_bound_rule(model, prod, rm):
+        lb, ub = specs[prod].rm_bounds.get(rm, (None, None))
+        if lb is None and ub is None:
+            return Constraint.Skip
+        from_mixers = sum(model.Mixer_Share[prod, m] * model.Mixer_RM_qty[m, rm] for m in model.MIXER)
+        return (lb, from_mixers + model.prod_RM_qty[prod, rm], ub)
+    model.prod_RM_bound = Constraint(model.PROD, model.RM, rule=prod_RM_bound_rule)
+
+    def prod_SUB_bound_rule(model, prod, sub):
+        lb, ub = specs[prod].sub_bounds.get(sub, (None, None))
+        if lb is None and ub is None:
+            return Constraint.Skip
+        return (lb, model.Total_Prod_SUB[prod, sub], ub)
+    model.prod_SUB_bound = Constraint(model.PROD, model.SUB, rule=prod_SUB_bound_rule)
+
+    stage.start('model_9')
+    model.model_9_constraint = Constraint(expr=model_9(model) <= model.contaminant_limit)
+
+    stage.start('inequalities')
+    # Mixer_Level_Above[p, q] = 1 when product p sits above product q; the rows of a mixer
+    # only bind when both products are assigned to it
+    big_m = 1 + epsilon
+    model.Mixer_Level_Above = Var(model.LEVEL_PAIRS, within=Binary, initialize=0)
+
+    def both_assigned(model, p, q, m):
+        return 2 - model.Mixer_Assign[p, m] - model.Mixer_Assign[q, m]
+
+    def mixer_above_rule(model, p, q, m):
+        return (model.Mixer_Share[p, m] - model.Mixer_Share[q, m]
+                >= model.epsilon - big_m * (1 - model.Mixer_Level_Above[p, q]) - big_m * both_assigned(model, p, q, m))
+
+    def mixer_below_rule(model, p, q, m):
+        return (model.Mixer_Share[q, m] - model.Mixer_Share[p, m]
+                >= model.epsilon - big_m * model.Mixer_Level_Above[p, q] - big_m * both_assigned(model, p, q, m))
+    model.Mixer_Inequality_Above = Constraint(model.LEVEL_PAIRS, model.MIXER, rule=mixer_above_rule)
+    model.Mixer_Inequality_Below = Constraint(model.LEVEL_PAIRS, model.MIXER, rule=mixer_below_rule)
+
+    stage.start('objective')
+    def objective_function(model):
+        return model.cost_scale * sum(
+            sum(model.Mixer_Share[prod, m] * model.model_6[m] for m in model.MIXER) + model.model_7[prod]
+            for prod in model.PROD
+        )
+    model.objective = Objective(rule=objective_function, sense=minimize)
+    stage.stop()
+
+    return model
+
+
+def fix_assignment(model, assignment, fix_order=True):
+    """Fix ``Mixer_Assign`` to ``assignment`` (``{prod: mixer}``), leaving an NLP.
+
+    With ``fix_order`` the ordering binaries of the pairs sharing a mixer
+    follow the current shares (the others are fixed to 0, their rows are
+    switched off), like ``level_separation='ordered'`` in ``build_model``.
+    """
+    for prod in model.PROD:
+        for m in model.MIXER:
+            model.Mixer_Assign[prod, m].fix(int(assignment[prod] == m))
+    if fix_order:
+        for p, q in model.LEVEL_PAIRS:
+            above = assignment[p] == assignment[q] and value(model.Mixer_Level[p]) > value(model.Mixer_Level[q])
+            model.Mixer_Level_Above[p, q].fix(int(above))
+
+
+def symmetric_relabel(assignment, mixers, prods):
+    """``{mixer: new mixer}`` that makes ``assignment`` satisfy the ``mixer_symmetry`` rows.
+
+    Within every run of consecutive identical mixers the groups are handed
+    out in order of their first product in ``prods``, unused mixers last.
+    """
+    first = {}
+    for i, prod in enumerate(prods):
+        first.setdefault(assignment[prod], i)
+    runs = [[mixers[0]]]
+    for a, b in zip(mixers, mixers[1:]):
+        if _same_spec(a, b):
+            runs[-1].append(b)
+        else:
+            runs.append([b])
+    relabel = {}
+    for run in runs:
+        used = sorted((m.name for m in run), key=lambda name: first.get(name, len(prods)))
+        relabel.update(zip(used, (m.name for m in run)))
+    return relabel
+
+
+def current_assignment(model):
+    """``{prod: mixer}`` of the largest ``Mixer_Assign`` of every product."""
+    mixers = list(model.MIXER)
+    return {p: mixers[int(np.argmax([value(model.Mixer_Assign[p, m]) for m in mixers]))] for p in model.PROD}
+
+
+def max_violation(model):
+    """Largest bound or constraint violation of the current point of any Pyomo model."""
+    worst = 0.0
+    for con in model.component_data_objects(Constraint, active=True):
+        body = value(con.body, exception=False)
+        if body is None:
+            return float('inf')
+        if con.has_lb():
+            worst = max(worst, value(con.lower) - body)
+        if con.has_ub():
+            worst = max(worst, body - value(con.upper))
+    for var in model.component_data_objects(Var):
+        if var.value is not None and not var.fixed:
+            if var.lb is not None:
+                worst = max(worst, var.lb - var.value)
+            if var.ub is not None:
+                worst = max(worst, var.value - var.ub)
+    return worst
+
+
+def load_groups(model, assignment, groups):
+    """Load single-mixer group solutions (``{mixer: PortfolioResult}``) into the multi-mixer model."""
+    rms = list(model.RM)
+    for m, group in groups.items():
+        for j, rm in enumerate(rms):
+            model.Mixer_RM_qty[m, rm].set_value(group.mixer[j], skip_validation=True)
+        for i, prod in enumerate(group.prods):
+            model.Mixer_Level[prod].set_value(group.levels[i], skip_validation=True)
+            for k in model.MIXER:
+                model.Mixer_Share[prod, k].set_value(group.levels[i] if k == m else 0.0, skip_validation=True)
+            for j, rm in enumerate(rms):
+                model.prod_RM_qty[prod, rm].set_value(group.prod[i, j], skip_validation=True)
+    for prod in model.PROD:
+        for m in model.MIXER:
+            model.Mixer_Assign[prod, m].set_value(int(assignment[prod] == m))
+
+
+# Each worker process keeps the data needed to build and score single-mixer groups
+_worker = {}
+
+
+def _init_worker(df, specs, mixers, build_kwargs, solver_config):
+    _worker.update(df=df, specs=specs, mixers=mixers, build_kwargs=build_kwargs, config=solver_config)
+
+
+def _solve_group(task):
+    # Products of one group on one mixer as a single-mixer portfolio with its share of model_9
+    key, prods, limit = task
+    specs = _worker['specs']
+    pairs = [(p, q) for p, q in _worker['build_kwargs']['level_pairs'] if p in prods and q in prods]
+    model = build_model(_worker['df'], **{**_worker['build_kwargs'], 'products': [specs[p] for p in prods],
+                                          'mixer': _worker['mixers'][key[2]], 'level_pairs': pairs,
+                                          'contaminant_limit': limit})
+    config = _worker['config']
+    try:
+        _, result = heuristic_solve(model, None if config is None else config.create(), quick=config is None)
+    except Exception:  # a failed NLP solve keeps the heuristic recipe loaded by heuristic_solve
+        result = None
+    solution = extract_result(model, result)
+    if config is None:
+        solution.status = 'heuristic'
+    return key, solution
+
+
+class _Groups:
+    # Scores (start, end, mixer) groups of the sorted products over a process pool, caching every group.
+    # Identical mixers share their cache entries.
+
+    def __init__(self, df, specs, mixers, build_kwargs, solver_config, max_workers, order, limit):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.order, self.limit = order, limit
+        self.cache = {}
+        names = list(mixers)
+        self.canonical = {m: next(k for k in names if _same_spec(mixers[k], mixers[m])) for m in names}
+        initargs = (df, specs, mixers, build_kwargs, solver_config)
+        if self.max_workers == 1:
+            _init_worker(*initargs)
+            self.pool = None
+        else:
+            self.pool = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_init_worker,
+                                            initargs=initargs)
+
+    def __getitem__(self, key):
+        start, end, mixer = key
+        return self.cache[start, end, self.canonical[mixer]]
+
+    def solve(self, keys):
+        todo = [k for k in dict.fromkeys((s, e, self.canonical[m]) for s, e, m in keys) if k not in self.cache]
+        # model_9 is shared out by the number of products in the group
+        tasks = [(k, self.order[k[0]:k[1]], self.limit * (k[1] - k[0]) / len(self.order)) for k in todo]
+        rows = map(_solve_group, tasks) if self.pool is None else self.pool.map(_solve_group, tasks)
+        for key, solution in rows:
+            self.cache[key] = solution
+        return len(tasks)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+
+
+def _group_keys(cuts, mixer_order, n):
+    bounds = (0,) + tuple(cuts) + (n,)
+    return [(bounds[k], bounds[k + 1], m) for k, m in enumerate(mixer_order)]
+
+
+def _neighbours(cuts, mixer_order, n, deltas, mixers):
+    # Every cut moved by +-delta (groups stay non-empty) and every exchange of two different mixers' groups
+    out = []
+    for k in range(len(cuts)):
+        low = cuts[k - 1] + 1 if k > 0 else 1
+        high = cuts[k + 1] - 1 if k + 1 < len(cuts) else n - 1
+        for delta in deltas:
+            for c in (cuts[k] - delta, cuts[k] + delta):
+                if low <= c <= high:
+                    out.append((cuts[:k] + (c,) + cuts[k + 1:], mixer_order))
+    for a, b in combinations(range(len(mixer_order)), 2):
+        if _same_spec(mixers[mixer_order[a]], mixers[mixer_order[b]]):
+            continue
+        order = list(mixer_order)
+        order[a], order[b] = order[b], order[a]
+        out.append((cuts, tuple(order)))
+    return out
+
+
+def multi_mixer_solve(df, mixers, products=None, strategy='enumerate', solver_config=None, max_workers=None,
+                      iterations=20, deltas=(1, 2, 4), batch=None, tol=1e-6, telemetry=None, **build_kwargs):
+    """Assign products to mixers and solve the multi-mixer portfolio.
+
+    The assignment search works on single-mixer groups: products are sorted
+    by SRI threshold (products with similar targets suit the same recipe)
+    and cut into one contiguous, non-empty group per mixer. Every group is
+    solved as a ``build_model`` portfolio on its mixer with its share of the
+    contaminant limit, by the quick heuristic or, with ``solver_config``,
+    heuristic plus NLP. Group solutions are cached, and the groups a step
+    needs are solved in parallel over ``max_workers`` processes.
+
+    - ``'enumerate'`` starts from equal groups and enumerates the
+      neighbouring assignments: every cut moved by each of ``deltas`` and
+      every exchange of the groups of two different mixers. It moves to the
+      best one until none improves or after ``iterations``. Each step only
+      solves the few groups not seen before (identical mixers share them),
+      which keeps 4-6 mixers x 50 products tractable.
+    - ``'relax_and_fix'`` starts from the equal groups and needs
+      ``solver_config``. It solves the full model with the assignment
+      relaxed to [0, 1], fixes the ``batch`` products (default: one per
+      mixer) whose share is most concentrated on one mixer, and re-solves
+      until every product is fixed. The symmetry-breaking rows are
+      deactivated, since fixing products one batch at a time does not follow
+      the mixer order.
+
+    With a solver the best assignment is finally polished on the full
+    ``build_multi_mixer_model`` with the assignment and level order fixed,
+    so the contaminant limit is shared freely again. Returns
+    ``(MultiMixerResult, model)`` with the solution loaded in the full model.
+    """
+    if strategy not in ('enumerate', 'relax_and_fix'):
+        raise ValueError(f"strategy must be 'enumerate' or 'relax_and_fix', got {strategy!r}")
+    if strategy == 'relax_and_fix' and solver_config is None:
+        raise ValueError('relax_and_fix needs a solver_config')
+    t0 = time.perf_counter()
+    build_kwargs = {k: v for k, v in build_kwargs.items() if k not in ('level_separation', 'level_order')}
+    products = default_products() if products is None else list(products)
+    if len(products) < len(mixers):
+        raise ValueError(f'{len(products)} products cannot use {len(mixers)} mixers')
+    specs = {p.name: p for p in products}
+    if build_kwargs.get('level_pairs') is None:
+        build_kwargs['level_pairs'] = list(combinations(specs, 2))
+    model = build_multi_mixer_model(df, mixers, products, telemetry=telemetry, **build_kwargs)
+    limit = value(model.contaminant_limit)
+
+    order = [p.name for p in sorted(products, key=lambda p: p.sri_threshold)]
+    n, names = len(order), tuple(m.name for m in mixers)
+    group_kwargs = {k: v for k, v in build_kwargs.items() if k != 'allowed_mixers'}
+    mixer_specs = {m.name: m for m in mixers}
+    groups = _Groups(df, specs, mixer_specs, group_kwargs, solver_config, max_workers, order, limit)
+    allowed = build_kwargs.get('allowed_mixers') or {}
+
+    def score(cuts, mixer_order):
+        # (infeasible, objective or violation) of an assignment from its cached groups
+        keys = _group_keys(cuts, mixer_order, n)
+        solutions = [groups[k] for k in keys]
+        if any(p in allowed and m not in allowed[p] for s, e, m in keys for p in order[s:e]):
+            return True, float('inf')
+        violation = max(s.max_violation for s in solutions)
+        objective = sum(s.objective for s in solutions)
+        return violation > tol, objective if violation <= tol else violation
+
+    cuts = tuple(round(k * n / len(mixers)) for k in range(1, len(mixers)))
+    current = (cuts, names)
+    history, evaluations, steps = [], 0, 0
+    try:
+        with phase(telemetry, 'multi_mixer.groups', iteration=0) as info:
+            evaluations += groups.solve(_group_keys(*current, n))
+            info['groups'] = evaluations
+        best = score(*current)
+        history.append({'iteration': 0, 'cuts': current[0], 'mixers': current[1], 'objective': best[1],
+                        'feasible': not best[0]})
+        if strategy == 'enumerate':
+            for iteration in range(1, iterations + 1):
+                candidates = _neighbours(*current, n, deltas, mixer_specs)
+                with phase(telemetry, 'multi_mixer.groups', iteration=iteration) as info:
+                    info['groups'] = groups.solve([k for c in candidates for k in _group_keys(*c, n)])
+                    evaluations += info['groups']
+                scored = min((score(*c), c) for c in candidates)
+                if scored[0] >= best:
+                    break
+                best, current = scored
+                steps += 1
+                history.append({'iteration': iteration, 'cuts': current[0], 'mixers': current[1],
+                                'objective': best[1], 'feasible': not best[0]})
+    finally:
+        groups.close()
+
+    keys = _group_keys(*current, n)
+    # Groups of identical mixers are interchangeable; relabel them in the order mixer_symmetry expects
+    relabel = symmetric_relabel({p: m for (s, e, m) in keys for p in order[s:e]}, mixers, list(specs))
+    assignment = {p: relabel[m] for (s, e, m) in keys for p in order[s:e]}
+    solutions = {relabel[m]: groups[s, e, m] for (s, e, m) in keys}
+    load_groups(model, assignment, solutions)
+
+    if solver_config is not None:
+        session = SolverSession(model, replace(solver_config, scaling=False))
+        if strategy == 'relax_and_fix':
+            with phase(telemetry, 'multi_mixer.relax_and_fix'):
+                assignment = relax_and_fix(model, session, batch or len(mixers))
+        fix_assignment(model, assignment)
+        with phase(telemetry, 'multi_mixer.polish') as info:
+            result = session.solve(warm_start=True)
+            info['status'] = 'optimal' if is_optimal(result) else str(result.solver.termination_condition)
+        if not is_optimal(result) and strategy == 'enumerate':
+            load_groups(model, assignment, solutions)
+    else:
+        fix_assignment(model, assignment)
+
+    violation = max_violation(model)
+    return MultiMixerResult(
+        assignment=assignment, objective=value(model.objective), max_violation=violation,
+        feasible=violation <= tol, groups=solutions, strategy=strategy, evaluations=evaluations,
+        iterations=steps, seconds=time.perf_counter() - t0, history=history,
+    ), model
+
+
+def relax_and_fix(model, session, batch):
+    """Relax-and-fix the product assignment of a multi-mixer model; returns ``{prod: mixer}``.
+
+    ``Mixer_Assign`` and ``Mixer_Level_Above`` are relaxed to [0, 1] and the
+    symmetry-breaking rows deactivated. Every round solves the relaxation
+    from the current point and fixes the ``batch`` free products whose level
+    comes most from a single mixer. A failed solve fixes the remaining
+    products to their current largest share.
+    """
+    for name in SYMMETRY_CONSTRAINTS:
+        if model.component(name) is not None:
+            model.component(name).deactivate()
+    for var in (*model.Mixer_Assign.values(), *model.Mixer_Level_Above.values()):
+        var.unfix()
+        var.domain = UnitInterval
+    mixers = list(model.MIXER)
+    free = list(model.PROD)
+    assignment = {}
+    while free:
+        result = session.solve(warm_start=True)
+        if not is_optimal(result):
+            batch = len(free)
+        shares = np.array([[value(model.Mixer_Share[p, m]) for m in mixers] for p in free])
+        concentration = shares.max(axis=1) / np.maximum(shares.sum(axis=1), 1e-12)
+        chosen = np.argsort(-concentration, kind='stable')[:batch]
+        for i in chosen:
+            prod, m = free[i], mixers[int(np.argmax(shares[i]))]
+            assignment[prod] = m
+            for k in mixers:
+                model.Mixer_Assign[prod, k].fix(int(k == m))
+        chosen = set(chosen)
+        free = [p for i, p in enumerate(free) if i not in chosen]
+    for var in (*model.Mixer_Assign.values(), *model.Mixer_Level_Above.values()):
+        var.domain = Binary
+    return assignment
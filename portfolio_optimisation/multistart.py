@@ -0,0 +1,134 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Optional
+
+import numpy as np
+from pyomo.environ import value
+
+from .model import build_model
+from .solve import is_optimal, make_solver, solve
+
+
+@dataclass
+class StartResult:
+    start: int
+    status: str
+    objective: float
+    seconds: float
+    point: dict = None
+
+
+@dataclass
+class MultiStartResult:
+    # None when no start reached a local optimum
+    best: Optional[StartResult]
+    runs: list = field(default_factory=list)
+
+    @property
+    def objectives(self):
+        """Objectives of the starts that reached a local optimum, sorted."""
+        return np.sort([r.objective for r in self.runs if r.status == 'optimal'])
+
+
+# Read and write the decision variables as arrays ordered like model.RM / model.PROD
+def get_point(model):
+    rms, prods = list(model.RM), list(model.PROD)
+    return {
+        'Mixer_RM_qty': np.array([model.Mixer_RM_qty[rm].value for rm in rms], dtype=float),
+        'Mixer_Level': np.array([model.Mixer_Level[p].value for p in prods], dtype=float),
+        'prod_RM_qty': np.array([[model.prod_RM_qty[p, rm].value for rm in rms] for p in prods], dtype=float),
+    }
+
+
+def set_point(model, point):
+    rms, prods = list(model.RM), list(model.PROD)
+    for j, rm in enumerate(rms):
+        model.Mixer_RM_qty[rm].set_value(point['Mixer_RM_qty'][j], skip_validation=True)
+    for i, p in enumerate(prods):
+        model.Mixer_Level[p].set_value(point['Mixer_Level'][i], skip_validation=True)
+        for j, rm in enumerate(rms):
+            model.prod_RM_qty[p, rm].set_value(point['prod_RM_qty'][i, j], skip_validation=True)
+
+
+def latin_hypercube(n, dim, rng):
+    """n samples in [0, 1)^dim with one sample per stratum in every dimension."""
+    strata = np.argsort(rng.random((dim, n)), axis=1).T
+    return (strata + rng.random((n, dim))) / n
+
+
+def sample_starts(model, n_starts, seed=None):
+    """Latin hypercube starting points projected onto the simple recipe constraints.
+
+    Forbidden RMs are zeroed, mixer lower bounds are respected and each recipe
+    is scaled so that the mixer sums to one and every product sums to one
+    together with its mixer level.
+    """
+    rng = np.random.default_rng(seed)
+    rms, prods = list(model.RM), list(model.PROD)
+    n_rm, n_prod = len(rms), len(prods)
+    u = latin_hypercube(n_starts, n_rm + n_prod + n_prod * n_rm, rng)
+
+    mixer_allowed = np.array([rm not in model.mixer_component for rm in rms])
+    mixer_lb = np.array([value(model.mixer_lower_bound[rm].lower) if rm in model.mixer_lower_bound else 0.0
+                         for rm in rms], dtype=float)
+    prod_allowed = np.array([[(p, rm) not in model.prod_component for rm in rms] for p in prods])
+
+    mixer = u[:, :n_rm] * mixer_allowed
+    mixer *= max(1.0 - mixer_lb.sum(), 0.0) / np.maximum(mixer.sum(axis=1, keepdims=True), 1e-12)
+    mixer += mixer_lb
+    levels = u[:, n_rm:n_rm + n_prod]
+    prod = u[:, n_rm + n_prod:].reshape(n_starts, n_prod, n_rm) * prod_allowed
+    prod *= (1.0 - levels)[:, :, None] / np.maximum(prod.sum(axis=2, keepdims=True), 1e-12)
+
+    return [
+        {'Mixer_RM_qty': mixer[k], 'Mixer_Level': levels[k], 'prod_RM_qty': prod[k]}
+        for k in range(n_starts)
+    ]
+
+
+# Each worker process builds its own copy of the model once and reuses it for every start
+_worker = {}
+
+
+def _init_worker(df, build_kwargs, solver_kwargs):
+    _worker['model'] = build_model(df, **build_kwargs)
+    _worker['solver'] = make_solver(**solver_kwargs)
+
+
+def _solve_start(start, point):
+    model, solver = _worker['model'], _worker['solver']
+    set_point(model, point)
+    t0 = time.perf_counter()
+    try:
+        result = solve(model, solver)
+    except Exception as exc:  # solver crashes must not take the whole pool down
+        return StartResult(start, f'error: {exc}', float('nan'), time.perf_counter() - t0)
+    seconds = time.perf_counter() - t0
+    if not is_optimal(result):
+        return StartResult(start, str(result.solver.termination_condition), float('nan'), seconds)
+    return StartResult(start, 'optimal', value(model.objective), seconds, get_point(model))
+
+
+def multistart(df, n_starts=16, max_workers=None, seed=None, solver_kwargs=None, **build_kwargs):
+    """Solve the portfolio model from ``n_starts`` Latin hypercube points in parallel.
+
+    ``build_kwargs`` are passed to ``build_model`` in every worker and
+    ``solver_kwargs`` to ``make_solver`` (name, executable, options). Returns a
+    ``MultiStartResult`` with the best local optimum and every run; load the
+    best point into a model with ``set_point(model, result.best.point)``.
+    ``result.best`` is ``None`` when no start solved, and the statuses in
+    ``result.runs`` then say why.
+    """
+    solver_kwargs = solver_kwargs or {}
+    starts = sample_starts(build_model(df, **build_kwargs), n_starts, seed)
+    max_workers = min(max_workers or os.cpu_count() or 1, n_starts)
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                             initargs=(df, build_kwargs, solver_kwargs)) as pool:
+        runs = list(pool.map(_solve_start, range(n_starts), starts))
+
+    solved = [r for r in runs if r.status == 'optimal']
+    best = min(solved, key=lambda r: r.objective) if solved else None
+    return MultiStartResult(best, runs)
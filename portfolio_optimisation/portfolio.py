@@ -0,0 +1,103 @@
+from dataclasses import dataclass, field
+
+# Define Mixer Costs Dictionary
+MIXER_COSTS = {
+    'RM_01': 800, 'RM_02': 400, 'RM_03': 600, 'RM_05': 1200, 'RM_06': 700,
+    'RM_08': 100, 'RM_09': 700, 'RM_10': 1200, 'RM_12': 5000, 'RM_14': 1000,
+    'RM_15': 500, 'RM_16': 200, 'RM_18': 800, 'RM_19': 2000, 'RM_20': 6000,
+    'RM_21': 900, 'RM_22': 500, 'RM_23': 1100
+}
+
+# Define Post Mixer Costs Dictionary
+POST_MIXER_COSTS = {
+    'RM_03': 600, 'RM_05': 1200, 'RM_07': 3500, 'RM_08': 100, 'RM_09': 700,
+    'RM_11': 9000, 'RM_12': 5000, 'RM_13': 5000, 'RM_17': 700, 'RM_18': 800,
+    'RM_20': 6000, 'RM_23': 1100, 'RM_04': 2100
+}
+
+# Mixer Bound Constraint (lower bounds on the mixer recipe)
+MIXER_RM_LOWER_BOUNDS = {'RM_15': 0.005, 'RM_14': 0.06, 'RM_05': 0.25, 'RM_18': 0.01}
+
+# Component Constraint in the Mixer (RMs that cannot go into the mixer)
+MIXER_FORBIDDEN_RMS = [
+    'RM_03', 'RM_04', 'RM_07', 'RM_08', 'RM_09', 'RM_11',
+    'RM_12', 'RM_13', 'RM_17', 'RM_20', 'RM_23'
+]
+
+# Component Constraint in the Post Mixer (RMs that can only come from the mixer)
+PRODUCT_FORBIDDEN_RMS = [
+    'RM_01', 'RM_02', 'RM_05', 'RM_06', 'RM_10', 'RM_14',
+    'RM_15', 'RM_16', 'RM_18', 'RM_19', 'RM_21', 'RM_22'
+]
+
+# Final Products RM Component Bounds as (lower, upper), None means unbounded
+PRODUCT_RM_BOUNDS = {
+    'RM_12': (0.008, None),
+    'RM_18': (None, 0.02),
+    'RM_08': (None, 0.46),
+}
+
+# Final Products SUB Component Bounds as (lower, upper), None means unbounded
+PRODUCT_SUB_BOUNDS = {
+    'SUB_21': (0, 0.75),
+    'SUB_27': (0.003, 0.02),
+    'SUB_03': (None, 0.09),
+    'SUB_26': (0.02, 0.2),
+    'SUB_20': (0.001, None),
+    'SUB_19': (0.0001, 0.0009),
+    'SUB_18': (0.0001, 0.0065),
+    'SUB_10': (None, 0.029),
+    'SUB_24': (0, 0.2),
+    'SUB_09': (0.002, 0.05),
+    'SUB_16': (0.0055, 0.018),
+    'SUB_15': (None, 0.7),
+    'SUB_23': (0, 0.16),
+}
+
+# Pairs of products whose mixer levels must differ (the original 5-product study)
+DEFAULT_LEVEL_PAIRS = [
+    ('A', 'B'), ('A', 'C'), ('A', 'E'), ('B', 'C'), ('B', 'D'), ('C', 'D'), ('D', 'E')
+]
+
+
+@dataclass
+class MixerSpec:
+    """Recipe rules and costs of a mixer shared by several products."""
+    name: str = 'M1'
+    costs: dict = field(default_factory=lambda: dict(MIXER_COSTS))
+    rm_lower_bounds: dict = field(default_factory=lambda: dict(MIXER_RM_LOWER_BOUNDS))
+    forbidden_rms: list = field(default_factory=lambda: list(MIXER_FORBIDDEN_RMS))
+    quality_threshold: float = 9
+
+
+@dataclass
+class ProductSpec:
+    """One row of the product table used by ``build_model``."""
+    name: str
+    sri_threshold: float
+    sub_bounds: dict = field(default_factory=lambda: dict(PRODUCT_SUB_BOUNDS))
+    rm_bounds: dict = field(default_factory=lambda: dict(PRODUCT_RM_BOUNDS))
+    forbidden_rms: list = field(default_factory=lambda: list(PRODUCT_FORBIDDEN_RMS))
+    mixer_level_init: float = 0.0
+
+
+def default_products():
+    """Products A-E of the original study with their SRI thresholds."""
+    return [
+        ProductSpec('A', 52, mixer_level_init=1),
+        ProductSpec('B', 47, mixer_level_init=0),
+        ProductSpec('C', 44, mixer_level_init=1),
+        ProductSpec('D', 53, mixer_level_init=0),
+        ProductSpec('E', 48, mixer_level_init=1),
+    ]
+
+
+def product_table(rows):
+    """Build ProductSpecs from a list of dicts or a DataFrame with one row per product.
+
+    Missing columns fall back to the defaults of the original study, so a table
+    with only ``name`` and ``sri_threshold`` is enough for a 30-80 product run.
+    """
+    if hasattr(rows, 'to_dict'):
+        rows = rows.to_dict(orient='records')
+    return [ProductSpec(**row) for row in rows]
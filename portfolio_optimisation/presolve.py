@@ -0,0 +1,176 @@
+from dataclasses import dataclass, field
+
+from pyomo.common.collections import ComponentMap
+from pyomo.environ import Constraint, value
+from pyomo.repn import generate_standard_repn
+
+
+@dataclass
+class PresolveResult:
+    """What ``presolve`` changed; ``undo`` restores the model as it was."""
+    fixed: list = field(default_factory=list)
+    bounds: ComponentMap = field(default_factory=ComponentMap)
+    deactivated: list = field(default_factory=list)
+    rounds: int = 0
+
+    @property
+    def tightened(self):
+        return len(self.bounds)
+
+    def undo(self):
+        for var in self.fixed:
+            var.unfix()
+        for var, (lb, ub) in self.bounds.items():
+            var.setlb(lb)
+            var.setub(ub)
+        for con in self.deactivated:
+            con.activate()
+        self.fixed, self.bounds, self.deactivated = [], ComponentMap(), []
+
+
+def fix_forbidden(model):
+    """Fix the RMs constrained to zero and deactivate their ``var == 0`` rows.
+
+    Covers ``mixer_component`` and ``prod_component``; the NL writer and the
+    appsi interfaces leave fixed variables out of the problem. Returns the
+    number of fixed variables.
+    """
+    fixed = 0
+    for rm in model.mixer_component:
+        model.Mixer_RM_qty[rm].fix(0)
+        model.mixer_component[rm].deactivate()
+        fixed += 1
+    for prod, rm in model.prod_component:
+        model.prod_RM_qty[prod, rm].fix(0)
+        model.prod_component[prod, rm].deactivate()
+        fixed += 1
+    return fixed
+
+
+def _linear_rows(model):
+    # Active linear constraints as [constraint, vars, coefs, lower, upper] with the constant moved out
+    rows = []
+    for con in model.component_data_objects(Constraint, active=True):
+        if con.body.polynomial_degree() != 1:
+            continue
+        repn = generate_standard_repn(con.body, compute_values=True, quadratic=False)
+        lower = value(con.lower) - repn.constant if con.has_lb() else None
+        upper = value(con.upper) - repn.constant if con.has_ub() else None
+        rows.append([con, list(repn.linear_vars), list(repn.linear_coefs), lower, upper])
+    return rows
+
+
+class _Bounds:
+    # Bound changes recorded in a PresolveResult
+
+    def __init__(self, result, tol):
+        self.result = result
+        self.tol = tol
+
+    def tighten(self, var, lb=None, ub=None, where=None):
+        changed = False
+        if lb is not None and (var.lb is None or lb > var.lb + self.tol * (1 + abs(lb))):
+            self.result.bounds.setdefault(var, (var.lb, var.ub))
+            var.setlb(lb)
+            changed = True
+        if ub is not None and (var.ub is None or ub < var.ub - self.tol * (1 + abs(ub))):
+            self.result.bounds.setdefault(var, (var.lb, var.ub))
+            var.setub(ub)
+            changed = True
+        if var.lb is not None and var.ub is not None and var.lb > var.ub:
+            if var.lb > var.ub + self.tol * (1 + abs(var.ub)):
+                raise ValueError(f'presolve: {where or var.name} leaves {var.name} with an empty '
+                                 f'range [{var.lb}, {var.ub}]')
+            var.setlb(var.ub)
+        return changed
+
+
+def presolve(model, max_rounds=20, tol=1e-9):
+    """Remove fixed-to-zero variables and propagate bounds through the linear constraints.
+
+    Every active constraint that is linear in the free variables is used:
+
+    - single-variable rows (``Mixer_RM_qty[rm] == 0``, ``Mixer_RM_qty['RM_05'] >= 0.25``)
+      become variable bounds and are deactivated;
+    - rows with several variables (the sum-to-one rows, level ordering rows)
+      tighten the bounds of each variable from the activity range of the
+      others, e.g. the mixer lower bounds cap every other mixer RM at 0.675;
+    - variables whose bounds meet are fixed, and rows left without free
+      variables are checked and deactivated.
+
+    Fixed variables and deactivated rows are left out of the ``.nl`` file and
+    the appsi models, so Ipopt factorises a smaller KKT system. Nonlinear
+    constraints are untouched. Mutable parameters are read at their current
+    values. Returns a ``PresolveResult``; ``result.undo()`` reverts the model.
+    """
+    result = PresolveResult()
+    bounds = _Bounds(result, tol)
+    rows = _linear_rows(model)
+
+    for result.rounds in range(1, max_rounds + 1):
+        changed = False
+        for row in rows:
+            con, variables, coefs, lower, upper = row
+            if not con.active:
+                continue
+            # Move variables fixed since the last pass into the row bounds
+            if any(v.fixed for v in variables):
+                shift = sum(a * v.value for v, a in zip(variables, coefs) if v.fixed)
+                coefs = [a for v, a in zip(variables, coefs) if not v.fixed]
+                variables = [v for v in variables if not v.fixed]
+                lower = None if lower is None else lower - shift
+                upper = None if upper is None else upper - shift
+                row[1:] = variables, coefs, lower, upper
+
+            if not variables:
+                if (lower is not None and lower > tol) or (upper is not None and upper < -tol):
+                    raise ValueError(f'presolve: {con.name} is infeasible with the fixed variables')
+                con.deactivate()
+                result.deactivated.append(con)
+                continue
+
+            if len(variables) == 1:
+                var, a = variables[0], coefs[0]
+                lb, ub = (lower, upper) if a > 0 else (upper, lower)
+                changed |= bounds.tighten(var, None if lb is None else lb / a, None if ub is None else ub / a,
+                                          con.name)
+                con.deactivate()
+                result.deactivated.append(con)
+                continue
+
+            # Activity range of a*x over the bounds of each variable
+            low = [a * (v.lb if a > 0 else v.ub) if (v.lb if a > 0 else v.ub) is not None else None
+                   for v, a in zip(variables, coefs)]
+            high = [a * (v.ub if a > 0 else v.lb) if (v.ub if a > 0 else v.lb) is not None else None
+                    for v, a in zip(variables, coefs)]
+            low_unbounded = sum(x is None for x in low)
+            high_unbounded = sum(x is None for x in high)
+            low_sum = sum(x for x in low if x is not None)
+            high_sum = sum(x for x in high if x is not None)
+            for var, a, lo, hi in zip(variables, coefs, low, high):
+                new_lb = new_ub = None
+                if upper is not None:
+                    # a x <= upper - (minimum activity of the others)
+                    others = low_unbounded - (lo is None)
+                    if others == 0:
+                        limit = (upper - (low_sum - (lo or 0))) / a
+                        new_lb, new_ub = (None, limit) if a > 0 else (limit, None)
+                if lower is not None:
+                    others = high_unbounded - (hi is None)
+                    if others == 0:
+                        limit = (lower - (high_sum - (hi or 0))) / a
+                        if a > 0:
+                            new_lb = limit
+                        else:
+                            new_ub = limit
+                changed |= bounds.tighten(var, new_lb, new_ub, con.name)
+
+        # Fix the variables whose bounds met
+        for var in list(result.bounds):
+            if not var.fixed and var.lb is not None and var.lb == var.ub:
+                var.fix(var.lb)
+                result.fixed.append(var)
+                changed = True
+        if not changed:
+            break
+    return result
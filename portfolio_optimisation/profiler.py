@@ -0,0 +1,193 @@
+import os
+import re
+import tempfile
+from dataclasses import asdict, dataclass
+
+from pyomo.common.numeric_types import native_numeric_types
+from pyomo.core.expr import DivisionExpression, LinearExpression, NegationExpression, ProductExpression, SumExpression
+from pyomo.core.expr.visitor import StreamBasedExpressionVisitor
+from pyomo.environ import Constraint, Expression, Objective
+
+# Operators that stay linear whatever their arguments; any other operator with a
+# non-constant argument is a nonlinear term (products and divisions are checked below)
+_LINEAR_OPERATORS = (SumExpression, LinearExpression, NegationExpression)
+
+# First letters of NL segment headers; expression lines start with o, n, v, f, h, s or l
+_NL_SEGMENTS = set('CLOVJGFSbrxkd')
+OTHER = '(other)'
+
+
+@dataclass
+class ComponentProfile:
+    """Size of one named component of the model.
+
+    ``nodes`` and ``nonlinear_terms`` count the component's own expression
+    trees, a reference to a named Expression counting as a single node (the
+    Expression has its own row). ``variables`` sums the distinct free
+    variables each member depends on, through named Expressions included.
+    For constraints ``jacobian_nnz`` equals ``variables`` (the objective
+    gradient is not counted), and for constraints and the objective
+    ``hessian_nnz`` is the structural upper bound ``k (k + 1) / 2`` per
+    member with ``k`` variables appearing nonlinearly. ``nl_bytes`` is what
+    the component takes in the ``.nl`` file: constraint and Jacobian
+    segments, objective and gradient segments, or defined-variable segments
+    of an Expression.
+    """
+    name: str
+    kind: str
+    rows: int = 0
+    nodes: int = 0
+    nonlinear_terms: int = 0
+    variables: int = 0
+    jacobian_nnz: int = 0
+    hessian_nnz: int = 0
+    nl_bytes: int = 0
+
+
+class _Walker(StreamBasedExpressionVisitor):
+    # Bottom-up walk returning (non-constant, variable ids, nonlinear variable ids) of an expression
+    # while counting its nodes and nonlinear operators. Named Expressions are walked once by
+    # their own walker and reused from ``cache``.
+
+    def __init__(self, cache):
+        super().__init__()
+        self.cache = cache
+        self.nodes = 0
+        self.nonlinear = 0
+
+    def run(self, expr):
+        if expr.__class__ in native_numeric_types or not expr.is_expression_type() or expr.is_named_expression_type():
+            return self.beforeChild(None, expr, 0)[1]
+        return self.walk_expression(expr)
+
+    def beforeChild(self, node, child, child_idx):
+        if child.__class__ in native_numeric_types:
+            self.nodes += 1
+            return False, (False, frozenset(), frozenset())
+        if child.is_named_expression_type():
+            self.nodes += 1
+            return False, walk(child, self.cache)[0]
+        if not child.is_expression_type():
+            self.nodes += 1
+            if child.is_variable_type() and not child.fixed:
+                return False, (True, frozenset((id(child),)), frozenset())
+            return False, (False, frozenset(), frozenset())
+        return True, None
+
+    def exitNode(self, node, data):
+        self.nodes += 1
+        varying = [d for d in data if d[0]]
+        variables = frozenset().union(*(d[1] for d in varying))
+        nonlinear_vars = frozenset().union(*(d[2] for d in varying))
+        if isinstance(node, ProductExpression):
+            nonlinear = len(varying) > 1
+        elif isinstance(node, DivisionExpression):
+            nonlinear = data[1][0]
+        else:
+            nonlinear = bool(varying) and not isinstance(node, _LINEAR_OPERATORS)
+        if nonlinear:
+            self.nonlinear += 1
+            nonlinear_vars = variables
+        return bool(varying), variables, nonlinear_vars
+
+
+def walk(expr, cache=None):
+    """``((non-constant, variables, nonlinear variables), nodes, nonlinear terms)`` of ``expr``.
+
+    A named Expression is walked through its ``expr`` and memoised in ``cache``
+    (a dict keyed by ``id``), so shared subexpressions are walked only once.
+    """
+    cache = {} if cache is None else cache
+    if expr.__class__ not in native_numeric_types and expr.is_named_expression_type():
+        key = id(expr)
+        if key not in cache:
+            cache[key] = walk(expr.expr, cache)
+        return cache[key]
+    walker = _Walker(cache)
+    return walker.run(expr), walker.nodes, walker.nonlinear
+
+
+def _component_name(comment):
+    # "nl(Total_Prod_SUB[A,SUB_09])" -> "Total_Prod_SUB"
+    name = comment.strip()
+    if name.startswith('nl(') and name.endswith(')'):
+        name = name[3:-1]
+    return name.split('[', 1)[0]
+
+
+def nl_bytes(model):
+    """Bytes of the model's ``.nl`` file per component name (header, bounds and guesses under ``OTHER``).
+
+    The file is written with symbolic labels to attribute every segment, and
+    the label comments are not counted.
+    """
+    sizes = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'model.nl')
+        model.write(path, format='nl', io_options={'symbolic_solver_labels': True})
+        rows, name = {}, OTHER
+        with open(path) as f:
+            for line in f:
+                code, _, comment = line.partition('#')
+                if line[:1] in _NL_SEGMENTS:
+                    kind, index = line[0], re.match(r'\w(\d*)', line).group(1)
+                    if kind in 'COV':
+                        name = _component_name(comment)
+                        rows[kind, index] = name
+                    elif kind == 'J':
+                        name = rows.get(('C', index), OTHER)
+                    elif kind == 'G':
+                        name = rows.get(('O', index), OTHER)
+                    else:
+                        name = OTHER
+                size = len(code.rstrip()) + 1
+                sizes[name] = sizes.get(name, 0) + size
+    return sizes
+
+
+def profile_model(model, nl=True):
+    """Per-component profile of the active constraints, the objective and the named Expressions.
+
+    Returns one ``ComponentProfile`` per component in declaration order,
+    followed by an ``OTHER`` row holding the rest of the ``.nl`` file. Use it
+    to find the blocks that dominate build time (``nodes``), solver work
+    (``jacobian_nnz``, ``hessian_nnz``) and NL size as products and RMs are
+    added. ``nl=False`` skips writing the ``.nl`` file, which is the slow part
+    for large portfolios.
+    """
+    cache = {}
+    profiles = []
+    for component in model.component_objects((Constraint, Objective, Expression), active=True,
+                                              descend_into=True):
+        kind = {Constraint: 'constraint', Objective: 'objective', Expression: 'expression'}[component.ctype]
+        profile = ComponentProfile(component.name, kind)
+        for data in component.values():
+            if kind == 'constraint' and not data.active:
+                continue
+            if kind == 'expression':
+                (_, variables, nonlinear_vars), nodes, nonlinear = walk(data, cache)
+            else:
+                (_, variables, nonlinear_vars), nodes, nonlinear = walk(data.body if kind == 'constraint'
+                                                                         else data.expr, cache)
+                if kind == 'constraint':
+                    profile.jacobian_nnz += len(variables)
+                profile.hessian_nnz += len(nonlinear_vars) * (len(nonlinear_vars) + 1) // 2
+            profile.rows += 1
+            profile.nodes += nodes
+            profile.nonlinear_terms += nonlinear
+            profile.variables += len(variables)
+        profiles.append(profile)
+
+    if nl:
+        sizes = nl_bytes(model)
+        for profile in profiles:
+            profile.nl_bytes = sizes.pop(profile.name, 0)
+        profiles.append(ComponentProfile(OTHER, 'nl', nl_bytes=sum(sizes.values())))
+    return profiles
+
+
+def profile_frame(profiles):
+    """The profiles as a pandas DataFrame, largest ``.nl`` contribution first."""
+    import pandas as pd
+    frame = pd.DataFrame([asdict(p) for p in profiles])
+    return frame.sort_values(['nl_bytes', 'nodes'], ascending=False, ignore_index=True)
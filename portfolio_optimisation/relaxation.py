@@ -0,0 +1,426 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+import numpy as np
+from pyomo.common.collections import ComponentMap
+
+from .evaluate import BatchEvaluator
+from .presolve import _linear_rows
+from .scaling import SRI_WEIGHTS, _surface_arrays
+from .surrogate import MODEL_1, MODEL_2, MODEL_3, MODEL_5
+from .telemetry import phase
+
+# linprog status of an infeasible LP
+_INFEASIBLE = 2
+
+
+@dataclass
+class GapCertificate:
+    """Lower bound on the objective from a convex relaxation, and the gap to an incumbent.
+
+    ``status`` is ``'bounded'`` when the relaxation gave ``lower_bound``,
+    ``'pruned'`` when no point of the relaxation beats ``upper_bound`` (the
+    incumbent is then globally optimal up to the LP tolerances),
+    ``'infeasible'`` when the relaxation, hence the model, has no feasible
+    point and ``'failed'`` when the bounding LP did not solve. ``gap`` is
+    ``upper_bound - lower_bound`` and ``relative_gap`` the gap over
+    ``|upper_bound|``; both are nan without an incumbent, and the gap is
+    negative when ``upper_bound`` lies below the bound, so it cannot be
+    the objective of a feasible point. ``history`` holds the lower bound
+    before bound tightening and after every round.
+    """
+    lower_bound: float
+    upper_bound: float
+    gap: float
+    relative_gap: float
+    status: str
+    rounds: int
+    lps: int
+    tightened: int
+    seconds: float
+    history: list = field(default_factory=list)
+
+
+class _Rows:
+    # Sparse rows a.v <= b (or a.v == b) collected in blocks of rows with the same number of entries
+
+    def __init__(self):
+        self.cols, self.vals, self.rhs, self.widths = [], [], [], []
+
+    def add(self, cols, vals, rhs):
+        rhs = np.atleast_1d(np.asarray(rhs, dtype=float))
+        cols = np.asarray(cols, dtype=int).reshape(len(rhs), -1)
+        vals = np.broadcast_to(np.asarray(vals, dtype=float), cols.shape)
+        self.cols.append(cols.ravel())
+        self.vals.append(vals.ravel())
+        self.rhs.append(rhs)
+        self.widths.append(cols.shape[1])
+
+    def add_range(self, cols, vals, lower, upper):
+        # lower <= a.v <= upper with infinite sides left out
+        lower, upper = np.atleast_1d(lower), np.atleast_1d(upper)
+        cols = np.asarray(cols, dtype=int).reshape(len(lower), -1)
+        vals = np.broadcast_to(np.asarray(vals, dtype=float), cols.shape)
+        up, low = np.isfinite(upper), np.isfinite(lower)
+        if up.any():
+            self.add(cols[up], vals[up], upper[up])
+        if low.any():
+            self.add(cols[low], -vals[low], -lower[low])
+
+    def matrix(self, n, sparse):
+        if not self.rhs:
+            return sparse.csr_matrix((0, n)), np.zeros(0)
+        rhs = np.concatenate(self.rhs)
+        rows = np.concatenate([np.repeat(np.arange(len(r)), w) for r, w in zip(self.rhs, self.widths)])
+        offsets = np.cumsum([0] + [len(r) for r in self.rhs[:-1]])
+        rows += np.concatenate([np.full(len(c), o) for c, o in zip(self.cols, offsets)])
+        A = sparse.csr_matrix((np.concatenate(self.vals), (rows, np.concatenate(self.cols))),
+                              shape=(len(rhs), n))
+        return A, rhs
+
+
+def _surface_rows(rows, t_cols, w_cols, lo, hi, linear, terms, constant, threshold, tangents):
+    # constant + linear.t + sum q w >= threshold, with every w relaxing its product of features
+    # on the side the row needs: McCormick envelopes of t_i t_j, the secant or tangents of t_i^2.
+    # ``t_cols``, ``lo`` and ``hi`` are (n, F), ``w_cols`` (n, K) and ``threshold`` (n,).
+    n = len(threshold)
+    rows.add(np.hstack([t_cols, w_cols]), -np.r_[linear, [q for _, _, q in terms]], constant - threshold)
+    ones = np.ones(n)
+    for k, (i, j, q) in enumerate(terms):
+        w, ti, tj = w_cols[:, k], t_cols[:, i], t_cols[:, j]
+        li, ui, lj, uj = lo[:, i], hi[:, i], lo[:, j], hi[:, j]
+        if i != j and q > 0:
+            rows.add(np.c_[w, tj, ti], np.c_[ones, -ui, -lj], -ui * lj)
+            rows.add(np.c_[w, tj, ti], np.c_[ones, -li, -uj], -li * uj)
+        elif i != j:
+            rows.add(np.c_[w, tj, ti], np.c_[-ones, li, lj], li * lj)
+            rows.add(np.c_[w, tj, ti], np.c_[-ones, ui, uj], ui * uj)
+        elif q > 0:
+            rows.add(np.c_[w, ti], np.c_[ones, -(li + ui)], -li * ui)
+        else:
+            for s in np.linspace(0, 1, tangents):
+                t = li + s * (ui - li)
+                rows.add(np.c_[w, ti], np.c_[-ones, 2 * t], t * t)
+
+
+def _surface_terms(quadratic):
+    # (i, j, coefficient) of the non-zero monomials t_i t_j, i <= j, of t'Qt
+    n = len(quadratic)
+    return [(i, j, quadratic[i, i] if i == j else 2 * quadratic[i, j])
+            for i in range(n) for j in range(i, n) if quadratic[i, j]]
+
+
+class _Relaxation:
+    # LP relaxation of a build_model model over
+    #   v = [Mixer_RM_qty x, Mixer_Level L, prod_RM_qty y, w = L x, SRI features T, model_5 features M,
+    #        SRI monomials W, model_5 monomials W5].
+    # With w every SUB total, RM total, model_9 and the objective are linear; the only relaxed
+    # terms are w (McCormick) and the monomials of the quality surfaces (see _surface_rows).
+
+    def __init__(self, model, tangents):
+        from scipy import sparse
+        self.sparse = sparse
+        self.tangents = tangents
+        self.ev = ev = BatchEvaluator(model)
+        C = ev.composition
+        self.R, self.P = R, P = len(ev.rms), len(ev.prods)
+
+        # model_4 as one surface over the SUB totals it uses
+        surfaces = list(zip(SRI_WEIGHTS, (MODEL_1, MODEL_2, MODEL_3)))
+        linear, quadratic = _surface_arrays(surfaces, ev.sri_columns, len(ev.subs))
+        self.sri_features = np.flatnonzero((linear != 0) | (quadratic != 0).any(axis=1))
+        self.sri_linear = linear[self.sri_features]
+        self.sri_terms = _surface_terms(quadratic[np.ix_(self.sri_features, self.sri_features)])
+        self.sri_constant = sum(w * s.constant for w, s in surfaces)
+        self.model_5_terms = _surface_terms(MODEL_5.quadratic)
+        F, G = len(self.sri_features), len(MODEL_5.features)
+        K, K5 = len(self.sri_terms), len(self.model_5_terms)
+
+        sizes = {'x': R, 'L': P, 'y': P * R, 'w': P * R, 'T': P * F, 'M': G, 'W': P * K, 'W5': K5}
+        self.cols, start = {}, 0
+        for name, size in sizes.items():
+            self.cols[name] = np.arange(start, start + size)
+            start += size
+        self.n = start
+        self.x, self.L = self.cols['x'], self.cols['L']
+        self.y, self.w = self.cols['y'].reshape(P, R), self.cols['w'].reshape(P, R)
+        self.T, self.M = self.cols['T'].reshape(P, F), self.cols['M']
+        self.W, self.W5 = self.cols['W'].reshape(P, K), self.cols['W5'].reshape(1, K5)
+
+        # Variable bounds: model bounds (presolved and fixed ones included), forbidden RMs at zero
+        variables = ([model.Mixer_RM_qty[rm] for rm in ev.rms] + [model.Mixer_Level[p] for p in ev.prods]
+                     + [model.prod_RM_qty[p, rm] for p in ev.prods for rm in ev.rms])
+        self.lower, self.upper = np.full(self.n, -np.inf), np.full(self.n, np.inf)
+        for k, var in enumerate(variables):
+            self.lower[k] = var.value if var.fixed else max(var.lb if var.lb is not None else 0.0, 0.0)
+            self.upper[k] = var.value if var.fixed else min(var.ub if var.ub is not None else 1.0, 1.0)
+        self.upper[self.x[ev.mixer_forbidden]] = 0.0
+        self.upper[self.y.ravel()[ev.prod_forbidden]] = 0.0
+
+        # Every SUB total is a convex combination of the contents of the RMs it may hold
+        mixer_allowed = self.upper[self.x] > 0
+        allowed = mixer_allowed | (self.upper[self.y] > 0)
+        for p in range(P):
+            contents = C[np.ix_(self.sri_features, allowed[p])]
+            self.lower[self.T[p]] = contents.min(axis=1, initial=np.inf)
+            self.upper[self.T[p]] = contents.max(axis=1, initial=0.0)
+        for g, (pos, is_rm) in enumerate(ev.model_5_columns):
+            if is_rm:
+                self.lower[self.M[g]], self.upper[self.M[g]] = self.lower[pos], self.upper[pos]
+            else:
+                self.lower[self.M[g]] = C[pos, mixer_allowed].min(initial=np.inf)
+                self.upper[self.M[g]] = C[pos, mixer_allowed].max(initial=0.0)
+        self.lower[self.T] = np.minimum(self.lower[self.T], self.upper[self.T])
+        self.lower[self.M] = np.minimum(self.lower[self.M], self.upper[self.M])
+        self._w_bounds()
+
+        self.cost = np.zeros(self.n)
+        self.cost[self.w] = ev.cost_scale * ev.mixer_costs
+        self.cost[self.y] = ev.cost_scale * ev.post_mixer_costs
+        self.eq, self.ub = self._static_rows(model, variables)
+
+        self.sri_active = np.array([model.model_4_constraint[p].active for p in ev.prods])
+        self.model_5_active = model.model_5_constraint.active
+
+    def _w_bounds(self):
+        # 0 <= L, x so L x lies between the products of the lower and of the upper bounds
+        for bounds in (self.lower, self.upper):
+            bounds[self.w] = np.outer(bounds[self.L], bounds[self.x])
+
+    def _static_rows(self, model, variables):
+        ev, C, R, P = self.ev, self.ev.composition, self.R, self.P
+        eq, ub = _Rows(), _Rows()
+
+        # Linear rows of the model as they are (totals, forbidden RMs, mixer bounds, ordered levels)
+        column = ComponentMap((var, k) for k, var in enumerate(variables))
+        for con, vars_, coefs, lower, upper in _linear_rows(model):
+            if not vars_ or any(v not in column for v in vars_):
+                continue
+            cols = [column[v] for v in vars_]
+            if lower is not None and upper is not None and lower == upper:
+                eq.add([cols], [coefs], upper)
+            else:
+                ub.add_range([cols], [coefs], -np.inf if lower is None else lower,
+                             np.inf if upper is None else upper)
+
+        # sum_r x_r = 1 times L_p
+        eq.add(np.c_[self.w, self.L], np.r_[np.ones(R), -1.0], np.zeros(P))
+        # SRI and model_5 features
+        F = len(self.sri_features)
+        for p in range(P):
+            share = np.hstack([self.w[p], self.y[p]])
+            eq.add(np.hstack([self.T[p][:, None], np.repeat(share[None], F, axis=0)]),
+                   np.hstack([np.ones((F, 1)), -np.tile(C[self.sri_features], 2)]), np.zeros(F))
+        for g, (pos, is_rm) in enumerate(ev.model_5_columns):
+            if is_rm:
+                eq.add([[self.M[g], self.x[pos]]], [[1.0, -1.0]], 0.0)
+            else:
+                eq.add([np.r_[self.M[g], self.x]], [np.r_[1.0, -C[pos]]], 0.0)
+
+        # Product RM totals, SUB totals and model_9 are linear in (w, y)
+        positions, lower, upper = ev.rm_bounds
+        active = np.array([con.active for con in model.prod_RM_bound.values()], dtype=bool)
+        flat_w, flat_y = self.w.ravel(), self.y.ravel()
+        ub.add_range(np.c_[flat_w[positions], flat_y[positions]][active], 1.0, lower[active], upper[active])
+        positions, lower, upper = ev.sub_bounds
+        active = np.array([con.active for con in model.prod_SUB_bound.values()], dtype=bool)
+        prods, subs = np.divmod(positions[active], len(ev.subs))
+        ub.add_range(np.hstack([self.w[prods], self.y[prods]]), np.tile(C[subs], 2), lower[active], upper[active])
+        if model.model_9_constraint.active:
+            content = ev.contaminant_factor * np.tile(C[ev.contaminant], 2 * P)
+            ub.add([np.hstack([self.w.ravel(), self.y.ravel()])], [content], ev.contaminant_limit)
+        return eq, ub
+
+    def model_5_relaxed(self):
+        # (1 - s) model_5 + 10 s >= threshold implies model_5 >= threshold when the mixer cannot hold
+        # SUB_02 (s = 0) or the threshold is above 10; otherwise the switch satisfies the row
+        ev = self.ev
+        sub_02 = (ev.composition[ev.sub_02] * self.upper[self.x]).max(initial=0.0) > 0
+        return self.model_5_active and (ev.quality_threshold > 10 or not sub_02)
+
+    def lp(self, cutoff=None):
+        """(c, A_ub, b_ub, A_eq, b_eq, bounds) of the relaxation over the current bounds."""
+        sparse, P = self.sparse, self.P
+        rows = _Rows()
+        # McCormick envelope of w = L x
+        Lc, xc = np.repeat(self.L, self.R), np.tile(self.x, P)
+        Ll, Lu, xl, xu = self.lower[Lc], self.upper[Lc], self.lower[xc], self.upper[xc]
+        w, ones = self.w.ravel(), np.ones(len(Lc))
+        rows.add(np.c_[w, Lc, xc], np.c_[-ones, xl, Ll], xl * Ll)
+        rows.add(np.c_[w, Lc, xc], np.c_[-ones, xu, Lu], xu * Lu)
+        rows.add(np.c_[w, Lc, xc], np.c_[ones, -xu, -Ll], -xu * Ll)
+        rows.add(np.c_[w, Lc, xc], np.c_[ones, -xl, -Lu], -xl * Lu)
+
+        sri = np.flatnonzero(self.sri_active)
+        if len(sri):
+            _surface_rows(rows, self.T[sri], self.W[sri], self.lower[self.T[sri]], self.upper[self.T[sri]],
+                          self.sri_linear, self.sri_terms, self.sri_constant, self.ev.sri_threshold[sri],
+                          self.tangents)
+        if self.model_5_relaxed():
+            _surface_rows(rows, self.M[None], self.W5, self.lower[self.M][None], self.upper[self.M][None],
+                          MODEL_5.linear, self.model_5_terms, MODEL_5.constant,
+                          np.array([self.ev.quality_threshold]), self.tangents)
+        if cutoff is not None:
+            nonzero = np.flatnonzero(self.cost)
+            rows.add([nonzero], [self.cost[nonzero]], cutoff)
+
+        A_dyn, b_dyn = rows.matrix(self.n, sparse)
+        A_ub, b_ub = self.ub.matrix(self.n, sparse)
+        A_eq, b_eq = self.eq.matrix(self.n, sparse)
+        bounds = np.column_stack([self.lower, self.upper])
+        return self.cost, sparse.vstack([A_ub, A_dyn]).tocsr(), np.r_[b_ub, b_dyn], A_eq, b_eq, bounds
+
+    def targets(self):
+        # Columns whose bounds the relaxation uses: mixer RMs, mixer levels and the surface features
+        cols = np.r_[self.x, self.L, self.T.ravel(), self.M]
+        return cols[self.upper[cols] - self.lower[cols] > 1e-9]
+
+    def tighten(self, bounds, tol):
+        """Apply OBBT minima and maxima ``{(col, sign): value}``; returns the number of bounds moved."""
+        moved = 0
+        for (col, sign), v in bounds.items():
+            v = v - tol * (1 + abs(v)) if sign > 0 else v + tol * (1 + abs(v))
+            if sign > 0 and v > self.lower[col] + 1e-6 * (1 + abs(v)):
+                self.lower[col] = min(v, self.upper[col])
+                moved += 1
+            elif sign < 0 and v < self.upper[col] - 1e-6 * (1 + abs(v)):
+                self.upper[col] = max(v, self.lower[col])
+                moved += 1
+        self._w_bounds()
+        return moved
+
+
+def _solve_lp(lp, objective):
+    from scipy.optimize import linprog
+    _, A_ub, b_ub, A_eq, b_eq, bounds = lp
+    return linprog(objective, A_ub=A_ub, b_ub=b_ub, A_eq=A_eq, b_eq=b_eq, bounds=bounds, method='highs')
+
+
+def _bound_lps(lp, targets):
+    # Minimum (sign 1) or maximum (sign -1) of single columns over the relaxation
+    rows = []
+    n = len(lp[0])
+    for col, sign in targets:
+        objective = np.zeros(n)
+        objective[col] = sign
+        res = _solve_lp(lp, objective)
+        rows.append((col, sign, res.status, sign * res.fun if res.status == 0 else None))
+    return rows
+
+
+class _BoundLPs:
+    # Runs the bound tightening LPs over a process pool (or in process for one worker)
+
+    def __init__(self, max_workers):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.pool = None if self.max_workers == 1 else ProcessPoolExecutor(max_workers=self.max_workers)
+
+    def solve(self, lp, targets):
+        if self.pool is None:
+            return _bound_lps(lp, targets)
+        # A few chunks per worker balance the load without sending the LP once per target
+        size = -(-len(targets) // (4 * self.max_workers))
+        chunks = [targets[k:k + size] for k in range(0, len(targets), size)]
+        return [row for rows in self.pool.map(_bound_lps, [lp] * len(chunks), chunks) for row in rows]
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+
+
+def gap_certificate(model, upper_bound=None, obbt_rounds=3, max_workers=None, tangents=5, tol=1e-7,
+                    telemetry=None):
+    """Certified lower bound on the objective of a ``build_model`` model and its gap to ``upper_bound``.
+
+    Ipopt only finds a local optimum of the non-convex model. This builds
+    an LP relaxation whose optimum is below every feasible objective:
+    ``w = Mixer_Level x Mixer_RM_qty`` makes the SUB totals, the bound
+    rows, model_9 and the objective linear, and ``w`` is replaced by its
+    McCormick envelope. The SRI (model_4) and mixer quality (model_5)
+    surfaces keep their linear part while each monomial gets a McCormick
+    envelope, the secant of a convex square or ``tangents`` tangents of a
+    concave one. model_5 is relaxed when it implies ``quality >= threshold``
+    (no SUB_02 in the mixer or a threshold above 10), and the level
+    separation is dropped unless it is linear (``'ordered'``).
+
+    Each of ``obbt_rounds`` rounds of optimization-based bound tightening
+    minimises and maximises the mixer RMs, the mixer levels and the surface
+    features over the relaxation, as independent LPs spread over
+    ``max_workers`` processes, and rebuilds the envelopes on the tighter
+    box. With ``upper_bound`` (the objective of a feasible point, e.g. the
+    Ipopt solution) the LPs also keep ``objective <= upper_bound``, which
+    only cuts points that cannot improve it. Tightened bounds are widened
+    by ``tol`` against LP round-off. Needs scipy; the model is not modified.
+    """
+    t0 = time.perf_counter()
+    relaxation = _Relaxation(model, tangents)
+    upper = np.nan if upper_bound is None else float(upper_bound)
+    cutoff = None if upper_bound is None else upper + tol * (1 + abs(upper))
+    history, lps, tightened, rounds, status = [], 0, 0, 0, 'bounded'
+
+    def cut_off():
+        # No point of the relaxation beats the cutoff. Re-solve without it, on the original box since
+        # bounds tightened under the cutoff only hold below it: an infeasible LP means the model is
+        # infeasible, a bound above the cutoff that the incumbent is not feasible
+        nonlocal lps
+        lp = _Relaxation(model, tangents).lp(None)
+        res = _solve_lp(lp, lp[0])
+        lps += 1
+        if res.status == _INFEASIBLE:
+            return 'infeasible'
+        if res.status == 0 and res.fun > cutoff:
+            history.append(float(res.fun))
+            return 'bounded'
+        return 'pruned' if res.status == 0 else 'failed'
+
+    def bound(k):
+        nonlocal lps, status
+        with phase(telemetry, 'certificate.bound', round=k) as info:
+            lp = relaxation.lp(cutoff)
+            res = _solve_lp(lp, lp[0])
+            lps += 1
+            if res.status == _INFEASIBLE:
+                status = 'infeasible' if cutoff is None else cut_off()
+            elif res.status != 0 and not history:
+                status = 'failed'
+            info['status'] = status
+            if res.status == 0:
+                history.append(float(res.fun))
+                info['lower_bound'] = history[-1]
+        return res.status == 0
+
+    lps_pool = _BoundLPs(max_workers)
+    try:
+        if bound(0):
+            for rounds in range(1, obbt_rounds + 1):
+                targets = [(int(col), sign) for col in relaxation.targets() for sign in (1, -1)]
+                with phase(telemetry, 'certificate.obbt', round=rounds, lps=len(targets)) as info:
+                    rows = lps_pool.solve(relaxation.lp(cutoff), targets)
+                    lps += len(rows)
+                    if any(s == _INFEASIBLE for _, _, s, _ in rows):
+                        status = 'infeasible' if cutoff is None else cut_off()
+                        break
+                    moved = relaxation.tighten({(col, sign): v for col, sign, s, v in rows if s == 0}, tol)
+                    tightened += moved
+                    info['tightened'] = moved
+                if not bound(rounds) or not moved:
+                    break
+    finally:
+        lps_pool.close()
+
+    if status == 'pruned':
+        lower = upper
+    elif status == 'infeasible':
+        lower = np.inf
+    else:
+        lower = max(history) if history else -np.inf
+    gap = upper - lower
+    if np.isfinite(gap) and gap < 0 and lower <= cutoff:
+        gap = 0.0  # LP round-off around an optimal incumbent
+    return GapCertificate(
+        lower_bound=lower, upper_bound=upper, gap=gap, relative_gap=gap / max(abs(upper), 1e-12),
+        status=status, rounds=rounds, lps=lps, tightened=tightened, seconds=time.perf_counter() - t0,
+        history=history,
+    )
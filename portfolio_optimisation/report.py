@@ -0,0 +1,224 @@
+import base64
+import html
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from .results import PortfolioResult, extract_result
+from .telemetry import phase
+
+# Chart templates: figure size of each chart and the share below which an RM is not drawn
+PIE_SIZE = (8, 6)
+BAR_SIZE = (10, 6)
+MIN_SHARE = 0.001
+
+
+def _figure(new_figure, size):
+    # Matplotlib Figure without pyplot by default, so rendering needs no GUI backend
+    if new_figure is None:
+        from matplotlib.figure import Figure
+        return Figure(figsize=size)
+    return new_figure(figsize=size)
+
+
+def _rm_colors(rms):
+    # One fixed colour per RM so every chart of a report uses the same colours
+    from matplotlib import colormaps
+    colors = colormaps['tab20'].resampled(len(rms)).colors
+    return {rm: colors[i] for i, rm in enumerate(sorted(rms))}
+
+
+def mixer_pie(fig, result):
+    from matplotlib import colormaps
+    ax = fig.add_subplot()
+    shares = {rm: qty for rm, qty in zip(result.rms, result.mixer) if qty > MIN_SHARE}
+    colors = colormaps['tab20'].colors
+    ax.pie(list(shares.values()), labels=list(shares), autopct='%.2f%%', startangle=140,
+           colors=colors[:len(shares)])
+    ax.set_title('Composition of RM in the Mixer')
+
+
+def product_donut(fig, result, index, color_map):
+    ax = fig.add_subplot()
+    shares = {rm: qty for rm, qty in zip(result.rms, result.prod[index]) if qty > MIN_SHARE}
+    total = sum(shares.values())
+    _, _, autotexts = ax.pie(
+        list(shares.values()), labels=list(shares), autopct='%.2f%%', startangle=140,
+        colors=[color_map[rm] for rm in shares],
+        explode=[0.1 if qty < 0.05 else 0 for qty in shares.values()],  # separate small slices
+        wedgeprops=dict(width=0.4, edgecolor='w'),
+        textprops=dict(color='black', fontsize=10),
+    )
+    for autotext in autotexts:
+        autotext.set_fontsize(8)
+        autotext.set_weight('bold')
+    ax.legend([f'{rm}: ({qty / total * 100:.2f}%)' for rm, qty in shares.items()],
+              loc='center left', bbox_to_anchor=(1, 0, 0.5, 1), fontsize=10)
+    ax.set_title(f'Product Composition of Prod {result.prods[index]}')
+    ax.axis('equal')
+
+
+def level_bar(fig, result):
+    from matplotlib import ticker
+    ax = fig.add_subplot()
+    bars = ax.bar([f'Prod_{p}' for p in result.prods], result.levels, color='skyblue')
+    ax.set_title('Mixer Levels for Each Product')
+    ax.set_xlabel('Products')
+    ax.set_ylabel('Mixer Level (%)')
+    for bar in bars:
+        ax.text(bar.get_x() + bar.get_width() / 2, bar.get_height(), f'{bar.get_height() * 100:.2f}%',
+                ha='center', va='bottom')
+    ax.yaxis.set_major_formatter(ticker.FuncFormatter(lambda x, _: f'{x * 100:.0f}%'))
+
+
+def contaminant_bar(fig, result):
+    ax = fig.add_subplot()
+    sub, bottom = result.contaminant_sub, 0.0
+    for prod, share in zip(result.prods, result.contaminant):
+        ax.bar(sub, share, bottom=bottom, label=f'{sub.replace("SUB_", "Sub")}_{prod}')
+        ax.text(sub, bottom + share / 2, f'{share:.2f}', ha='center', va='center', fontsize=10)
+        bottom += share
+    ax.set_ylim(top=max(result.contaminant_limit, bottom) * 4 / 3)
+    ax.axhline(y=result.contaminant_limit, color='red', linestyle='--', linewidth=2,
+               label=f'Upper Limit {result.contaminant_limit:g}')
+    ax.set_title(f'Upper Bound of Systemic Constraint {sub}')
+    ax.set_xlabel(sub)
+    ax.set_ylabel('Value')
+    ax.legend()
+
+
+def render_figures(result, new_figure=None):
+    """Draw the mixer pie, one donut per product, the level bar and the contaminant bar.
+
+    Charts are built from a ``PortfolioResult`` only. ``new_figure`` creates
+    each figure from a ``figsize`` keyword; the default makes plain
+    Matplotlib Figures (no pyplot, works headless), pass ``plt.figure`` to
+    show them interactively.
+    """
+    color_map = _rm_colors(result.rms)
+    fig = _figure(new_figure, PIE_SIZE)
+    mixer_pie(fig, result)
+    figures = [fig]
+    for i in range(len(result.prods)):
+        fig = _figure(new_figure, PIE_SIZE)
+        product_donut(fig, result, i, color_map)
+        figures.append(fig)
+    for chart in (level_bar, contaminant_bar):
+        fig = _figure(new_figure, BAR_SIZE)
+        chart(fig, result)
+        figures.append(fig)
+    return figures
+
+
+def _html(result, figures, title):
+    frames = result.to_frames()
+    parts = [f'<!DOCTYPE html><html><head><meta charset="utf-8"><title>{html.escape(title)}</title></head><body>',
+             f'<h1>{html.escape(title)}</h1>',
+             frames['summary'].to_html(index=False), frames['products'].to_html(index=False)]
+    for fig in figures:
+        buf = io.BytesIO()
+        fig.savefig(buf, format='png', bbox_inches='tight')
+        parts.append(f'<p><img src="data:image/png;base64,{base64.b64encode(buf.getvalue()).decode()}"></p>')
+    parts.append('</body></html>')
+    return '\n'.join(parts)
+
+
+def write_report(result, path, title=None, telemetry=None):
+    """Write every chart of ``result`` into one multi-page PDF or one self-contained HTML file.
+
+    The format follows the extension of ``path`` (``.pdf`` or ``.html``).
+    Rendering and writing are reported to ``telemetry`` as the
+    ``report.render`` and ``report.write`` phases.
+    """
+    if not path.endswith(('.html', '.pdf')):
+        raise ValueError(f'report path must end in .pdf or .html, got {path!r}')
+    title = title or f'Portfolio report ({result.status}, objective {result.objective:.4f})'
+    with phase(telemetry, 'report.render', charts=len(result.prods) + 3):
+        figures = render_figures(result)
+    with phase(telemetry, 'report.write', path=path):
+        if path.endswith('.html'):
+            with open(path, 'w') as f:
+                f.write(_html(result, figures, title))
+        else:
+            from matplotlib.backends.backend_pdf import PdfPages
+            with PdfPages(path, metadata={'Title': title}) as pdf:
+                for fig in figures:
+                    pdf.savefig(fig, bbox_inches='tight')
+    return path
+
+
+def report(solution, path=None, title=None, telemetry=None):
+    """Report a solved model or a ``PortfolioResult``.
+
+    With ``path`` (``.pdf`` or ``.html``) the charts are written headless by
+    ``write_report``; without it they are opened with pyplot.
+    """
+    result = solution if isinstance(solution, PortfolioResult) else extract_result(solution)
+    if path is not None:
+        return write_report(result, path, title, telemetry)
+    import matplotlib.pyplot as plt
+    render_figures(result, new_figure=plt.figure)
+    plt.show()
+
+
+def _write_one(args):
+    result, path, title = args
+    return write_report(result, path, title)
+
+
+def write_reports(results, directory, names=None, fmt='pdf', max_workers=None):
+    """Write one report per result over a process pool; returns the paths."""
+    os.makedirs(directory, exist_ok=True)
+    names = names or [f'report_{i}' for i in range(len(results))]
+    tasks = [(r, os.path.join(directory, f'{name}.{fmt}'), None) for r, name in zip(results, names)]
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(_write_one, tasks))
+
+
+# Each worker process builds the model once for all scenario rows
+_worker = {}
+
+
+def _init_worker(df, build_kwargs, base):
+    from .model import build_model
+    _worker['model'] = build_model(df, **build_kwargs)
+    _worker['base'] = base
+
+
+def _scenario_report(row, path):
+    from .evaluate import BatchEvaluator
+    from .model import update_parameters
+    from .scenarios import point_from_row, to_updates
+    model, base = _worker['model'], _worker['base']
+    # Every parameter column is set, so values of the previous row never leak into this one
+    update_parameters(model, **to_updates({key: row[key] for key in base}))
+    result = extract_result(model, point=point_from_row(model, row), evaluator=BatchEvaluator(model))
+    result.status = row['status']
+    result.objective = float(row['objective'])
+    return write_report(result, path, f"Scenario {row['scenario']} ({row['status']})")
+
+
+def scenario_reports(df, scenario_results, directory, fmt='pdf', max_workers=None, **build_kwargs):
+    """One report per solved row of a ``run_scenarios`` output file, rendered in parallel.
+
+    ``scenario_results`` is the Parquet or CSV file written by
+    ``run_scenarios``; ``build_kwargs`` must match the ones used for the
+    sweep. Each report shows the costs, thresholds and limits of its
+    scenario's parameter columns. Rows without a solution are skipped.
+    Returns the report paths.
+    """
+    import pandas as pd
+    from .model import build_model
+    from .scenarios import DICT_FIELDS, SCALAR_FIELDS, _base_values
+    path = str(scenario_results)
+    frame = pd.read_csv(path) if path.endswith('.csv') else pd.read_parquet(path)
+    parameters = [c for c in frame.columns if c.partition('.')[0] in DICT_FIELDS + SCALAR_FIELDS]
+    base = _base_values(build_model(df, **build_kwargs), [dict.fromkeys(parameters)])
+    rows = frame[frame['status'] == 'optimal'].to_dict(orient='records')
+    # Empty cells (NaN in a CSV) keep the base value
+    rows = [{**row, **{k: base[k] for k in parameters if pd.isna(row[k])}} for row in rows]
+    os.makedirs(directory, exist_ok=True)
+    paths = [os.path.join(directory, f"scenario_{row['scenario']}.{fmt}") for row in rows]
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                             initargs=(df, build_kwargs, base)) as pool:
+        return list(pool.map(_scenario_report, rows, paths))
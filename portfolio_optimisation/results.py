@@ -0,0 +1,149 @@
+import json
+import os
+from dataclasses import dataclass, fields
+
+import numpy as np
+
+from .evaluate import BatchEvaluator
+from .multistart import get_point
+from .solve import is_optimal
+
+
+@dataclass
+class PortfolioResult:
+    """A portfolio solution as typed arrays with their index labels.
+
+    Arrays are ordered like ``rms``, ``subs`` and ``prods``: ``mixer`` is
+    (RM,), ``levels`` (PROD,), ``prod`` and ``total_rm`` (PROD, RM),
+    ``mixer_SUB`` (SUB,), ``total_SUB`` (PROD, SUB) and ``sri_models``
+    (PROD, 3) holding model_1..3. ``mixer_cost`` and ``post_mixer_cost`` are
+    model_6 and model_7 per unit of product; ``product_cost`` is each
+    product's share of the objective and ``contaminant`` its share of model_9.
+    """
+    rms: list
+    subs: list
+    prods: list
+    status: str
+    objective: float
+    mixer: np.ndarray
+    levels: np.ndarray
+    prod: np.ndarray
+    total_rm: np.ndarray
+    mixer_SUB: np.ndarray
+    total_SUB: np.ndarray
+    sri: np.ndarray
+    sri_models: np.ndarray
+    sri_threshold: np.ndarray
+    mixer_quality: float
+    mixer_cost: float
+    post_mixer_cost: np.ndarray
+    product_cost: np.ndarray
+    contaminant: np.ndarray
+    contaminant_sub: str
+    contaminant_limit: float
+    max_violation: float
+
+    def summary(self):
+        """Scalar results as a flat dict."""
+        return {
+            'status': self.status, 'objective': self.objective, 'mixer_quality': self.mixer_quality,
+            'mixer_cost': self.mixer_cost, 'contaminant_total': float(self.contaminant.sum()),
+            'contaminant_limit': self.contaminant_limit, 'max_violation': self.max_violation,
+        }
+
+    def to_dict(self):
+        """JSON-ready dict of every field, arrays as nested lists."""
+        return {k: v.tolist() if isinstance(v, np.ndarray) else v for k, v in self.__dict__.items()}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Inverse of ``to_dict``."""
+        return cls(**{f.name: np.asarray(data[f.name], dtype=float) if f.type is np.ndarray else data[f.name]
+                      for f in fields(cls)})
+
+    def to_frames(self):
+        """Long-format DataFrames: ``summary``, ``mixer``, ``products``, ``recipes`` and ``subs``."""
+        import pandas as pd
+        n_prod, n_rm, n_sub = len(self.prods), len(self.rms), len(self.subs)
+        products = pd.DataFrame({
+            'product': self.prods, 'mixer_level': self.levels, 'sri': self.sri,
+            'model_1': self.sri_models[:, 0], 'model_2': self.sri_models[:, 1], 'model_3': self.sri_models[:, 2],
+            'sri_threshold': self.sri_threshold, 'post_mixer_cost': self.post_mixer_cost,
+            'cost': self.product_cost, 'contaminant': self.contaminant,
+        })
+        recipes = pd.DataFrame({
+            'product': np.repeat(self.prods, n_rm), 'rm': np.tile(self.rms, n_prod),
+            'from_mixer': (self.levels[:, None] * self.mixer).ravel(),
+            'post_mixer': self.prod.ravel(), 'total': self.total_rm.ravel(),
+        })
+        subs = pd.DataFrame({
+            'product': np.repeat(self.prods, n_sub), 'sub': np.tile(self.subs, n_prod),
+            'total': self.total_SUB.ravel(),
+        })
+        return {
+            'summary': pd.DataFrame([self.summary()]),
+            'mixer': pd.DataFrame({'rm': self.rms, 'quantity': self.mixer}),
+            'products': products, 'recipes': recipes, 'subs': subs,
+        }
+
+    def _write_frames(self, directory, suffix, write):
+        os.makedirs(directory, exist_ok=True)
+        paths = []
+        for name, frame in self.to_frames().items():
+            paths.append(os.path.join(directory, f'{name}.{suffix}'))
+            write(frame, paths[-1])
+        return paths
+
+    def to_parquet(self, directory):
+        """One Parquet file per table of ``to_frames`` in ``directory``; returns the paths."""
+        return self._write_frames(directory, 'parquet', lambda f, p: f.to_parquet(p, index=False))
+
+    def to_csv(self, directory):
+        """One CSV file per table of ``to_frames`` in ``directory``; returns the paths."""
+        return self._write_frames(directory, 'csv', lambda f, p: f.to_csv(p, index=False))
+
+    def to_json(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(), f)
+        return path
+
+    @classmethod
+    def from_json(cls, path):
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+
+def extract_result(model, result=None, point=None, evaluator=None):
+    """Collect the solution held by ``model`` (or an explicit ``point``) into a ``PortfolioResult``.
+
+    Variable values are read in one pass over the variable data and every
+    derived quantity (SUB totals, SRI, costs, contaminant, violations) is
+    computed with array operations, so no Pyomo expression is evaluated.
+    ``result`` is the solver result used for the status; pass an
+    ``evaluator`` built once from the model when extracting many points.
+    """
+    point = get_point(model) if point is None else point
+    ev = BatchEvaluator(model) if evaluator is None else evaluator
+    mixer, levels, prod = point['Mixer_RM_qty'], point['Mixer_Level'], point['prod_RM_qty']
+    out = ev.evaluate(mixer[None], levels[None], prod[None])
+    if result is None:
+        status = 'unsolved'
+    else:
+        status = 'optimal' if is_optimal(result) else str(result.solver.termination_condition)
+
+    return PortfolioResult(
+        rms=list(ev.rms), subs=list(ev.subs), prods=list(ev.prods), status=status,
+        objective=float(out['objective'][0]),
+        mixer=mixer.copy(), levels=levels.copy(), prod=prod.copy(),
+        total_rm=levels[:, None] * mixer + prod,
+        mixer_SUB=out['mixer_SUB'][0], total_SUB=out['total_SUB'][0],
+        sri=out['model_4'][0],
+        sri_models=np.stack([out['model_1'][0], out['model_2'][0], out['model_3'][0]], axis=-1),
+        sri_threshold=ev.sri_threshold.copy(),
+        mixer_quality=float(out['model_5'][0]), mixer_cost=float(out['model_6'][0]),
+        post_mixer_cost=out['model_7'][0],
+        product_cost=ev.cost_scale * (levels * out['model_6'][0] + out['model_7'][0]),
+        contaminant=ev.contaminant_factor * out['total_SUB'][0][:, ev.contaminant],
+        contaminant_sub=ev.subs[ev.contaminant], contaminant_limit=float(ev.contaminant_limit),
+        max_violation=float(out['max_violation'][0]),
+    )
@@ -0,0 +1,250 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+from pyomo.common.collections import ComponentMap
+from pyomo.environ import Constraint, Objective, Suffix, value
+from pyomo.repn import generate_standard_repn
+
+from .evaluate import BatchEvaluator
+from .surrogate import MODEL_1, MODEL_2, MODEL_3, MODEL_5
+
+# Largest gradient entry of a scaled row, as Ipopt's nlp_scaling_max_gradient
+MAX_GRADIENT = 100.0
+
+# Largest variable scale factor; the smallest useful RM amounts are around 1e-4
+MAX_VARIABLE_SCALE = 1e4
+
+# Weights of model_1, model_2 and model_3 in the SRI model_4
+SRI_WEIGHTS = (0.3, 0.2, 0.5)
+
+# Constraints scaled from the structure of the model; other linear rows are scaled from their coefficients
+_STRUCTURED = ('model_4_constraint', 'model_5_constraint', 'model_9_constraint', 'prod_SUB_bound',
+               'prod_RM_bound')
+
+
+@dataclass
+class Scaling:
+    """Scale factors of a model: the solver works with ``factor * x`` and ``factor * g(x)``.
+
+    ``variables`` and ``constraints`` map components to their factor and hold
+    only the factors different from 1.
+    """
+    variables: ComponentMap = field(default_factory=ComponentMap)
+    constraints: ComponentMap = field(default_factory=ComponentMap)
+    objective: float = 1.0
+
+    def summary(self):
+        """Number and range of the variable and constraint factors, and the objective factor."""
+        out = {'objective': self.objective}
+        for name, factors in (('variables', self.variables), ('constraints', self.constraints)):
+            values = list(factors.values()) or [1.0]
+            out[name] = (len(factors), min(values), max(values))
+        return out
+
+
+def _surface_arrays(surfaces, columns, n):
+    # Linear and quadratic coefficients of a weighted sum of surfaces over ``n`` positions
+    linear, quadratic = np.zeros(n), np.zeros((n, n))
+    for (weight, surface), cols in zip(surfaces, columns):
+        cols = np.asarray(cols)
+        np.add.at(linear, cols, weight * surface.linear)
+        np.add.at(quadratic, (cols[:, None], cols[None, :]), weight * surface.quadratic)
+    return linear, quadratic
+
+
+def _gradient_bound(linear, quadratic, upper):
+    # |b + 2Qx| <= |b| + 2|Q|x over the box 0 <= x <= upper; ``upper`` may hold one box per row
+    return np.abs(linear) + 2 * upper @ np.abs(quadratic).T
+
+
+def _row_factors(gradient, rhs, max_gradient):
+    # Scale towards a unit right-hand side while no scaled gradient entry exceeds max_gradient
+    rhs = np.where(np.isfinite(rhs) & (rhs > 0), rhs, 1.0)
+    up = np.maximum(1.0, 1.0 / rhs)
+    with np.errstate(divide='ignore'):
+        down = np.where(gradient > 0, max_gradient / gradient, np.inf)
+    return np.minimum(up, down)
+
+
+def _rhs(lower, upper):
+    # Largest finite bound magnitude of each row
+    bounds = np.abs(np.stack([lower, upper]))
+    return np.where(np.isfinite(bounds), bounds, 0).max(axis=0)
+
+
+def scaling_factors(model, max_gradient=MAX_GRADIENT, max_variable_scale=MAX_VARIABLE_SCALE):
+    """Variable, constraint and objective scale factors of a ``build_model`` model.
+
+    Nothing is evaluated at the current point; the factors follow from the
+    composition table and the bounds:
+
+    - the upper end of every RM amount is the smaller of its variable bound,
+      its RM bound and ``SUB bound / content`` over the SUBs the RM carries,
+      and the variable is scaled by its inverse (at most ``max_variable_scale``);
+    - every SUB total is a convex combination of RM contents, so it lies
+      between 0 and the largest content of an allowed RM, capped by the
+      product's SUB bound. Over these ranges the gradients of the SRI
+      surfaces (model_4), the mixer quality surface (model_5, unless the
+      mixer may carry SUB_02 and its switch flattens it), model_9, the bound rows and the objective are bounded
+      in the scaled variables;
+    - rows are scaled towards a unit right-hand side (the SUB and RM bound
+      rows with small bounds are scaled up) and down until no gradient entry
+      exceeds ``max_gradient``; the objective is only scaled down.
+
+    Call it after ``presolve`` to use the tightened variable bounds.
+    """
+    ev = BatchEvaluator(model)
+    C = ev.composition
+    (n_sub, n_rm), n_prod = C.shape, len(ev.prods)
+    scaling = Scaling()
+
+    # Upper ends of the RM amounts
+    mixer_ub = np.array([_upper(model.Mixer_RM_qty[rm]) for rm in ev.rms], dtype=float)
+    mixer_ub[ev.mixer_forbidden] = 0.0
+    prod_ub = np.array([[_upper(model.prod_RM_qty[p, rm]) for rm in ev.rms] for p in ev.prods], dtype=float)
+    flat = prod_ub.reshape(-1)
+    flat[ev.prod_forbidden] = 0.0
+    positions, _, rm_upper = ev.rm_bounds
+    flat[positions] = np.minimum(flat[positions], rm_upper)
+    sub_positions, sub_lower, sub_upper = ev.sub_bounds
+    sub_ub = np.full(n_prod * n_sub, np.inf)
+    sub_ub[sub_positions] = sub_upper
+    sub_ub = sub_ub.reshape(n_prod, n_sub)
+    for s in range(n_sub):
+        carried = C[s] > 0
+        if carried.any() and np.isfinite(sub_ub[:, s]).any():
+            prod_ub[:, carried] = np.minimum(prod_ub[:, carried], sub_ub[:, s, None] / C[s, carried])
+
+    def variable_scales(upper):
+        with np.errstate(divide='ignore'):
+            return np.where(upper > 0, np.clip(1.0 / upper, 1.0, max_variable_scale), 1.0)
+    mixer_scale, prod_scale = variable_scales(mixer_ub), variable_scales(prod_ub)
+    for j, rm in enumerate(ev.rms):
+        if mixer_scale[j] != 1:
+            scaling.variables[model.Mixer_RM_qty[rm]] = float(mixer_scale[j])
+        for i, p in enumerate(ev.prods):
+            if prod_scale[i, j] != 1:
+                scaling.variables[model.prod_RM_qty[p, rm]] = float(prod_scale[i, j])
+
+    # Ranges of the SUB totals in the mixer and in each product
+    mixer_allowed = mixer_ub > 0
+    mixer_hi = np.where(mixer_allowed, C, 0).max(axis=1)
+    prod_hi = np.where((mixer_allowed | (prod_ub > 0))[:, None, :], C[None], 0).max(axis=2)
+    prod_hi = np.minimum(prod_hi, sub_ub)
+
+    # d(row)/d(scaled variable) of a row linear in the SUB totals with weights ``w`` (prod, sub):
+    # RM amounts through the composition, mixer levels through the mixer SUB totals (level <= 1)
+    prod_allowed = prod_ub > 0
+
+    def sub_row_gradient(w):
+        rm_weight = w @ C
+        return np.maximum.reduce([
+            np.where(prod_allowed, rm_weight / prod_scale, 0).max(axis=1, initial=0.0),
+            np.where(mixer_allowed, rm_weight / mixer_scale, 0).max(axis=1, initial=0.0),
+            w @ mixer_hi,
+        ])
+
+    sri = _surface_arrays(zip(SRI_WEIGHTS, (MODEL_1, MODEL_2, MODEL_3)), ev.sri_columns, n_sub)
+    gradient = sub_row_gradient(_gradient_bound(*sri, prod_hi))
+    factors = _row_factors(gradient, ev.sri_threshold, max_gradient)
+    _store(scaling, [model.model_4_constraint[p] for p in ev.prods], factors)
+
+    # model_5 over the mixer SUB totals and RM amounts. When the mixer may carry SUB_02 the switch
+    # holds model_5 near the constant 10 and the surface bound says nothing, so the row keeps 1
+    gradient = 0.0
+    if not (C[ev.sub_02] > 0)[mixer_allowed].any():
+        columns = [c + (n_sub if is_rm else 0) for c, is_rm in ev.model_5_columns]
+        linear, quadratic = _surface_arrays([(1.0, MODEL_5)], [columns], n_sub + n_rm)
+        weights = _gradient_bound(linear, quadratic, np.concatenate([mixer_hi, mixer_ub]))
+        rm_weight = weights[:n_sub] @ C + weights[n_sub:]
+        gradient = (rm_weight / mixer_scale)[mixer_allowed].max(initial=0.0)
+    _store(scaling, [model.model_5_constraint], _row_factors(
+        np.array([gradient]), np.array([ev.quality_threshold]), max_gradient))
+
+    # model_9 sums the contaminant total of every product; the mixer enters once per product
+    c = ev.contaminant
+    gradient = ev.contaminant_factor * max(np.where(prod_allowed, C[c] / prod_scale, 0).max(initial=0.0),
+                                           n_prod * (C[c] / mixer_scale)[mixer_allowed].max(initial=0.0),
+                                           mixer_hi[c])
+    _store(scaling, [model.model_9_constraint], _row_factors(
+        np.array([gradient]), np.array([ev.contaminant_limit]), max_gradient))
+
+    # SUB bound rows bound one SUB total
+    keys = list(model.prod_SUB_bound)
+    if keys:
+        prod_index, sub_index = np.unravel_index(sub_positions, (n_prod, n_sub))
+        gradient = np.maximum.reduce([
+            np.where(prod_allowed[prod_index], C[sub_index] / prod_scale[prod_index], 0).max(axis=1),
+            np.where(mixer_allowed, C[sub_index] / mixer_scale, 0).max(axis=1),
+            mixer_hi[sub_index],
+        ])
+        _store(scaling, [model.prod_SUB_bound[k] for k in keys], _row_factors(
+            gradient, _rhs(sub_lower, sub_upper), max_gradient))
+
+    # RM bound rows: level * mixer amount + post mixer amount
+    keys = list(model.prod_RM_bound)
+    if keys:
+        _, rm_lower, _ = ev.rm_bounds
+        prod_index, rm_index = np.unravel_index(positions, (n_prod, n_rm))
+        gradient = np.maximum.reduce([1.0 / prod_scale[prod_index, rm_index], 1.0 / mixer_scale[rm_index],
+                                      mixer_ub[rm_index]])
+        _store(scaling, [model.prod_RM_bound[k] for k in keys], _row_factors(
+            gradient, _rhs(rm_lower, rm_upper), max_gradient))
+
+    # Remaining linear rows from their coefficients; nonlinear ones (abs level separation) keep 1
+    for component in model.component_objects(Constraint, active=True):
+        if component.local_name in _STRUCTURED:
+            continue
+        for con in component.values():
+            if not con.active or con.body.polynomial_degree() != 1:
+                continue
+            repn = generate_standard_repn(con.body, compute_values=True, quadratic=False)
+            gradient = max((abs(a) / scaling.variables.get(v, 1.0)
+                            for v, a in zip(repn.linear_vars, repn.linear_coefs)), default=0.0)
+            lower = value(con.lower) - repn.constant if con.has_lb() else np.inf
+            upper = value(con.upper) - repn.constant if con.has_ub() else np.inf
+            _store(scaling, [con], _row_factors(np.array([gradient]), _rhs(np.array([lower]), np.array([upper])),
+                                                max_gradient))
+
+    # Objective: cost_scale * sum(level * model_6 + model_7)
+    allowed_costs = ev.mixer_costs[mixer_allowed]
+    gradient = ev.cost_scale * max(
+        np.where(prod_allowed, np.abs(ev.post_mixer_costs) / prod_scale, 0).max(initial=0.0),
+        n_prod * (np.abs(ev.mixer_costs) / mixer_scale)[mixer_allowed].max(initial=0.0),
+        np.abs(allowed_costs).max(initial=0.0),
+    )
+    scaling.objective = float(min(1.0, max_gradient / gradient)) if gradient > 0 else 1.0
+    return scaling
+
+
+def _upper(var):
+    if var.fixed:
+        return abs(var.value or 0.0)
+    return 1.0 if var.ub is None else var.ub
+
+
+def _store(scaling, constraints, factors):
+    for con, factor in zip(constraints, factors):
+        if factor != 1:
+            scaling.constraints[con] = float(factor)
+
+
+def apply_scaling(model, scaling=None, **kwargs):
+    """Write scale factors into the ``model.scaling_factor`` export Suffix.
+
+    ``scaling`` defaults to ``scaling_factors(model, **kwargs)``. Ipopt reads
+    the suffix with ``nlp_scaling_method='user-scaling'`` (set by
+    ``SolverConfig(scaling=True)``) and reports the solution and multipliers
+    unscaled. Returns the ``Scaling``.
+    """
+    scaling = scaling_factors(model, **kwargs) if scaling is None else scaling
+    if model.component('scaling_factor') is None:
+        model.scaling_factor = Suffix(direction=Suffix.EXPORT)
+    suffix = model.scaling_factor
+    suffix.clear()
+    for factors in (scaling.variables, scaling.constraints):
+        for component, factor in factors.items():
+            suffix[component] = factor
+    for objective in model.component_data_objects(Objective, active=True):
+        suffix[objective] = scaling.objective
+    return scaling
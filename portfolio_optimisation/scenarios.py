@@ -0,0 +1,246 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict
+from itertools import product
+
+import numpy as np
+from pyomo.environ import value
+
+from .cache import SolutionCache, cache_key, result_point
+from .evaluate import BatchEvaluator
+from .model import build_model, update_parameters
+from .multistart import get_point, set_point
+from .presolve import presolve
+from .results import extract_result
+from .solve import SolverConfig, SolverSession, ipopt_iterations, is_optimal
+from .telemetry import JsonLinesSink, Telemetry
+
+# Scenario fields that hold a dict of per-RM or per-product values
+DICT_FIELDS = ('mixer_costs', 'post_mixer_costs', 'sri_thresholds')
+SCALAR_FIELDS = ('mixer_quality_threshold', 'contaminant_limit')
+
+
+# Scenarios are flat dicts with dotted names, e.g.
+#   {'mixer_costs.RM_01': 900, 'sri_thresholds.A': 50, 'contaminant_limit': 5.0}
+def to_updates(scenario):
+    """Turn a flat scenario into keyword arguments of ``update_parameters``."""
+    updates = {}
+    for key, val in scenario.items():
+        field, _, index = key.partition('.')
+        if field in DICT_FIELDS and index:
+            updates.setdefault(field, {})[index] = float(val)
+        elif field in SCALAR_FIELDS and not index:
+            updates[field] = float(val)
+        elif key != 'scenario':
+            raise ValueError(f'unknown scenario column {key!r}')
+    return updates
+
+
+def scenario_grid(**axes):
+    """Cartesian product of value lists, given as dotted names.
+
+    Dots cannot appear in keyword names, so pass the axes as a dict::
+
+        scenario_grid(**{'mixer_costs.RM_01': [700, 800, 900], 'contaminant_limit': [5, 5.25]})
+
+    The last axis varies fastest, so consecutive scenarios differ in one
+    value and warm-start well from each other.
+    """
+    names = list(axes)
+    return [dict(zip(names, values), scenario=i)
+            for i, values in enumerate(product(*(axes[n] for n in names)))]
+
+
+def read_scenarios(path):
+    """Scenarios from a CSV with one dotted-name column per parameter and one row per scenario."""
+    import pandas as pd
+    frame = pd.read_csv(path)
+    if 'scenario' not in frame.columns:
+        frame.insert(0, 'scenario', range(len(frame)))
+    return frame.to_dict(orient='records')
+
+
+def _base_values(model, scenarios):
+    # Current model values of every parameter any scenario touches
+    base = {}
+    for key in {k for s in scenarios for k in s if k != 'scenario'}:
+        field, _, index = key.partition('.')
+        component = {
+            'mixer_costs': model.mixercosts, 'post_mixer_costs': model.postmixer_costs,
+            'sri_thresholds': model.sri_threshold, 'mixer_quality_threshold': model.mixer_quality_threshold,
+            'contaminant_limit': model.contaminant_limit,
+        }[field]
+        base[key] = value(component[index] if index else component)
+    return base
+
+
+# Each worker process builds the model and its solver session once
+_worker = {}
+
+
+def _init_worker(df, build_kwargs, solver_config, base, telemetry_dir=None, cache=None, source=None):
+    telemetry = None
+    if telemetry_dir is not None:
+        pid = os.getpid()
+        telemetry = Telemetry(JsonLinesSink(os.path.join(telemetry_dir, f'worker-{pid}.jsonl')), worker=pid)
+    _worker['telemetry'] = telemetry
+    model = build_model(df, telemetry=telemetry, **build_kwargs)
+    # Scenarios only change costs and nonlinear thresholds, so one presolve serves them all
+    presolve(model)
+    _worker['session'] = SolverSession(model, solver_config)
+    _worker['start'] = get_point(model)
+    _worker['base'] = base
+    # Sweeps warm-start from the neighbouring scenario, so they get their own cache entries
+    _worker['cache'] = None if cache is None else SolutionCache(cache or None)
+    _worker['solver'] = {'method': 'sweep', 'solver': asdict(solver_config)}
+    _worker['source'] = source
+
+
+def _solve_chunk(scenarios):
+    session, base = _worker['session'], _worker['base']
+    model = session.model
+    rows, warm = [], False
+    for scenario in scenarios:
+        if _worker['telemetry'] is not None:
+            session.telemetry = _worker['telemetry'].bind(scenario=scenario['scenario'])
+        update_parameters(model, **to_updates({**base, **scenario}))
+        session.last_log = ''
+        t0 = time.perf_counter()
+        if _worker['cache'] is not None:
+            evaluator = BatchEvaluator(model)
+            key = cache_key(model, _worker['solver'], evaluator)
+            cached = _worker['cache'].get(key)
+            if cached is not None:
+                set_point(model, result_point(cached))
+                row = dict(scenario, status=cached.status, seconds=time.perf_counter() - t0,
+                           iterations=float('nan'), objective=cached.objective)
+                row.update(_recipe_columns(model))
+                rows.append(row)
+                warm = True
+                continue
+        try:
+            result = session.solve(warm_start=warm, capture_log=True)
+            status = 'optimal' if is_optimal(result) else str(result.solver.termination_condition)
+        except Exception as exc:  # keep sweeping past solver crashes
+            status = f'error: {exc}'
+        seconds = time.perf_counter() - t0
+
+        row = dict(scenario)
+        iterations = ipopt_iterations(session.last_log)
+        row.update(status=status, seconds=seconds,
+                   iterations=float('nan') if iterations is None else iterations)
+        if status == 'optimal':
+            row['objective'] = value(model.objective)
+            row.update(_recipe_columns(model))
+            warm = True
+            if _worker['cache'] is not None:
+                _worker['cache'].put(key, extract_result(model, result, evaluator=evaluator), source=_worker['source'])
+        else:
+            # Do not warm-start the next scenario from a failed point
+            row['objective'] = float('nan')
+            set_point(model, _worker['start'])
+            warm = False
+        rows.append(row)
+    return rows
+
+
+def _recipe_columns(model):
+    columns = {f'Mixer_RM_qty.{rm}': model.Mixer_RM_qty[rm].value for rm in model.RM}
+    columns.update({f'Mixer_Level.{p}': model.Mixer_Level[p].value for p in model.PROD})
+    columns.update({f'prod_RM_qty.{p}.{rm}': model.prod_RM_qty[p, rm].value
+                    for p in model.PROD for rm in model.RM})
+    return columns
+
+
+def point_from_row(model, row):
+    """Decision variable arrays (as ``get_point`` returns them) from one result row."""
+    return {
+        'Mixer_RM_qty': np.array([row[f'Mixer_RM_qty.{rm}'] for rm in model.RM], dtype=float),
+        'Mixer_Level': np.array([row[f'Mixer_Level.{p}'] for p in model.PROD], dtype=float),
+        'prod_RM_qty': np.array([[row[f'prod_RM_qty.{p}.{rm}'] for rm in model.RM] for p in model.PROD],
+                                dtype=float),
+    }
+
+
+class _ResultWriter:
+    # Appends row batches with a fixed column list to one Parquet file (one row
+    # group per batch) or to a CSV file
+
+    def __init__(self, path, columns):
+        self.path = str(path)
+        self.columns = columns
+        self.parquet = not self.path.endswith('.csv')
+        self.writer = None
+        self.started = False
+
+    def write(self, rows):
+        import pandas as pd
+        frame = pd.DataFrame(rows).reindex(columns=self.columns)
+        if not self.parquet:
+            frame.to_csv(self.path, mode='a' if self.started else 'w', header=not self.started, index=False)
+        else:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self.writer is None:
+                self.writer = pq.ParquetWriter(self.path, table.schema)
+            self.writer.write_table(table.cast(self.writer.schema))
+        self.started = True
+
+    def close(self):
+        if self.writer is not None:
+            self.writer.close()
+
+
+def run_scenarios(df, scenarios, output, max_workers=None, chunk_size=None, solver_config=None,
+                  telemetry_dir=None, cache=None, cache_source=None, **build_kwargs):
+    """Solve every scenario over a process pool and stream the results into ``output``.
+
+    ``scenarios`` is a list of flat dicts (see ``scenario_grid`` and
+    ``read_scenarios``); parameters a scenario leaves out keep the values
+    from ``build_kwargs``. Scenarios are split into contiguous chunks so each
+    worker warm-starts from the previous, neighbouring scenario. ``output``
+    ends in ``.parquet`` (needs pyarrow) or ``.csv``; each finished chunk is
+    appended as soon as it arrives. Returns the number of rows written.
+
+    With ``telemetry_dir`` every worker writes its build phases, solve phases
+    and Ipopt iterations, tagged with the scenario, to
+    ``worker-<pid>.jsonl`` in that directory.
+
+    With ``cache`` (a ``SolutionCache`` path, ``''`` for the default one)
+    scenarios solved by an earlier sweep with the same inputs and solver
+    settings are read back instead of solved, with ``iterations`` nan, and
+    new optimal scenarios are stored. ``cache_source`` names the
+    composition file, so a sweep over edited composition data drops that
+    file's old entries.
+    """
+    # Parameters as floats so every written batch has the same column types
+    scenarios = [{**{k: float(v) for k, v in s.items() if k != 'scenario'}, 'scenario': s.get('scenario', i)}
+                 for i, s in enumerate(scenarios)]
+    model = build_model(df, **build_kwargs)
+    base = _base_values(model, scenarios)
+    parameters = sorted({k for s in scenarios for k in s if k != 'scenario'})
+    columns = (['scenario'] + parameters + ['status', 'objective', 'iterations', 'seconds']
+               + list(_recipe_columns(model)))
+    max_workers = max_workers or os.cpu_count() or 1
+    if chunk_size is None:
+        # A few chunks per worker balances load while keeping long warm-start runs
+        chunk_size = max(1, -(-len(scenarios) // (4 * max_workers)))
+    chunks = [scenarios[k:k + chunk_size] for k in range(0, len(scenarios), chunk_size)]
+
+    if telemetry_dir is not None:
+        os.makedirs(telemetry_dir, exist_ok=True)
+    writer = _ResultWriter(output, columns)
+    written = 0
+    try:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 initargs=(df, build_kwargs, solver_config or SolverConfig(), base,
+                                           telemetry_dir, cache, cache_source)) as pool:
+            for future in as_completed([pool.submit(_solve_chunk, chunk) for chunk in chunks]):
+                rows = future.result()
+                writer.write(rows)
+                written += len(rows)
+    finally:
+        writer.close()
+    return written
@@ -0,0 +1,287 @@
+import re
+import shutil
+from dataclasses import dataclass, field
+
+from pyomo.common.tee import capture_output
+from pyomo.environ import SolverFactory, Suffix, TransformationFactory
+from pyomo.opt import TerminationCondition
+
+from .model import update_parameters
+from .scaling import apply_scaling
+from .telemetry import cyipopt_callback, parse_ipopt_log, phase
+
+# Solver backends by interface:
+#   'nl'         - writes an .nl file and runs an AMPL executable on every solve
+#   'persistent' - appsi interface that keeps the model and only updates what changed
+#   'in_memory'  - Ipopt linked in-process through PyNumero/cyipopt, no files or forks
+BACKENDS = {
+    'appsi_ipopt': 'persistent',
+    'cyipopt': 'in_memory',
+    'ipopt': 'nl',
+    'bonmin': 'nl',
+    'couenne': 'nl',
+    'scip': 'nl',
+}
+IPOPT_BACKENDS = ('appsi_ipopt', 'cyipopt', 'ipopt')
+NLP_PREFERENCE = ('appsi_ipopt', 'cyipopt', 'ipopt')
+MINLP_PREFERENCE = ('bonmin', 'couenne', 'scip')
+
+# Backends that pass the scaling_factor suffix to Ipopt; the others need scaled_solve
+SCALING_BACKENDS = ('cyipopt', 'ipopt')
+
+# Ipopt options for restarting from the previous primal/dual point
+WARM_START_OPTIONS = {
+    'warm_start_init_point': 'yes',
+    'warm_start_bound_push': 1e-9,
+    'warm_start_bound_frac': 1e-9,
+    'warm_start_slack_bound_push': 1e-9,
+    'warm_start_slack_bound_frac': 1e-9,
+    'warm_start_mult_bound_push': 1e-9,
+    'mu_init': 1e-6,
+}
+
+# Termination conditions accepted as a (local) optimum
+OPTIMAL_CONDITIONS = (
+    TerminationCondition.optimal,
+    TerminationCondition.locallyOptimal,
+    TerminationCondition.globallyOptimal,
+)
+
+
+def backend_available(backend):
+    if BACKENDS[backend] == 'nl':
+        # Look the executable up directly; SolverFactory logs a traceback for missing AMPL solvers
+        return shutil.which(backend) is not None
+    return bool(SolverFactory(backend).available(exception_flag=False))
+
+
+def available_backends(minlp=False):
+    """Locally usable backends, in order of preference."""
+    return [b for b in (MINLP_PREFERENCE if minlp else NLP_PREFERENCE) if backend_available(b)]
+
+
+@dataclass
+class SolverConfig:
+    """Backend choice and the common Ipopt settings, turned into a solver by ``create``.
+
+    ``backend=None`` picks the first available backend (persistent appsi
+    Ipopt, then cyipopt, then the Ipopt executable; Bonmin, Couenne, SCIP for
+    ``minlp=True``). Giving ``executable`` without a backend selects the NL
+    Ipopt interface with that binary. ``scaling=True`` turns on Ipopt's
+    user scaling, read from the ``scaling_factor`` suffix that
+    ``SolverSession`` fills with ``apply_scaling``; only cyipopt and the NL
+    Ipopt interface read it, so the persistent backend is skipped.
+    """
+    backend: str = None
+    executable: str = None
+    minlp: bool = False
+    linear_solver: str = None
+    tol: float = None
+    max_iter: int = None
+    scaling: bool = False
+    options: dict = field(default_factory=dict)
+
+    def resolve_backend(self):
+        if self.backend is not None:
+            if self.backend not in BACKENDS:
+                raise ValueError(f'unknown solver backend {self.backend!r}, expected one of {list(BACKENDS)}')
+            if self.scaling and self.backend in IPOPT_BACKENDS and self.backend not in SCALING_BACKENDS:
+                raise ValueError(f'{self.backend} does not read scaling_factor suffixes, use scaled_solve or '
+                                 f'one of {SCALING_BACKENDS}')
+            return self.backend
+        if self.executable is not None:
+            return MINLP_PREFERENCE[0] if self.minlp else 'ipopt'
+        available = available_backends(self.minlp)
+        if self.scaling and not self.minlp:
+            available = [b for b in available if b in SCALING_BACKENDS]
+        if not available:
+            kind = 'MINLP' if self.minlp else 'NLP'
+            raise RuntimeError(f'no {kind} solver backend available, install one of '
+                               f'{MINLP_PREFERENCE if self.minlp else NLP_PREFERENCE}')
+        return available[0]
+
+    def solver_options(self, backend):
+        options = {}
+        if backend in IPOPT_BACKENDS:
+            for key in ('linear_solver', 'tol', 'max_iter'):
+                if getattr(self, key) is not None:
+                    options[key] = getattr(self, key)
+            if self.scaling and backend in SCALING_BACKENDS:
+                options['nlp_scaling_method'] = 'user-scaling'
+        options.update(self.options)
+        return options
+
+    def create(self):
+        backend = self.resolve_backend()
+        if self.executable is not None and BACKENDS[backend] == 'nl':
+            solver = SolverFactory(backend, executable=self.executable)
+        else:
+            solver = SolverFactory(backend)
+        # cyipopt keeps its Ipopt options on the config block, the others on .options
+        target = solver.config.options if backend == 'cyipopt' else solver.options
+        for key, val in self.solver_options(backend).items():
+            target[key] = val
+        solver.backend = backend
+        return solver
+
+
+def make_solver(name='ipopt', executable=None, options=None):
+    """Create a Pyomo solver, optionally from an explicit executable path."""
+    return SolverConfig(backend=name, executable=executable, options=dict(options or {})).create()
+
+
+def is_optimal(result):
+    return result.solver.termination_condition in OPTIMAL_CONDITIONS
+
+
+def _solve(model, solver, tee, solve_kwargs):
+    result = solver.solve(model, tee=tee, load_solutions=False, **solve_kwargs)
+    if is_optimal(result):
+        model.solutions.load_from(result)
+    return result
+
+
+def _solve_logged(model, solver, tee=False, capture_log=False, telemetry=None, **solve_kwargs):
+    # Solve once and return (result, log). With telemetry the solve is timed as a 'solve' phase
+    # and every Ipopt iteration becomes an 'iteration' event: live through the cyipopt
+    # intermediate callback, otherwise parsed from the captured log.
+    backend = getattr(solver, 'backend', None)
+    live = telemetry is not None and backend == 'cyipopt'
+    capture_log = capture_log or (telemetry is not None and not live)
+    with phase(telemetry, 'solve', backend=backend) as info:
+        if live:
+            solver.config.intermediate_callback = cyipopt_callback(telemetry)
+        try:
+            if capture_log:
+                # Capture at the file descriptor level so in-process solvers are logged too
+                with capture_output(capture_fd=True) as out:
+                    result = _solve(model, solver, True, solve_kwargs)
+                log = out.getvalue()
+                if tee:
+                    print(log, end='')
+            else:
+                result, log = _solve(model, solver, tee, solve_kwargs), ''
+        finally:
+            if live:
+                solver.config.intermediate_callback = None
+        if telemetry is not None and not live:
+            for record in parse_ipopt_log(log):
+                telemetry.emit('iteration', **record)
+        info['status'] = 'optimal' if is_optimal(result) else str(result.solver.termination_condition)
+        info['iterations'] = ipopt_iterations(log)
+    return result, log
+
+
+def solve(model, solver=None, tee=False, telemetry=None, **solve_kwargs):
+    """Solve ``model`` and load the solution only if the solver reports an optimum.
+
+    Returns the Pyomo results object; ``is_optimal(result)`` tells whether the
+    variable values now hold a solution. With a ``Telemetry`` object the solve
+    is reported as a ``solve`` phase and each Ipopt iteration (objective,
+    infeasibilities, restoration flag) as an ``iteration`` event.
+    """
+    solver = make_solver() if solver is None else solver
+    return _solve_logged(model, solver, tee=tee, telemetry=telemetry, **solve_kwargs)[0]
+
+
+def scaled_solve(model, solver=None, tee=False, scaling=None, telemetry=None, **solve_kwargs):
+    """Solve a scaled copy of ``model`` and load the unscaled solution back into it.
+
+    For backends that do not read the ``scaling_factor`` suffix, such as the
+    persistent appsi interface: the ``core.scale_model`` transformation
+    writes the scaled variables, constraints and objective into a copy, and
+    its solution, duals included, is mapped back only when the solver
+    reports an optimum. ``scaling`` defaults to ``scaling_factors(model)``.
+    Named Expressions are expanded in the copy, so it is larger than the
+    model; prefer ``SolverConfig(scaling=True)`` where the backend allows it.
+    """
+    solver = make_solver() if solver is None else solver
+    added = model.component('scaling_factor') is None
+    apply_scaling(model, scaling)
+    transform = TransformationFactory('core.scale_model')
+    try:
+        scaled = transform.create_using(model, rename=False)
+    finally:
+        if added:
+            model.del_component('scaling_factor')
+    result = _solve_logged(scaled, solver, tee=tee, telemetry=telemetry, **solve_kwargs)[0]
+    if is_optimal(result):
+        transform.propagate_solution(scaled, model)
+    return result
+
+
+def ipopt_iterations(log):
+    """Iteration count reported in an Ipopt log, or None if it is not there."""
+    match = re.search(r'Number of Iterations\.*:\s*(\d+)', log)
+    return int(match.group(1)) if match else None
+
+
+def enable_warm_start(model):
+    """Declare the Suffixes that carry Ipopt's bound and constraint multipliers."""
+    if model.component('dual') is None:
+        model.dual = Suffix(direction=Suffix.IMPORT_EXPORT)
+    for name, direction in (('ipopt_zL_out', Suffix.IMPORT), ('ipopt_zU_out', Suffix.IMPORT),
+                            ('ipopt_zL_in', Suffix.EXPORT), ('ipopt_zU_in', Suffix.EXPORT)):
+        if model.component(name) is None:
+            model.add_component(name, Suffix(direction=direction))
+
+
+def resolve(model, solver=None, tee=False, **updates):
+    """Apply ``update_parameters(**updates)`` and re-solve the already built model.
+
+    The first call solves cold and records the multipliers; later calls pass
+    the previous primal point and multipliers back to Ipopt with
+    ``warm_start_init_point``, so small price or threshold changes converge in
+    a few iterations.
+    """
+    enable_warm_start(model)
+    update_parameters(model, **updates)
+
+    options = {}
+    if len(model.ipopt_zL_out) or len(model.ipopt_zU_out):
+        model.ipopt_zL_in.update(model.ipopt_zL_out)
+        model.ipopt_zU_in.update(model.ipopt_zU_out)
+        options = dict(WARM_START_OPTIONS)
+    return solve(model, solver, tee=tee, options=options)
+
+
+class SolverSession:
+    """One model paired with one solver instance that is reused for every solve.
+
+    With the persistent appsi backend later solves only push changed
+    parameters and bounds to the solver instead of rewriting the model, and
+    the in-memory cyipopt backend never touches the file system. Bound and
+    constraint multipliers are carried between solves where the interface
+    supports them (NL Ipopt). Every solve reports to ``telemetry`` when given.
+    With ``config.scaling`` the scale factors are computed once, when the
+    session is created (see ``scaling_factors``).
+    """
+
+    def __init__(self, model, config=None, telemetry=None):
+        self.model = model
+        self.telemetry = telemetry
+        self.config = SolverConfig() if config is None else config
+        self.solver = self.config.create()
+        self.backend = self.solver.backend
+        self.last_log = ''
+        self.scaling = apply_scaling(model) if self.config.scaling else None
+        if self.backend == 'ipopt':
+            enable_warm_start(model)
+
+    def solve(self, tee=False, warm_start=False, capture_log=False):
+        kwargs = {}
+        if warm_start and self.backend == 'ipopt' and (len(self.model.ipopt_zL_out)
+                                                       or len(self.model.ipopt_zU_out)):
+            self.model.ipopt_zL_in.update(self.model.ipopt_zL_out)
+            self.model.ipopt_zU_in.update(self.model.ipopt_zU_out)
+            kwargs['options'] = dict(WARM_START_OPTIONS)
+        result, log = _solve_logged(self.model, self.solver, tee=tee, capture_log=capture_log,
+                                    telemetry=self.telemetry, **kwargs)
+        if capture_log:
+            self.last_log = log
+        return result
+
+    def resolve(self, tee=False, capture_log=False, **updates):
+        """``update_parameters(**updates)`` then a warm-started solve of the same model."""
+        update_parameters(self.model, **updates)
+        return self.solve(tee=tee, warm_start=True, capture_log=capture_log)
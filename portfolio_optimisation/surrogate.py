@@ -0,0 +1,165 @@
+import numpy as np
+
+
+class QuadraticSurface:
+    """Quadratic response surface ``c + b.x + x'Qx`` over named features.
+
+    ``features`` names the entries of ``x`` (SUB totals or RM quantities),
+    ``linear`` is ``b`` and ``quadratic`` the symmetric matrix ``Q``.
+    """
+
+    def __init__(self, features, constant, linear, quadratic):
+        self.features = list(features)
+        self.constant = float(constant)
+        self.linear = np.asarray(linear, dtype=float)
+        self.quadratic = np.asarray(quadratic, dtype=float)
+        if not np.allclose(self.quadratic, self.quadratic.T):
+            raise ValueError('quadratic coefficient matrix must be symmetric')
+
+    @classmethod
+    def from_terms(cls, terms):
+        """Build from ``{(): c, (f,): b_f, (f, g): q_fg}`` polynomial terms."""
+        features = []
+        for key in terms:
+            for f in key:
+                if f not in features:
+                    features.append(f)
+        pos = {f: i for i, f in enumerate(features)}
+        constant = 0.0
+        linear = np.zeros(len(features))
+        quadratic = np.zeros((len(features), len(features)))
+        for key, coef in terms.items():
+            if len(key) == 0:
+                constant += coef
+            elif len(key) == 1:
+                linear[pos[key[0]]] += coef
+            else:
+                i, j = pos[key[0]], pos[key[1]]
+                quadratic[i, j] += coef / 2
+                quadratic[j, i] += coef / 2
+        return cls(features, constant, linear, quadratic)
+
+    def expression(self, x):
+        """Pyomo expression of the surface; ``x(feature)`` returns the component of a feature."""
+        xs = [x(f) for f in self.features]
+        n = len(xs)
+        terms = [self.constant]
+        terms += [self.linear[i] * xs[i] for i in range(n) if self.linear[i]]
+        terms += [self.quadratic[i, i] * xs[i] * xs[i] for i in range(n) if self.quadratic[i, i]]
+        terms += [2 * self.quadratic[i, j] * xs[i] * xs[j]
+                  for i in range(n) for j in range(i + 1, n) if self.quadratic[i, j]]
+        return sum(terms)
+
+    def evaluate(self, X):
+        """Evaluate a batch of points; ``X`` has one column per feature, in ``features`` order."""
+        X = np.asarray(X, dtype=float)
+        return self.constant + X @ self.linear + ((X @ self.quadratic) * X).sum(axis=-1)
+
+    def gradient(self, X):
+        """Gradient ``b + 2Qx`` at a batch of points, same shape as ``X``."""
+        X = np.asarray(X, dtype=float)
+        return self.linear + 2 * X @ self.quadratic
+
+
+# Mixer quality polynomial of model_5 over the mixer SUB totals and RM_06. The
+# rescalings of the original notes (SUB_07 / 0.05 * 0.75, SUB_07 / 0.05 * 0.0018,
+# SUB_09 / 0.48 * 0.47, RM_06 * 0.005) are folded into the coefficients.
+MODEL_5 = QuadraticSurface.from_terms({
+    (): 2,
+    ('SUB_07',): 824.28, ('SUB_03',): -31, ('SUB_26',): 172,
+    ('RM_06',): 0.86, ('SUB_10',): 69, ('SUB_09',): -319.6,
+    ('SUB_15',): -9, ('SUB_14',): 20, ('SUB_23',): 57,
+    ('SUB_13',): 10, ('SUB_22',): -44, ('SUB_12',): -60,
+    ('SUB_11',): 9,
+    ('SUB_07', 'SUB_07'): -139501.339344, ('SUB_03', 'SUB_03'): -976,
+    ('SUB_26', 'SUB_26'): -2120, ('RM_06', 'SUB_26'): -21.2,
+    ('RM_06', 'RM_06'): -0.053, ('SUB_10', 'SUB_10'): 1425,
+    ('SUB_09', 'SUB_09'): 179.289496527778, ('SUB_15', 'SUB_15'): -206,
+    ('SUB_14', 'SUB_14'): -339, ('SUB_07', 'SUB_14'): 12549.408,
+    ('SUB_23', 'SUB_23'): -287, ('SUB_13', 'SUB_13'): 145,
+    ('SUB_22', 'SUB_22'): 12, ('SUB_12', 'SUB_12'): 2145,
+    ('SUB_11', 'SUB_11'): 2, ('SUB_03', 'SUB_07'): 16607.124,
+    ('SUB_07', 'SUB_26'): 10287.636, ('RM_06', 'SUB_07'): 51.43818,
+    ('SUB_07', 'SUB_10'): 9964.692, ('SUB_07', 'SUB_09'): -33446.82,
+    ('SUB_07', 'SUB_15'): -8127.024, ('SUB_07', 'SUB_23'): -3224.82,
+    ('SUB_07', 'SUB_13'): 5910.192, ('SUB_07', 'SUB_22'): 2606.268,
+    ('SUB_07', 'SUB_12'): 1707.12, ('SUB_07', 'SUB_11'): -4751.616,
+    ('SUB_03', 'SUB_26'): -4235, ('RM_06', 'SUB_03'): -21.175,
+    ('SUB_03', 'SUB_10'): 640, ('SUB_03', 'SUB_09'): 2235,
+    ('SUB_03', 'SUB_15'): -2, ('SUB_03', 'SUB_14'): 1191,
+    ('SUB_03', 'SUB_23'): 896, ('SUB_03', 'SUB_13'): -2136,
+    ('SUB_03', 'SUB_22'): -30, ('SUB_03', 'SUB_12'): 422,
+    ('SUB_03', 'SUB_11'): 345, ('SUB_10', 'SUB_26'): -618,
+    ('RM_06', 'SUB_10'): -3.09, ('SUB_09', 'SUB_26'): -6484,
+    ('RM_06', 'SUB_09'): -32.42, ('SUB_15', 'SUB_26'): -394,
+    ('RM_06', 'SUB_15'): -1.97, ('SUB_14', 'SUB_26'): -1601,
+    ('RM_06', 'SUB_14'): -8.005, ('SUB_23', 'SUB_26'): -1443,
+    ('RM_06', 'SUB_23'): -7.215, ('SUB_13', 'SUB_26'): 2012,
+    ('RM_06', 'SUB_13'): 10.06, ('SUB_22', 'SUB_26'): 1270,
+    ('RM_06', 'SUB_22'): 6.35, ('SUB_12', 'SUB_26'): 2190,
+    ('RM_06', 'SUB_12'): 10.95, ('SUB_11', 'SUB_26'): 614,
+    ('RM_06', 'SUB_11'): 3.07, ('SUB_09', 'SUB_10'): 274,
+    ('SUB_10', 'SUB_15'): 145, ('SUB_10', 'SUB_14'): 703,
+    ('SUB_10', 'SUB_23'): -218, ('SUB_10', 'SUB_13'): -3414,
+    ('SUB_10', 'SUB_22'): -558, ('SUB_10', 'SUB_12'): -784,
+    ('SUB_10', 'SUB_11'): -428, ('SUB_09', 'SUB_15'): 178,
+    ('SUB_09', 'SUB_14'): 3245, ('SUB_09', 'SUB_23'): 920,
+    ('SUB_09', 'SUB_13'): -5576, ('SUB_09', 'SUB_22'): -1995,
+    ('SUB_09', 'SUB_12'): 5996, ('SUB_09', 'SUB_11'): 1890,
+    ('SUB_14', 'SUB_15'): 334, ('SUB_15', 'SUB_23'): -94,
+    ('SUB_13', 'SUB_15'): 1306, ('SUB_15', 'SUB_22'): 426,
+    ('SUB_12', 'SUB_15'): 521, ('SUB_11', 'SUB_15'): -105,
+    ('SUB_14', 'SUB_23'): -5, ('SUB_13', 'SUB_14'): -3328,
+    ('SUB_14', 'SUB_22'): 937, ('SUB_12', 'SUB_14'): -1170,
+    ('SUB_11', 'SUB_14'): -94, ('SUB_13', 'SUB_23'): 357,
+    ('SUB_22', 'SUB_23'): 303, ('SUB_12', 'SUB_23'): 552,
+    ('SUB_11', 'SUB_23'): -206, ('SUB_13', 'SUB_22'): 173,
+    ('SUB_12', 'SUB_13'): -4444, ('SUB_11', 'SUB_13'): 996,
+    ('SUB_12', 'SUB_22'): -985, ('SUB_11', 'SUB_22'): 122,
+    ('SUB_11', 'SUB_12'): -65,
+})
+
+# SRI models over the total SUB content of one product
+MODEL_1 = QuadraticSurface.from_terms({
+    (): 53,
+    ('SUB_11',): -6, ('SUB_02',): -5, ('SUB_01',): 1172,
+    ('SUB_09',): -400, ('SUB_18',): 1874, ('SUB_27',): 23,
+    ('SUB_19',): 183510,
+    ('SUB_27', 'SUB_27'): -2038, ('SUB_18', 'SUB_18'): -199367,
+    ('SUB_09', 'SUB_27'): 2561, ('SUB_09', 'SUB_11'): 130,
+    ('SUB_09', 'SUB_09'): 2592, ('SUB_19', 'SUB_19'): -103429177,
+    ('SUB_18', 'SUB_19'): -1048878,
+})
+
+MODEL_2 = QuadraticSurface.from_terms({
+    (): 29,
+    ('SUB_21',): 51, ('SUB_15',): 42, ('SUB_23',): 15,
+    ('SUB_11',): 25, ('SUB_02',): 51, ('SUB_16',): 121,
+    ('SUB_24',): -139, ('SUB_26',): -30, ('SUB_09',): -80,
+    ('SUB_27',): 231,
+    ('SUB_21', 'SUB_21'): -23, ('SUB_15', 'SUB_21'): -36,
+    ('SUB_21', 'SUB_23'): -27, ('SUB_02', 'SUB_21'): -21,
+    ('SUB_02', 'SUB_15'): -37, ('SUB_23', 'SUB_23'): -36,
+    ('SUB_11', 'SUB_23'): -14, ('SUB_16', 'SUB_16'): -1602,
+    ('SUB_21', 'SUB_24'): 29, ('SUB_11', 'SUB_21'): -5,
+    ('SUB_16', 'SUB_24'): 178, ('SUB_24', 'SUB_26'): 54,
+    ('SUB_11', 'SUB_15'): -25, ('SUB_27', 'SUB_27'): -2912,
+    ('SUB_11', 'SUB_27'): 68, ('SUB_02', 'SUB_11'): -20,
+    ('SUB_24', 'SUB_27'): 85, ('SUB_15', 'SUB_15'): -16,
+    ('SUB_23', 'SUB_27'): 86, ('SUB_02', 'SUB_27'): -50,
+    ('SUB_26', 'SUB_27'): 222, ('SUB_09', 'SUB_27'): 1447,
+    ('SUB_11', 'SUB_16'): -57, ('SUB_11', 'SUB_26'): 37,
+})
+
+MODEL_3 = QuadraticSurface.from_terms({
+    (): 9,
+    ('SUB_21',): 12, ('SUB_15',): -0.5, ('SUB_23',): 10,
+    ('SUB_11',): 7, ('SUB_02',): 12, ('SUB_03',): 34,
+    ('SUB_01',): -13976, ('SUB_26',): 9, ('SUB_18',): 4069,
+    ('SUB_21', 'SUB_21'): -8, ('SUB_15', 'SUB_21'): -2,
+    ('SUB_21', 'SUB_23'): -23, ('SUB_02', 'SUB_21'): -8,
+    ('SUB_02', 'SUB_15'): -7, ('SUB_15', 'SUB_18'): 1754,
+    ('SUB_03', 'SUB_23'): 0.4, ('SUB_26', 'SUB_26'): 120,
+    ('SUB_01', 'SUB_01'): 17776885, ('SUB_02', 'SUB_11'): -7,
+    ('SUB_18', 'SUB_18'): -364999, ('SUB_03', 'SUB_03'): -564,
+})
@@ -0,0 +1,61 @@
+import numpy as np
+
+from .portfolio import (
+    MIXER_COSTS, MIXER_FORBIDDEN_RMS, POST_MIXER_COSTS, PRODUCT_FORBIDDEN_RMS, MixerSpec, ProductSpec
+)
+
+
+def synthetic_composition(df, n_rms, rng):
+    """Extend the composition table to ``n_rms`` RMs, keeping the original ones first.
+
+    Each extra RM is a random blend of two original RMs, so SUB contents stay
+    realistic. A blend holds every SUB of either parent, so the extra columns
+    are denser than the original ones and the sparse SUB sums grow faster
+    than the RM count. Returns the table and
+    ``{extra_rm: (rm_a, rm_b, weight_a)}``.
+    """
+    import pandas as pd
+    base = list(df.columns)
+    if n_rms <= len(base):
+        return df[base[:n_rms]].copy(), {}
+    blends, columns = {}, {}
+    for k in range(len(base), n_rms):
+        a, b = rng.choice(len(base), 2, replace=False)
+        w = rng.uniform(0.2, 0.8)
+        name = f'RM_{k + 1:04d}'
+        blends[name] = (base[a], base[b], w)
+        columns[name] = w * df[base[a]] + (1 - w) * df[base[b]]
+    return pd.concat([df, pd.DataFrame(columns, index=df.index)], axis=1), blends
+
+
+def synthetic_portfolio(df, n_products, n_rms=None, seed=0):
+    """Build arguments for a synthetic portfolio of ``n_products`` products over ``n_rms`` RMs.
+
+    Starts from the original composition table and products: extra RMs are
+    blends of two original RMs (see ``synthetic_composition``) priced at the
+    blended cost plus up to 20 %, and allowed in the mixer or post mixer only
+    where both parents are. SRI thresholds are drawn from the original range
+    44-53, each product is separated from the next two in the table and the
+    contaminant limit grows with the portfolio. Returns ``(df, build_kwargs)``
+    for ``build_model(df, **build_kwargs)``.
+    """
+    rng = np.random.default_rng(seed)
+    df, blends = synthetic_composition(df, n_rms or len(df.columns), rng)
+    mixer_costs, post_costs = dict(MIXER_COSTS), dict(POST_MIXER_COSTS)
+    mixer_forbidden = [rm for rm in MIXER_FORBIDDEN_RMS if rm in df.columns]
+    product_forbidden = [rm for rm in PRODUCT_FORBIDDEN_RMS if rm in df.columns]
+    for name, (a, b, w) in blends.items():
+        markup = 1 + rng.uniform(0, 0.2)
+        for costs, forbidden in ((mixer_costs, mixer_forbidden), (post_costs, product_forbidden)):
+            if a in forbidden or b in forbidden:
+                forbidden.append(name)
+            else:
+                costs[name] = markup * (w * costs.get(a, 0) + (1 - w) * costs.get(b, 0))
+
+    names = [f'P{i + 1:03d}' for i in range(n_products)]
+    products = [ProductSpec(name, float(rng.uniform(44, 53)), forbidden_rms=list(product_forbidden),
+                            mixer_level_init=float(i % 2 == 0)) for i, name in enumerate(names)]
+    level_pairs = [(names[i], names[j]) for i in range(n_products) for j in (i + 1, i + 2) if j < n_products]
+    mixer = MixerSpec(costs=mixer_costs, forbidden_rms=mixer_forbidden)
+    return df, dict(products=products, mixer=mixer, post_mixer_costs=post_costs, level_pairs=level_pairs,
+                    contaminant_limit=5.25 * n_products / 5)
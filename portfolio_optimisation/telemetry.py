@@ -0,0 +1,144 @@
+import json
+import re
+import time
+from contextlib import contextmanager, nullcontext
+
+# Columns of an Ipopt iteration line, as printed in its log
+IPOPT_COLUMNS = ('objective', 'inf_pr', 'inf_du', 'lg_mu', 'd_norm', 'lg_rg', 'alpha_du', 'alpha_pr', 'ls')
+
+# "  12r 1.2345678e+00 1.00e-01 ..." - iteration number, 'r' in the restoration phase, then the columns
+_IPOPT_LINE = re.compile(r'^\s*(\d+)(r?)\s+(-?\d\.\d+e[+-]\d+)\s+(.*)$')
+
+
+class JsonLinesSink:
+    """Append every event as one JSON line to ``path``."""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+
+    def __call__(self, event):
+        if self.file is None:
+            self.file = open(self.path, 'a', buffering=1)
+        self.file.write(json.dumps(event, default=str) + '\n')
+
+    def close(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+
+class Telemetry:
+    """Timing and solver events sent to pluggable sinks.
+
+    A sink is any callable taking one event dict: a ``JsonLinesSink``, a
+    callback, or ``list.append`` to collect events in memory. Every event has
+    ``event`` (``'phase'``, ``'iteration'`` or a custom name), a wall clock
+    ``time`` and the ``context`` fields, e.g. the scenario being solved.
+    """
+
+    def __init__(self, *sinks, **context):
+        self.sinks = list(sinks)
+        self.context = context
+
+    def bind(self, **context):
+        """Telemetry with the same sinks and extra context fields."""
+        return Telemetry(*self.sinks, **{**self.context, **context})
+
+    def emit(self, event, **fields):
+        record = {'event': event, 'time': time.time(), **self.context, **fields}
+        for sink in self.sinks:
+            sink(record)
+
+    @contextmanager
+    def phase(self, name, **fields):
+        """Time a block; the yielded dict collects extra fields for the ``phase`` event."""
+        info = dict(fields)
+        t0 = time.perf_counter()
+        try:
+            yield info
+        finally:
+            self.emit('phase', name=name, seconds=time.perf_counter() - t0, **info)
+
+    def stages(self, prefix):
+        return _Stages(self, prefix)
+
+
+class _Stages:
+    # Consecutive phases: start() ends the running stage and begins the next one
+
+    def __init__(self, telemetry, prefix):
+        self.telemetry = telemetry
+        self.prefix = prefix
+        self.name = None
+        self.t0 = None
+
+    def start(self, name):
+        self.stop()
+        self.name, self.t0 = name, time.perf_counter()
+
+    def stop(self):
+        if self.name is not None:
+            self.telemetry.emit('phase', name=f'{self.prefix}.{self.name}', seconds=time.perf_counter() - self.t0)
+            self.name = None
+
+
+class _NoStages:
+    def start(self, name):
+        pass
+
+    def stop(self):
+        pass
+
+
+def phase(telemetry, name, **fields):
+    """``telemetry.phase(name)``, or a no-op context when ``telemetry`` is None."""
+    return nullcontext({}) if telemetry is None else telemetry.phase(name, **fields)
+
+
+def stages(telemetry, prefix):
+    return _NoStages() if telemetry is None else telemetry.stages(prefix)
+
+
+def _number(token):
+    try:
+        return float(token)
+    except ValueError:
+        return None
+
+
+def parse_ipopt_log(log):
+    """Per-iteration records of an Ipopt log.
+
+    Each record has ``iteration``, ``restoration`` (True in the restoration
+    phase) and the numeric log columns (``objective``, ``inf_pr``,
+    ``inf_du``, ``lg_mu``, ``d_norm``, ``lg_rg``, ``alpha_du``, ``alpha_pr``,
+    ``ls``); ``alpha_pr_type`` keeps the step type letter Ipopt appends.
+    """
+    records = []
+    for line in log.splitlines():
+        match = _IPOPT_LINE.match(line)
+        if match is None:
+            continue
+        tokens = [match.group(3)] + match.group(4).split()
+        if len(tokens) < len(IPOPT_COLUMNS):
+            continue
+        record = {'iteration': int(match.group(1)), 'restoration': match.group(2) == 'r'}
+        for name, token in zip(IPOPT_COLUMNS, tokens):
+            if name == 'alpha_pr' and token[-1:].isalpha():
+                record['alpha_pr_type'] = token[-1]
+                token = token[:-1]
+            record[name] = _number(token)
+        records.append(record)
+    return records
+
+
+def cyipopt_callback(telemetry):
+    """``intermediate_callback`` for the cyipopt backend that emits one event per iteration."""
+    def callback(nlp, alg_mod, iter_count, obj_value, inf_pr, inf_du, mu, d_norm, regularization_size,
+                 alpha_du, alpha_pr, ls_trials):
+        telemetry.emit('iteration', iteration=iter_count, restoration=alg_mod == 1, objective=obj_value,
+                       inf_pr=inf_pr, inf_du=inf_du, mu=mu, d_norm=d_norm, regularization=regularization_size,
+                       alpha_du=alpha_du, alpha_pr=alpha_pr, ls=ls_trials)
+        return True
+    return callback
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+from portfolio_optimisation import DEFAULT_LEVEL_PAIRS, build_model, default_products, load_composition
+
+
+@pytest.fixture(scope='session')
+def composition(tmp_path_factory):
+    # The local RM Composition.xlsx, cached in a temporary directory
+    return load_composition(cache_dir=tmp_path_factory.mktemp('composition'))
+
+
+@pytest.fixture
+def build_kwargs():
+    return dict(products=default_products(), level_pairs=list(DEFAULT_LEVEL_PAIRS))
+
+
+@pytest.fixture
+def model(composition, build_kwargs):
+    return build_model(composition, **build_kwargs)
+
+
+@pytest.fixture
+def random_point():
+    # Recipes around the simple constraints, not necessarily feasible, as set_point takes them
+    def sample(model, seed=0):
+        rng = np.random.default_rng(seed)
+        n_rm, n_prod = len(model.RM), len(model.PROD)
+        return {'Mixer_RM_qty': rng.dirichlet(np.ones(n_rm)), 'Mixer_Level': rng.random(n_prod),
+                'prod_RM_qty': rng.random((n_prod, n_rm)) / n_rm}
+    return sample
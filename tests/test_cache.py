@@ -0,0 +1,159 @@
+import itertools
+import types
+
+import numpy as np
+import pytest
+
+from portfolio_optimisation import (
+    CacheKey, SolutionCache, SolverConfig, activate_product, add_product, build_model, cache_key,
+    deactivate_product, drop_product, extract_result, result_point, set_point, set_rm_bound, set_sub_bound,
+    set_systemic_constraint, update_parameters
+)
+from portfolio_optimisation.model import heuristic_level_order
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # Strictly increasing access times, so the LRU order does not depend on the timer resolution
+    ticks = itertools.count()
+    monkeypatch.setattr('portfolio_optimisation.cache.time', types.SimpleNamespace(time=lambda: float(next(ticks))))
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    with SolutionCache(tmp_path / 'solutions.sqlite', max_entries=3) as cache:
+        yield cache
+
+
+@pytest.fixture
+def result(model, random_point):
+    set_point(model, random_point(model))
+    return extract_result(model)
+
+
+def _keys(cache):
+    return sorted(key for (key,) in cache.connection.execute('SELECT key FROM solutions'))
+
+
+def _without(build_kwargs, prod):
+    return dict(products=[p for p in build_kwargs['products'] if p.name != prod],
+                level_pairs=[pair for pair in build_kwargs['level_pairs'] if prod not in pair])
+
+
+def test_round_trip(cache, model, result):
+    key = cache_key(model)
+    assert cache.get(key) is None
+    cache.put(key, result)
+    stored = cache.get(key)
+    assert stored.objective == result.objective
+    assert stored.prods == result.prods
+    for name, array in result_point(stored).items():
+        np.testing.assert_array_equal(array, result_point(result)[name])
+    assert cache.stats() == {'entries': 1, 'bytes': cache.stats()['bytes'], 'hits': 1}
+
+
+def test_key_follows_the_inputs(model):
+    key = cache_key(model)
+    assert cache_key(model) == key
+    assert cache_key(model, SolverConfig()) != key
+    update_parameters(model, mixer_costs={'RM_01': 900})
+    assert cache_key(model) != key
+    assert cache_key(model).composition == key.composition
+    update_parameters(model, mixer_costs={'RM_01': 800})
+    assert cache_key(model) == key
+
+
+def test_key_follows_the_composition(composition, build_kwargs, model):
+    changed = composition.copy()
+    changed.iloc[0, 0] += 1e-3
+    key = cache_key(build_model(changed, **build_kwargs))
+    assert key.composition != cache_key(model).composition
+
+
+def test_key_of_an_added_product_matches_a_fresh_build(composition, build_kwargs):
+    model = build_model(composition, **_without(build_kwargs, 'E'))
+    add_product(model, build_kwargs['products'][-1],
+                level_pairs=[q for p, q in build_kwargs['level_pairs'] if p == 'E']
+                + [p for p, q in build_kwargs['level_pairs'] if q == 'E'])
+    assert cache_key(model) == cache_key(build_model(composition, **build_kwargs))
+
+
+@pytest.mark.parametrize('level_separation', ['abs', 'ordered'])
+def test_key_of_a_dropped_product_matches_a_fresh_build(composition, build_kwargs, level_separation):
+    model = build_model(composition, level_separation=level_separation, **build_kwargs)
+    drop_product(model, 'C')
+    fresh = build_model(composition, level_separation=level_separation, **_without(build_kwargs, 'C'))
+    assert cache_key(model) == cache_key(fresh)
+
+
+@pytest.mark.parametrize('level_separation', ['abs', 'bigm', 'gdp', 'ordered'])
+def test_key_after_deactivate_then_activate_matches_a_fresh_build(composition, build_kwargs, level_separation):
+    products = build_kwargs['products']
+    order = heuristic_level_order(products)
+    model = build_model(composition, level_separation=level_separation, **build_kwargs)
+    deactivate_product(model, 'B')
+    activate_product(model, 'B')
+    # The pairs of B come back in the other orientation and the level ranks keep a gap,
+    # neither of which changes the problem
+    fresh = build_model(composition, products=[p for p in products if p.name != 'B'] + [products[1]],
+                        level_pairs=build_kwargs['level_pairs'], level_separation=level_separation,
+                        level_order=order)
+    assert cache_key(model) == cache_key(fresh)
+
+
+def test_key_round_trips_through_bound_edits(model):
+    key = cache_key(model)
+    set_sub_bound(model, 'A', 'SUB_21', upper=0.7)
+    assert cache_key(model) != key
+    set_sub_bound(model, 'A', 'SUB_21', upper=0.75)
+    assert cache_key(model) == key
+
+    set_rm_bound(model, 'B', 'RM_08', upper=0.4)
+    assert cache_key(model) != key
+    set_rm_bound(model, 'B', 'RM_08')
+    set_rm_bound(model, 'B', 'RM_08', upper=0.46)
+    assert cache_key(model) == key
+
+
+def test_key_follows_the_systemic_constraint(model):
+    key = cache_key(model)
+    set_systemic_constraint(model, active=False)
+    assert cache_key(model) != key
+    set_systemic_constraint(model, active=True)
+    assert cache_key(model) == key
+
+
+def test_least_recently_used_entries_are_evicted(cache, result):
+    for name in 'abc':
+        cache.put(CacheKey(name, 'c'), result)
+    cache.get('a')
+    cache.put(CacheKey('d', 'c'), result)
+    assert _keys(cache) == ['a', 'c', 'd']
+
+
+def test_size_eviction(cache, result):
+    cache.max_entries = None
+    for name in 'abc':
+        cache.put(CacheKey(name, 'c'), result)
+    cache.max_bytes = cache.stats()['bytes'] * 2 // 3
+    assert cache.evict() == 1
+    assert _keys(cache) == ['b', 'c']
+
+
+def test_new_composition_of_a_source_invalidates_its_entries(cache, result):
+    cache.put(CacheKey('old', 'c1'), result, source='composition.xlsx')
+    cache.put(CacheKey('other', 'c1'), result, source='other.xlsx')
+    cache.put(CacheKey('new', 'c2'), result, source='composition.xlsx')
+    assert _keys(cache) == ['new', 'other']
+
+
+def test_invalidate(cache, result):
+    cache.put(CacheKey('a', 'c1'), result, source='s')
+    cache.put(CacheKey('b', 'c2'), result, source='s')
+    assert cache.invalidate(composition='c1') == 0  # already replaced by the c2 entry of the same source
+    cache.put(CacheKey('c', 'c1'), result)
+    assert cache.invalidate(composition='c1') == 1
+    assert cache.invalidate(source='s') == 1
+    assert len(cache) == 0
+    with pytest.raises(ValueError):
+        cache.invalidate()
@@ -0,0 +1,36 @@
+import shutil
+
+import pandas as pd
+
+from portfolio_optimisation import load_composition
+from portfolio_optimisation.data import DEFAULT_COMPOSITION_PATH, file_hash
+
+
+def test_cached_load_matches_the_xlsx(tmp_path):
+    cached = load_composition(cache_dir=tmp_path)
+    assert (tmp_path / f'composition-{file_hash(DEFAULT_COMPOSITION_PATH)}.npz').exists()
+    # The first load returns the xlsx columns as read; later ones come from the float NPZ
+    pd.testing.assert_frame_equal(load_composition(cache_dir=tmp_path), cached, check_dtype=False)
+    pd.testing.assert_frame_equal(load_composition(cache_dir=tmp_path), load_composition(use_cache=False),
+                                  check_dtype=False)
+
+
+def test_editing_the_xlsx_invalidates_the_cache(tmp_path):
+    path = tmp_path / 'composition.xlsx'
+    shutil.copyfile(DEFAULT_COMPOSITION_PATH, path)
+    before = load_composition(path, cache_dir=tmp_path)
+
+    edited = before.copy()
+    edited.iloc[0, 0] += 1.0
+    edited.to_excel(path)
+    after = load_composition(path, cache_dir=tmp_path)
+    assert after.iloc[0, 0] == before.iloc[0, 0] + 1.0
+    assert len(list(tmp_path.glob('composition-*.npz'))) == 2
+
+
+def test_corrupt_cache_is_rebuilt(tmp_path):
+    cache_file = tmp_path / f'composition-{file_hash(DEFAULT_COMPOSITION_PATH)}.npz'
+    cache_file.write_bytes(b'not an npz file')
+    pd.testing.assert_frame_equal(load_composition(cache_dir=tmp_path), load_composition(use_cache=False),
+                                  check_dtype=False)
+    assert cache_file.stat().st_size > len(b'not an npz file')
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+
+from portfolio_optimisation.decomposition import level_windows, project_budgets, separate_levels
+
+EPSILON = 0.001
+PAIRS = [(0, 1), (0, 2), (1, 2), (2, 3)]
+
+
+def test_project_budgets_shifts_positive_demand_to_the_limit():
+    np.testing.assert_allclose(project_budgets([3.0, 1.0, 0.5], 3.0), [2.5, 0.5, 0.0])
+
+
+def test_project_budgets_keeps_demand_at_the_limit():
+    np.testing.assert_allclose(project_budgets([2.0, 1.0, 2.25], 5.25), [2.0, 1.0, 2.25])
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_project_budgets_is_non_negative_and_sums_to_the_limit(seed):
+    rng = np.random.default_rng(seed)
+    demand = rng.random(8) * 3
+    budgets = project_budgets(demand, 5.25)
+    assert (budgets >= 0).all()
+    assert budgets.sum() == pytest.approx(5.25)
+    # Every product with a budget gets its demand moved by the same amount
+    shift = (demand - budgets)[budgets > 0]
+    np.testing.assert_allclose(shift, shift[0])
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_level_windows_keep_every_pair_apart(seed):
+    rng = np.random.default_rng(seed)
+    levels = separate_levels(rng.random(4), PAIRS, EPSILON)
+    lo, hi = level_windows(levels, PAIRS, EPSILON)
+    assert (lo <= levels).all() and (levels <= hi).all()
+    for corner in rng.integers(0, 2, size=(32, 4)):
+        moved = np.where(corner == 1, hi, lo)
+        assert all(abs(moved[i] - moved[j]) >= EPSILON - 1e-12 for i, j in PAIRS)
+
+
+def test_level_windows_shrink_to_packed_levels():
+    levels = np.array([0.5, 0.5 + EPSILON])
+    lo, hi = level_windows(levels, [(0, 1)], EPSILON)
+    np.testing.assert_allclose(hi[0], levels[0])
+    np.testing.assert_allclose(lo[1], levels[1])
+
+
+def test_separate_levels_keeps_separated_levels():
+    levels = np.array([0.1, 0.2, 0.3, 0.4])
+    np.testing.assert_array_equal(separate_levels(levels, PAIRS, EPSILON), levels)
+
+
+@pytest.mark.parametrize('levels', [[0.12, 0.12, 0.12, 0.12], [1.0, 1.0, 0.9995, 0.2], [0.0, 0.0, 0.0, 0.0]])
+def test_separate_levels_spreads_ties_in_order(levels):
+    spread = separate_levels(levels, PAIRS, EPSILON)
+    assert all(abs(spread[i] - spread[j]) >= EPSILON - 1e-12 for i, j in PAIRS)
+    assert ((0 <= spread) & (spread <= 1)).all()
+    order = np.argsort(levels, kind='stable')
+    assert (np.diff(spread[order]) >= 0).all()
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+from pyomo.environ import Constraint, Var, value
+
+from portfolio_optimisation import BatchEvaluator, build_model, set_point
+
+
+def _random_points(model, n, seed):
+    # Recipes around the simple constraints, not necessarily feasible
+    rng = np.random.default_rng(seed)
+    n_rm, n_prod = len(model.RM), len(model.PROD)
+    mixer = rng.dirichlet(np.ones(n_rm), size=n)
+    levels = rng.random((n, n_prod))
+    prod = rng.dirichlet(np.ones(n_rm), size=(n, n_prod)) * (1 - levels)[:, :, None]
+    return mixer, levels, prod
+
+
+def _pyomo_violation(model):
+    # Largest violation over the active constraints and the variable bounds
+    worst = 0.0
+    for con in model.component_data_objects(Constraint, active=True):
+        body = value(con.body)
+        if con.has_lb():
+            worst = max(worst, value(con.lower) - body)
+        if con.has_ub():
+            worst = max(worst, body - value(con.upper))
+    for var in model.component_data_objects(Var):
+        if var.lb is not None:
+            worst = max(worst, var.lb - var.value)
+        if var.ub is not None:
+            worst = max(worst, var.value - var.ub)
+    return worst
+
+
+def test_evaluate_matches_pyomo_expressions(model):
+    ev = BatchEvaluator(model)
+    mixer, levels, prod = _random_points(model, 4, seed=0)
+    out = ev.evaluate(mixer, levels, prod)
+    for k in range(len(mixer)):
+        set_point(model, {'Mixer_RM_qty': mixer[k], 'Mixer_Level': levels[k], 'prod_RM_qty': prod[k]})
+        assert out['objective'][k] == pytest.approx(value(model.objective), rel=1e-9)
+        assert out['model_9'][k] == pytest.approx(value(model.model_9_constraint.body), rel=1e-9)
+        assert out['model_5'][k] == pytest.approx(value(model.model_5_constraint.body), rel=1e-9, abs=1e-9)
+        for i, p in enumerate(model.PROD):
+            assert out['model_4'][k, i] == pytest.approx(value(model.model_4[p]), rel=1e-9, abs=1e-9)
+            for s, sub in enumerate(model.SUB):
+                assert out['total_SUB'][k, i, s] == pytest.approx(value(model.Total_Prod_SUB[p, sub]),
+                                                                 rel=1e-9, abs=1e-12)
+
+
+@pytest.mark.parametrize('level_separation', ['abs', 'ordered'])
+def test_max_violation_matches_pyomo(composition, build_kwargs, level_separation):
+    model = build_model(composition, level_separation=level_separation, **build_kwargs)
+    ev = BatchEvaluator(model)
+    mixer, levels, prod = _random_points(model, 4, seed=1)
+    out = ev.evaluate(mixer, levels, prod)
+    for k in range(len(mixer)):
+        set_point(model, {'Mixer_RM_qty': mixer[k], 'Mixer_Level': levels[k], 'prod_RM_qty': prod[k]})
+        assert out['max_violation'][k] == pytest.approx(_pyomo_violation(model), rel=1e-9, abs=1e-12)
+
+
+def test_ordered_separation_rejects_the_reversed_order(composition, build_kwargs, random_point):
+    model = build_model(composition, level_separation='ordered', **build_kwargs)
+    ev = BatchEvaluator(model)
+    point = random_point(model)
+    rank = np.array([value(model.level_rank[p]) for p in model.PROD])
+    # Reversed levels miss each pair by its rank distance plus epsilon
+    widest = max(abs(rank[i] - rank[j]) for i, j in zip(ev.pair_i, ev.pair_j))
+    for levels, expected in ((0.1 + 0.1 * rank, 0.0), (0.5 - 0.1 * rank, 0.1 * widest + ev.epsilon)):
+        out = ev.evaluate(point['Mixer_RM_qty'], levels, point['prod_RM_qty'])
+        assert out['violations']['mixer_inequality'][0] == pytest.approx(expected)
@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+from pyomo.environ import value
+
+from portfolio_optimisation import (
+    DEFAULT_LEVEL_PAIRS, BatchEvaluator, build_model, default_products, heuristic_start, set_point
+)
+
+pytest.importorskip('scipy')
+
+TOL = 1e-6
+
+
+@pytest.fixture(scope='module')
+def starts(composition):
+    # One quick and one full search on fresh default models, shared by the tests below
+    results = {}
+    for quick in (True, False):
+        model = build_model(composition, products=default_products(), level_pairs=list(DEFAULT_LEVEL_PAIRS))
+        results[quick] = model, heuristic_start(model, quick=quick, tol=TOL)
+    return results
+
+
+@pytest.mark.parametrize('quick', [True, False])
+def test_start_is_feasible(starts, quick):
+    model, start = starts[quick]
+    assert start.feasible
+    assert start.max_violation <= TOL
+    set_point(model, start.point)
+    assert value(model.objective) == pytest.approx(start.objective, rel=1e-9)
+    ev = BatchEvaluator(model)
+    point = start.point
+    out = ev.evaluate(point['Mixer_RM_qty'], point['Mixer_Level'], point['prod_RM_qty'])
+    assert out['max_violation'][0] == pytest.approx(start.max_violation, abs=1e-12)
+
+
+@pytest.mark.parametrize('quick', [True, False])
+def test_levels_follow_the_returned_order(starts, quick):
+    model, start = starts[quick]
+    levels = dict(zip(model.PROD, start.point['Mixer_Level']))
+    assert np.all(np.diff([levels[p] for p in start.order]) >= -TOL)
+
+
+def test_full_search_is_no_worse_than_quick(starts):
+    quick, full = starts[True][1], starts[False][1]
+    assert full.feasible >= quick.feasible
+    assert full.objective <= quick.objective + 1e-9
+    assert full.lps > quick.lps
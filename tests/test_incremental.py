@@ -0,0 +1,120 @@
+import pytest
+from pyomo.environ import Constraint, value
+
+from portfolio_optimisation import (
+    BatchEvaluator, activate_product, add_product, build_model, deactivate_product, drop_product, product_spec,
+    set_point, set_rm_bound, set_sub_bound, set_systemic_constraint
+)
+from portfolio_optimisation.model import heuristic_level_order
+
+
+def _without(build_kwargs, prod):
+    return dict(products=[p for p in build_kwargs['products'] if p.name != prod],
+                level_pairs=[pair for pair in build_kwargs['level_pairs'] if prod not in pair])
+
+
+def _rows(model):
+    # Bounds and body of every active constraint by name, at the current point
+    return {con.name: (value(con.lower) if con.has_lb() else None, value(con.body),
+                       value(con.upper) if con.has_ub() else None)
+            for con in model.component_data_objects(Constraint, active=True)}
+
+
+def assert_same_model(model, fresh, point):
+    assert list(model.PROD) == list(fresh.PROD)
+    set_point(model, point)
+    set_point(fresh, point)
+    assert value(model.objective) == pytest.approx(value(fresh.objective))
+    rows, fresh_rows = _rows(model), _rows(fresh)
+    assert rows.keys() == fresh_rows.keys()
+    for name, row in rows.items():
+        assert row == pytest.approx(fresh_rows[name]), name
+
+
+def assert_same_evaluation(model, fresh, point):
+    args = point['Mixer_RM_qty'], point['Mixer_Level'], point['prod_RM_qty']
+    out, fresh_out = BatchEvaluator(model).evaluate(*args), BatchEvaluator(fresh).evaluate(*args)
+    assert out['objective'] == pytest.approx(fresh_out['objective'])
+    assert out['max_violation'] == pytest.approx(fresh_out['max_violation'])
+
+
+def test_add_product_matches_a_fresh_build(composition, build_kwargs, random_point):
+    model = build_model(composition, **_without(build_kwargs, 'E'))
+    spec = build_kwargs['products'][-1]
+    add_product(model, spec, level_pairs=[q for p, q in build_kwargs['level_pairs'] if p == 'E']
+                + [p for p, q in build_kwargs['level_pairs'] if q == 'E'])
+    fresh = build_model(composition, **build_kwargs)
+    point = random_point(fresh)
+    assert_same_model(model, fresh, point)
+    assert_same_evaluation(model, fresh, point)
+
+
+def test_add_product_rejects_a_duplicate(model, build_kwargs):
+    with pytest.raises(ValueError):
+        add_product(model, build_kwargs['products'][0])
+
+
+@pytest.mark.parametrize('level_separation', ['abs', 'ordered'])
+def test_drop_product_matches_a_fresh_build(composition, build_kwargs, random_point, level_separation):
+    model = build_model(composition, level_separation=level_separation, **build_kwargs)
+    drop_product(model, 'C')
+    fresh = build_model(composition, level_separation=level_separation, **_without(build_kwargs, 'C'))
+    point = random_point(fresh, seed=1)
+    assert_same_model(model, fresh, point)
+    assert_same_evaluation(model, fresh, point)
+
+
+@pytest.mark.parametrize('level_separation', ['abs', 'bigm', 'gdp', 'ordered'])
+def test_deactivate_then_activate_matches_a_fresh_build(composition, build_kwargs, random_point,
+                                                        level_separation):
+    products = build_kwargs['products']
+    order = heuristic_level_order(products)
+    model = build_model(composition, level_separation=level_separation, **build_kwargs)
+    deactivate_product(model, 'B')
+    assert 'B' not in model.PROD
+    activate_product(model, 'B')
+    # The product comes back last, with its level pairs and its place in the level order. Its pairs now
+    # name it second, so the fresh build takes them in the orientation of the edited model
+    assert {frozenset(pair) for pair in model.LEVEL_PAIRS} == {frozenset(pair) for pair in build_kwargs['level_pairs']}
+    fresh = build_model(composition, products=[p for p in products if p.name != 'B'] + [products[1]],
+                        level_pairs=list(model.LEVEL_PAIRS), level_separation=level_separation,
+                        level_order=order)
+    assert_same_model(model, fresh, random_point(fresh, seed=2))
+
+
+def test_set_sub_bound_keeps_the_side_not_passed(model):
+    lower, upper = product_spec(model, 'A').sub_bounds['SUB_09']
+    set_sub_bound(model, 'A', 'SUB_09', lower=lower + 0.001)
+    row = model.prod_SUB_bound['A', 'SUB_09']
+    assert (value(row.lower), value(row.upper)) == pytest.approx((lower + 0.001, upper))
+    assert product_spec(model, 'A').sub_bounds['SUB_09'] == pytest.approx((lower + 0.001, upper))
+
+
+def test_set_sub_bound_matches_a_fresh_build(composition, build_kwargs, random_point):
+    model = build_model(composition, **build_kwargs)
+    set_sub_bound(model, 'A', 'SUB_21', upper=0.7)
+    products = list(build_kwargs['products'])
+    products[0] = product_spec(model, 'A')
+    fresh = build_model(composition, products=products, level_pairs=build_kwargs['level_pairs'])
+    assert_same_model(model, fresh, random_point(fresh))
+
+
+def test_set_rm_bound_adds_and_removes_the_row(model):
+    set_rm_bound(model, 'B', 'RM_08', upper=0.4)
+    row = model.prod_RM_bound['B', 'RM_08']
+    assert value(row.upper) == pytest.approx(0.4)
+    assert product_spec(model, 'B').rm_bounds['RM_08'] == pytest.approx((None, 0.4))
+    set_rm_bound(model, 'B', 'RM_08')
+    assert ('B', 'RM_08') not in model.prod_RM_bound
+    assert 'RM_08' not in product_spec(model, 'B').rm_bounds
+
+
+def test_systemic_constraint_switch(model, random_point):
+    set_point(model, random_point(model))
+    body = value(model.model_9_constraint.body)
+    set_systemic_constraint(model, active=False)
+    assert not model.model_9_constraint.active
+    set_systemic_constraint(model, active=True, limit=2.0)
+    assert model.model_9_constraint.active
+    assert value(model.model_9_constraint.upper) == pytest.approx(2.0)
+    assert value(model.model_9_constraint.body) == pytest.approx(body)
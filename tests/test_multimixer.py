@@ -0,0 +1,99 @@
+import types
+
+import pytest
+from pyomo.environ import Binary, value
+from pyomo.opt import TerminationCondition
+
+from portfolio_optimisation import (
+    MixerSpec, SolverConfig, available_backends, build_multi_mixer_model, identical_mixers, multi_mixer_solve
+)
+from portfolio_optimisation.multimixer import fix_assignment, max_violation, relax_and_fix, symmetric_relabel
+
+TOL = 1e-6
+ASSIGNMENT = {'A': 'M3', 'B': 'M1', 'C': 'M3', 'D': 'M2', 'E': 'M1'}
+
+
+def _symmetry_violation(model):
+    return max(max(value(row.lower) - value(row.body) if row.has_lb() else 0.0,
+                   value(row.body) - value(row.upper) if row.has_ub() else 0.0)
+               for row in model.mixer_symmetry.values())
+
+
+def test_symmetric_relabel_satisfies_the_symmetry_rows(composition):
+    mixers = identical_mixers(3)
+    model = build_multi_mixer_model(composition, mixers)
+    relabel = symmetric_relabel(ASSIGNMENT, mixers, list(model.PROD))
+    relabelled = {p: relabel[m] for p, m in ASSIGNMENT.items()}
+    # Groups in order of their first product: {A, C}, {B, E}, {D}
+    assert relabelled == {'A': 'M1', 'B': 'M2', 'C': 'M1', 'D': 'M3', 'E': 'M2'}
+    fix_assignment(model, ASSIGNMENT, fix_order=False)
+    assert _symmetry_violation(model) > 0
+    fix_assignment(model, relabelled, fix_order=False)
+    assert _symmetry_violation(model) <= 0
+
+
+def test_symmetric_relabel_keeps_distinct_mixers_apart():
+    mixers = [MixerSpec('M1'), MixerSpec('M2', quality_threshold=8), MixerSpec('M3', quality_threshold=8)]
+    assert symmetric_relabel(ASSIGNMENT, mixers, list(ASSIGNMENT)) == {'M1': 'M1', 'M3': 'M2', 'M2': 'M3'}
+
+
+class _Session:
+    # Stands in for SolverSession: every solve loads the next share matrix, an empty one fails
+    def __init__(self, model, shares):
+        self.model = model
+        self.shares = list(shares)
+        self.solves = 0
+
+    def solve(self, warm_start=False):
+        self.solves += 1
+        shares = self.shares.pop(0)
+        for (p, m), share in shares.items():
+            self.model.Mixer_Share[p, m].set_value(share)
+        condition = TerminationCondition.optimal if shares else TerminationCondition.infeasible
+        return types.SimpleNamespace(solver=types.SimpleNamespace(termination_condition=condition))
+
+
+def _shares(model, favourite):
+    # Share 0.6 on the favourite mixer of each product, 0.2 on the others
+    return {(p, m): 0.6 if m == favourite.get(p) else 0.2 for p in model.PROD for m in model.MIXER}
+
+
+def test_relax_and_fix_assigns_every_product_once(composition):
+    model = build_multi_mixer_model(composition, identical_mixers(2))
+    favourite = {'A': 'M2', 'B': 'M2', 'C': 'M1', 'D': 'M1', 'E': 'M2'}
+    session = _Session(model, [_shares(model, favourite)] * 3)
+    assignment = relax_and_fix(model, session, batch=2)
+    assert assignment == favourite
+    assert session.solves == 3
+    assert not model.mixer_symmetry.active
+    for p in model.PROD:
+        assert [value(model.Mixer_Assign[p, m]) for m in model.MIXER].count(1) == 1
+        assert all(model.Mixer_Assign[p, m].fixed for m in model.MIXER)
+    assert all(var.domain is Binary for var in model.Mixer_Assign.values())
+
+
+def test_relax_and_fix_fixes_the_rest_after_a_failed_solve(composition):
+    model = build_multi_mixer_model(composition, identical_mixers(2))
+    favourite = {p: 'M1' for p in model.PROD}
+    session = _Session(model, [_shares(model, favourite), {}])
+    assignment = relax_and_fix(model, session, batch=1)
+    assert session.solves == 2
+    assert set(assignment) == set(model.PROD)
+
+
+def test_multi_mixer_groups_are_feasible(composition):
+    pytest.importorskip('scipy')
+    result, model = multi_mixer_solve(composition, identical_mixers(2), max_workers=2, iterations=0)
+    assert result.feasible
+    assert result.max_violation == pytest.approx(max_violation(model))
+    assert result.max_violation <= TOL
+    assert _symmetry_violation(model) <= 0
+    assert sorted(set(result.assignment.values())) == ['M1', 'M2']
+
+
+@pytest.mark.skipif(not available_backends(), reason='needs an Ipopt backend')
+def test_relax_and_fix_solution_is_feasible(composition):
+    result, model = multi_mixer_solve(composition, identical_mixers(2), strategy='relax_and_fix',
+                                      solver_config=SolverConfig(), max_workers=2)
+    assert result.feasible
+    assert max_violation(model) <= TOL
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+from pyomo.environ import value
+
+from portfolio_optimisation import multistart
+from portfolio_optimisation.multistart import sample_starts
+
+
+def test_starts_satisfy_the_recipe_constraints(model):
+    rms, prods = list(model.RM), list(model.PROD)
+    for point in sample_starts(model, 8, seed=0):
+        assert point['Mixer_RM_qty'].sum() == pytest.approx(1.0)
+        np.testing.assert_allclose(point['prod_RM_qty'].sum(axis=1) + point['Mixer_Level'], 1.0)
+        for j, rm in enumerate(rms):
+            if rm in model.mixer_component:
+                assert point['Mixer_RM_qty'][j] == 0
+            if rm in model.mixer_lower_bound:
+                assert point['Mixer_RM_qty'][j] >= value(model.mixer_lower_bound[rm].lower)
+        for i, p in enumerate(prods):
+            for j, rm in enumerate(rms):
+                if (p, rm) in model.prod_component:
+                    assert point['prod_RM_qty'][i, j] == 0
+
+
+def test_best_is_none_when_no_start_solves(composition, build_kwargs):
+    result = multistart(composition, n_starts=2, max_workers=1, seed=0,
+                        solver_kwargs={'executable': '/nonexistent/ipopt'}, **build_kwargs)
+    assert result.best is None
+    assert len(result.runs) == 2
+    assert all(r.status.startswith('error') for r in result.runs)
+    assert result.objectives.size == 0
@@ -0,0 +1,43 @@
+import pytest
+from pyomo.environ import Constraint, Var
+
+from portfolio_optimisation import presolve
+
+
+def _state(model):
+    # Bounds and fixed flags of every variable, and which constraints are active
+    return ({var.name: (var.lb, var.ub, var.fixed) for var in model.component_data_objects(Var)},
+            {con.name: con.active for con in model.component_data_objects(Constraint)})
+
+
+def test_forbidden_rms_are_fixed_and_their_rows_dropped(model):
+    result = presolve(model)
+    for rm in model.mixer_component:
+        assert model.Mixer_RM_qty[rm].fixed and model.Mixer_RM_qty[rm].value == 0
+        assert not model.mixer_component[rm].active
+    for prod, rm in model.prod_component:
+        assert model.prod_RM_qty[prod, rm].fixed
+    assert len(result.fixed) == len(model.mixer_component) + len(model.prod_component)
+
+
+def test_mixer_lower_bounds_cap_the_other_mixer_rms(model):
+    presolve(model)
+    # The mixer lower bounds sum to 0.325, so no other mixer RM can exceed 0.675
+    assert model.Mixer_RM_qty['RM_01'].ub == pytest.approx(0.675)
+    assert model.Mixer_RM_qty['RM_05'].lb == pytest.approx(0.25)
+
+
+def test_undo_restores_the_model(model):
+    before = _state(model)
+    result = presolve(model)
+    assert _state(model) != before
+    result.undo()
+    assert _state(model) == before
+    assert result.tightened == 0 and not result.fixed and not result.deactivated
+
+
+def test_contradicting_rows_are_reported(model):
+    # The other mixer lower bounds leave at most 0.925 for RM_05
+    model.too_much_rm_05 = Constraint(expr=model.Mixer_RM_qty['RM_05'] >= 0.95)
+    with pytest.raises(ValueError, match='empty range'):
+        presolve(model)
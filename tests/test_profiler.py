@@ -0,0 +1,43 @@
+from pyomo.environ import ConcreteModel, Constraint, Expression, Objective, Var
+
+from portfolio_optimisation import profile_model
+from portfolio_optimisation.profiler import OTHER
+
+
+def _small_model():
+    m = ConcreteModel()
+    m.x, m.y, m.z = Var(), Var(), Var()
+    m.e = Expression(expr=m.x * m.y)
+    m.c = Constraint(expr=m.e + 2 * m.z <= 1)
+    m.o = Objective(expr=m.z ** 2)
+    return m
+
+
+def test_counts_of_a_small_model():
+    profiles = {p.name: p for p in profile_model(_small_model())}
+    assert list(profiles) == ['e', 'c', 'o', OTHER]
+    e, c, o = profiles['e'], profiles['c'], profiles['o']
+    assert (e.nodes, e.nonlinear_terms, e.variables) == (3, 1, 2)
+    # The named Expression is one node of c, but its variables and nonlinearity carry through
+    assert (c.nodes, c.nonlinear_terms, c.variables, c.jacobian_nnz, c.hessian_nnz) == (5, 0, 3, 3, 3)
+    assert (o.nonlinear_terms, o.variables, o.jacobian_nnz, o.hessian_nnz) == (1, 1, 0, 1)
+    assert all(p.nl_bytes > 0 for p in profiles.values())
+
+
+def test_fixed_variables_are_not_counted():
+    m = _small_model()
+    m.z.fix(0.5)
+    profiles = {p.name: p for p in profile_model(m, nl=False)}
+    assert (profiles['c'].variables, profiles['c'].jacobian_nnz) == (2, 2)
+    assert (profiles['o'].variables, profiles['o'].nonlinear_terms, profiles['o'].hessian_nnz) == (0, 0, 0)
+    assert OTHER not in profiles
+
+
+def test_rows_of_the_portfolio_model(model):
+    profiles = {p.name: p for p in profile_model(model)}
+    assert profiles['Total_Prod_SUB'].rows == len(model.PROD) * len(model.SUB)
+    assert profiles['objective'].rows == 1
+    # Every active constraint shows up in the .nl file
+    for p in profiles.values():
+        if p.kind == 'constraint':
+            assert p.nl_bytes > 0, p.name
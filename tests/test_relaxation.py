@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from portfolio_optimisation import build_model, gap_certificate
+
+pytest.importorskip('scipy')
+
+from portfolio_optimisation.heuristic import heuristic_start  # noqa: E402
+
+
+def test_lower_bound_is_below_a_feasible_heuristic_objective(model):
+    start = heuristic_start(model, quick=True)
+    assert start.max_violation <= 1e-6
+    certificate = gap_certificate(model, start.objective, obbt_rounds=1, max_workers=1)
+    assert certificate.status in ('bounded', 'pruned')
+    assert certificate.lower_bound <= start.objective + 1e-6
+    assert certificate.gap >= 0
+    # Bound tightening never loosens the bound
+    assert np.all(np.diff(certificate.history) >= -1e-9)
+
+
+def test_root_bound_without_incumbent(model):
+    certificate = gap_certificate(model, obbt_rounds=0, max_workers=1)
+    assert certificate.status == 'bounded'
+    assert np.isnan(certificate.gap)
+    assert certificate.lps == 1
+
+
+def test_infeasible_incumbent_of_an_infeasible_model_is_not_pruned(composition, build_kwargs):
+    model = build_model(composition, contaminant_limit=3.0, **build_kwargs)
+    start = heuristic_start(model, quick=True)
+    assert start.max_violation > 1e-6
+    for upper_bound in (None, start.objective):
+        certificate = gap_certificate(model, upper_bound, obbt_rounds=1, max_workers=1)
+        assert certificate.status == 'infeasible'
+        assert certificate.lower_bound == np.inf
+
+
+def test_incumbent_below_the_bound_gives_a_negative_gap(model):
+    certificate = gap_certificate(model, 0.5, obbt_rounds=1, max_workers=1)
+    assert certificate.status == 'bounded'
+    assert certificate.gap < 0
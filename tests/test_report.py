@@ -0,0 +1,69 @@
+import importlib
+
+import numpy as np
+import pytest
+
+from portfolio_optimisation import extract_result, render_figures, set_point, update_parameters, write_report
+from portfolio_optimisation.scenarios import _base_values, _recipe_columns, to_updates
+
+pytest.importorskip('matplotlib')
+
+# The module, not the report() function the package exports under the same name
+report_module = importlib.import_module('portfolio_optimisation.report')
+
+SCENARIO = {'scenario': 3, 'mixer_costs.RM_01': 900, 'post_mixer_costs.RM_07': 3000, 'sri_thresholds.A': 50,
+            'mixer_quality_threshold': 9.5, 'contaminant_limit': 5.0}
+
+
+@pytest.fixture
+def result(model, random_point):
+    set_point(model, random_point(model))
+    return extract_result(model)
+
+
+def test_render_figures_draws_every_chart(result):
+    assert len(render_figures(result)) == len(result.prods) + 3
+
+
+@pytest.mark.parametrize('fmt', ['pdf', 'html'])
+def test_write_report(tmp_path, result, fmt):
+    path = write_report(result, str(tmp_path / f'report.{fmt}'), title='Scenario 7')
+    with open(path, 'rb') as f:
+        content = f.read()
+    assert content.startswith(b'%PDF' if fmt == 'pdf' else b'<!DOCTYPE html>')
+    if fmt == 'html':
+        assert content.count(b'<img') == len(result.prods) + 3
+        assert b'Scenario 7' in content
+
+
+def test_write_report_rejects_other_formats(tmp_path, result):
+    with pytest.raises(ValueError):
+        write_report(result, str(tmp_path / 'report.png'))
+
+
+def test_updates_round_trip_through_the_model(model):
+    base = _base_values(model, [SCENARIO])
+    update_parameters(model, **to_updates(SCENARIO))
+    assert _base_values(model, [SCENARIO]) == {k: float(v) for k, v in SCENARIO.items() if k != 'scenario'}
+    update_parameters(model, **to_updates(base))
+    assert _base_values(model, [SCENARIO]) == base
+
+
+def test_scenario_report_shows_the_row_parameters(monkeypatch, composition, build_kwargs, model, random_point):
+    written = []
+    monkeypatch.setattr(report_module, 'write_report', lambda result, path, title: written.append(result))
+    base = _base_values(model, [SCENARIO])
+    set_point(model, random_point(model))
+    row = {**SCENARIO, 'status': 'optimal', 'objective': 7.5, **_recipe_columns(model)}
+    report_module._init_worker(composition, build_kwargs, base)
+    report_module._scenario_report(row, 'scenario_3.pdf')
+    # The next row with the base parameters must not inherit the previous row's values
+    report_module._scenario_report({**row, **base, 'scenario': 4}, 'scenario_4.pdf')
+
+    first, second = written
+    assert first.objective == 7.5
+    assert first.contaminant_limit == 5.0
+    assert first.sri_threshold[list(first.prods).index('A')] == 50
+    assert second.contaminant_limit == base['contaminant_limit']
+    assert second.sri_threshold[list(second.prods).index('A')] == base['sri_thresholds.A']
+    np.testing.assert_array_equal(first.mixer, second.mixer)
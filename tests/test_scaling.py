@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+from pyomo.environ import Constraint, Objective, TransformationFactory, value
+
+from portfolio_optimisation import (
+    DEFAULT_LEVEL_PAIRS, BatchEvaluator, SolverConfig, SolverSession, apply_scaling, available_backends,
+    build_model, default_products, extract_result, get_point, heuristic_start, is_optimal, presolve, scaled_solve,
+    scaling_factors, set_point
+)
+from portfolio_optimisation.scaling import MAX_VARIABLE_SCALE
+from portfolio_optimisation.solve import SCALING_BACKENDS
+
+TOL = 1e-6
+
+
+@pytest.fixture(scope='module')
+def start(composition):
+    # A feasible point of the presolved default model, shared by the tests below
+    pytest.importorskip('scipy')
+    model = build_model(composition, products=default_products(), level_pairs=list(DEFAULT_LEVEL_PAIRS))
+    presolve(model)
+    result = heuristic_start(model, quick=True)
+    assert result.max_violation <= TOL
+    return result
+
+
+@pytest.fixture
+def presolved(model):
+    presolve(model)
+    return model
+
+
+def _max_violation(model):
+    point = get_point(model)
+    out = BatchEvaluator(model).evaluate(point['Mixer_RM_qty'], point['Mixer_Level'], point['prod_RM_qty'])
+    return out['max_violation'][0]
+
+
+def test_factors_are_positive_and_bounded(presolved):
+    scaling = scaling_factors(presolved)
+    factors = np.array(list(scaling.variables.values()))
+    assert factors.size and np.all((factors >= 1) & (factors <= MAX_VARIABLE_SCALE))
+    factors = np.array(list(scaling.constraints.values()))
+    assert factors.size and np.all(np.isfinite(factors) & (factors > 0))
+    assert 0 < scaling.objective <= 1
+    # Forbidden RMs are fixed at zero by presolve and keep factor 1
+    assert not any(presolved.Mixer_RM_qty[rm] in scaling.variables for rm in presolved.mixer_component)
+
+
+def test_apply_scaling_replaces_the_suffix(presolved):
+    scaling = apply_scaling(presolved)
+    expected = len(scaling.variables) + len(scaling.constraints) + 1
+    assert len(presolved.scaling_factor) == expected
+    scaling.constraints.clear()
+    apply_scaling(presolved, scaling)
+    assert len(presolved.scaling_factor) == len(scaling.variables) + 1
+
+
+def test_scaling_keeps_feasibility_and_objective(composition, build_kwargs, start):
+    model = build_model(composition, **build_kwargs)
+    presolve(model)
+    set_point(model, start.point)
+    scaling = apply_scaling(model)
+    transform = TransformationFactory('core.scale_model')
+    scaled = transform.create_using(model, rename=False)
+
+    # The scaled objective and every scaled row are the original ones times their factor
+    assert value(next(scaled.component_data_objects(Objective, active=True))) == pytest.approx(
+        scaling.objective * start.objective, rel=1e-12)
+    for con in model.component_data_objects(Constraint, active=True):
+        factor = scaling.constraints.get(con, 1.0)
+        twin = scaled.find_component(con.name)
+        assert value(twin.body) == pytest.approx(factor * value(con.body), rel=1e-9, abs=1e-12)
+        for bound in ('lower', 'upper'):
+            if getattr(con, bound) is not None:
+                assert value(getattr(twin, bound)) == pytest.approx(factor * value(getattr(con, bound)))
+
+    # A point of the scaled model maps back onto the same recipe, objective and violation
+    fresh = build_model(composition, **build_kwargs)
+    presolve(fresh)
+    transform.propagate_solution(scaled, fresh)
+    for name, array in get_point(fresh).items():
+        np.testing.assert_allclose(array, start.point[name], rtol=1e-12, atol=1e-15)
+    assert value(fresh.objective) == pytest.approx(start.objective, rel=1e-12)
+    assert _max_violation(fresh) <= TOL
+
+
+@pytest.mark.skipif(not available_backends(), reason='needs an Ipopt backend')
+def test_scaled_solves_reach_the_unscaled_optimum(composition, build_kwargs, start):
+    methods = ['unscaled', 'scaled_solve']
+    if set(available_backends()) & set(SCALING_BACKENDS):
+        methods.append('suffix')
+    solutions = {}
+    for method in methods:
+        config = SolverConfig(scaling=method == 'suffix')
+        model = build_model(composition, **build_kwargs)
+        presolve(model)
+        set_point(model, start.point)
+        if method == 'scaled_solve':
+            result = scaled_solve(model, config.create())
+        else:
+            result = SolverSession(model, config).solve()
+        assert is_optimal(result), method
+        solutions[method] = extract_result(model)
+    for method, solution in solutions.items():
+        assert solution.max_violation <= TOL, method
+        assert solution.objective == pytest.approx(solutions['unscaled'].objective, rel=1e-6), method
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from portfolio_optimisation import get_point, scenario_grid, set_point
+from portfolio_optimisation.scenarios import _recipe_columns, point_from_row, to_updates
+
+SCENARIO = {'scenario': 3, 'mixer_costs.RM_01': 900, 'post_mixer_costs.RM_07': 3000, 'sri_thresholds.A': 50,
+            'mixer_quality_threshold': 9.5, 'contaminant_limit': 5.0}
+
+
+def test_to_updates():
+    assert to_updates(SCENARIO) == {
+        'mixer_costs': {'RM_01': 900.0}, 'post_mixer_costs': {'RM_07': 3000.0}, 'sri_thresholds': {'A': 50.0},
+        'mixer_quality_threshold': 9.5, 'contaminant_limit': 5.0,
+    }
+
+
+@pytest.mark.parametrize('column', ['mixer_costs', 'contaminant_limit.A', 'unknown.RM_01'])
+def test_to_updates_rejects_unknown_columns(column):
+    with pytest.raises(ValueError):
+        to_updates({column: 1.0})
+
+
+def test_point_from_row_round_trip(model, random_point):
+    point = random_point(model)
+    set_point(model, point)
+    row = {'scenario': 0, 'status': 'optimal', **_recipe_columns(model)}
+    for name, array in point_from_row(model, row).items():
+        np.testing.assert_array_equal(array, point[name])
+        np.testing.assert_array_equal(array, get_point(model)[name])
+
+
+def test_scenario_grid_varies_the_last_axis_fastest():
+    grid = scenario_grid(**{'mixer_costs.RM_01': [700, 800], 'contaminant_limit': [5.0, 5.25, 5.5]})
+    assert len(grid) == 6
+    assert [s['scenario'] for s in grid] == list(range(6))
+    assert [s['contaminant_limit'] for s in grid[:3]] == [5.0, 5.25, 5.5]
+    assert {s['mixer_costs.RM_01'] for s in grid[:3]} == {700}
@@ -0,0 +1,146 @@
+import numpy as np
+import pytest
+from pyomo.environ import ConcreteModel, Var, value
+
+from portfolio_optimisation import QuadraticSurface
+from portfolio_optimisation.surrogate import MODEL_1, MODEL_2, MODEL_3, MODEL_5
+
+
+# The hand-written polynomials the surfaces replaced, over a dict of feature values
+def _model_5(x):
+    # The bracket of model_5 inside its SUB_02 switch
+    return (
+        2 + 55 * (x['SUB_07'] / 0.05 * 0.75) - 31 * x['SUB_03'] + 172 * x['SUB_26'] + 172 * x['RM_06'] * 0.005
+        + 69 * x['SUB_10'] - 320 * (x['SUB_09'] / 0.48 * 0.4794) - 9 * x['SUB_15'] + 20 * x['SUB_14']
+        - 20 * (x['SUB_07'] / 0.05 * 0.0018) + 57 * x['SUB_23'] + 10 * x['SUB_13'] - 44 * x['SUB_22']
+        - 60 * x['SUB_12'] + 9 * x['SUB_11'] - 618 * (x['SUB_07'] / 0.05 * 0.75) * (x['SUB_07'] / 0.05 * 0.75)
+        - 976 * x['SUB_03'] * x['SUB_03'] - 2120 * x['SUB_26'] * x['SUB_26']
+        - 2120 * 2 * x['SUB_26'] * x['RM_06'] * 0.005 - 2120 * x['RM_06'] * x['RM_06'] * 0.005 * 0.005
+        + 1425 * x['SUB_10'] * x['SUB_10'] + 187 * (x['SUB_09'] / 0.48 * 0.47) * (x['SUB_09'] / 0.48 * 0.47)
+        - 206 * x['SUB_15'] * x['SUB_15'] - 339 * x['SUB_14'] * x['SUB_14']
+        + 339 * 2 * x['SUB_14'] * (x['SUB_07'] / 0.05 * 0.0018)
+        - 339 * (x['SUB_07'] / 0.05 * 0.0018) * (x['SUB_07'] / 0.05 * 0.0018) - 287 * x['SUB_23'] * x['SUB_23']
+        + 145 * x['SUB_13'] * x['SUB_13'] + 12 * x['SUB_22'] * x['SUB_22'] + 2145 * x['SUB_12'] * x['SUB_12']
+        + 2 * x['SUB_11'] * x['SUB_11'] + 1110 * (x['SUB_07'] / 0.05 * 0.75) * x['SUB_03']
+        + 682 * (x['SUB_07'] / 0.05 * 0.75) * x['SUB_26']
+        + 682 * (x['SUB_07'] / 0.05 * 0.75) * x['RM_06'] * 0.005
+        + 666 * (x['SUB_07'] / 0.05 * 0.75) * x['SUB_10']
+        - 2222 * (x['SUB_07'] / 0.05 * 0.75) * (x['SUB_09'] / 0.48 * 0.48)
+        - 541 * (x['SUB_07'] / 0.05 * 0.75) * x['SUB_15'] + 835 * (x['SUB_07'] / 0.05 * 0.75) * x['SUB_14']
+        - 835 * (x['SUB_07'] / 0.05 * 0.75) * (x['SUB_07'] / 0.05 * 0.0018)
+        - 215 * (x['SUB_07'] / 0.05 * 0.75) * x['SUB_23'] + 402 * (x['SUB_07'] / 0.05 * 0.75) * x['SUB_13']
+        + 176 * (x['SUB_07'] / 0.05 * 0.75) * x['SUB_22'] + 111 * (x['SUB_07'] / 0.05 * 0.75) * x['SUB_12']
+        - 317 * (x['SUB_07'] / 0.05 * 0.75) * x['SUB_11'] - 4235 * x['SUB_03'] * x['SUB_26']
+        - 4235 * x['SUB_03'] * x['RM_06'] * 0.005 + 640 * x['SUB_03'] * x['SUB_10']
+        + 2235 * x['SUB_03'] * (x['SUB_09'] / 0.48 * 0.48) - 2 * x['SUB_03'] * x['SUB_15']
+        + 1191 * x['SUB_03'] * x['SUB_14'] - 1191 * x['SUB_03'] * (x['SUB_07'] / 0.05 * 0.0018)
+        + 896 * x['SUB_03'] * x['SUB_23'] - 2136 * x['SUB_03'] * x['SUB_13'] - 30 * x['SUB_03'] * x['SUB_22']
+        + 422 * x['SUB_03'] * x['SUB_12'] + 345 * x['SUB_03'] * x['SUB_11'] - 618 * x['SUB_26'] * x['SUB_10']
+        - 618 * x['RM_06'] * 0.005 * x['SUB_10'] - 6484 * x['SUB_26'] * (x['SUB_09'] / 0.48 * 0.48)
+        - 6484 * x['RM_06'] * 0.005 * (x['SUB_09'] / 0.48 * 0.48) - 394 * x['SUB_26'] * x['SUB_15']
+        - 394 * x['RM_06'] * 0.005 * x['SUB_15'] - 1601 * x['SUB_26'] * x['SUB_14']
+        - 1601 * x['RM_06'] * 0.005 * x['SUB_14'] + 1601 * x['SUB_26'] * (x['SUB_07'] / 0.05 * 0.0018)
+        + 1601 * x['RM_06'] * 0.005 * (x['SUB_07'] / 0.05 * 0.0018) - 1443 * x['SUB_26'] * x['SUB_23']
+        - 1443 * x['RM_06'] * 0.005 * x['SUB_23'] + 2012 * x['SUB_26'] * x['SUB_13']
+        + 2012 * x['RM_06'] * 0.005 * x['SUB_13'] + 1270 * x['SUB_26'] * x['SUB_22']
+        + 1270 * x['RM_06'] * 0.005 * x['SUB_22'] + 2190 * x['SUB_26'] * x['SUB_12']
+        + 2190 * x['RM_06'] * 0.005 * x['SUB_12'] + 614 * x['SUB_26'] * x['SUB_11']
+        + 614 * x['RM_06'] * 0.005 * x['SUB_11'] + 274 * x['SUB_10'] * (x['SUB_09'] / 0.48 * 0.48)
+        + 145 * x['SUB_10'] * x['SUB_15'] + 703 * x['SUB_10'] * x['SUB_14']
+        - 703 * x['SUB_10'] * (x['SUB_07'] / 0.05 * 0.0018) - 218 * x['SUB_10'] * x['SUB_23']
+        - 3414 * x['SUB_10'] * x['SUB_13'] - 558 * x['SUB_10'] * x['SUB_22'] - 784 * x['SUB_10'] * x['SUB_12']
+        - 428 * x['SUB_10'] * x['SUB_11'] + 178 * (x['SUB_09'] / 0.48 * 0.48) * x['SUB_15']
+        + 3245 * (x['SUB_09'] / 0.48 * 0.48) * x['SUB_14']
+        - 3245 * (x['SUB_09'] / 0.48 * 0.48) * (x['SUB_07'] / 0.05 * 0.0018)
+        + 920 * (x['SUB_09'] / 0.48 * 0.48) * x['SUB_23'] - 5576 * (x['SUB_09'] / 0.48 * 0.48) * x['SUB_13']
+        - 1995 * (x['SUB_09'] / 0.48 * 0.48) * x['SUB_22'] + 5996 * (x['SUB_09'] / 0.48 * 0.48) * x['SUB_12']
+        + 1890 * (x['SUB_09'] / 0.48 * 0.48) * x['SUB_11'] + 334 * x['SUB_15'] * x['SUB_14']
+        - 334 * x['SUB_15'] * (x['SUB_07'] / 0.05 * 0.0018) - 94 * x['SUB_15'] * x['SUB_23']
+        + 1306 * x['SUB_15'] * x['SUB_13'] + 426 * x['SUB_15'] * x['SUB_22'] + 521 * x['SUB_15'] * x['SUB_12']
+        - 105 * x['SUB_15'] * x['SUB_11'] - 5 * x['SUB_14'] * x['SUB_23']
+        + 5 * (x['SUB_07'] / 0.05 * 0.0018) * x['SUB_23'] - 3328 * x['SUB_14'] * x['SUB_13']
+        - 3328 * (x['SUB_07'] / 0.05 * 0.0018) * x['SUB_13'] + 937 * x['SUB_14'] * x['SUB_22']
+        - 937 * (x['SUB_07'] / 0.05 * 0.0018) * x['SUB_22'] - 1170 * x['SUB_14'] * x['SUB_12']
+        + 1170 * (x['SUB_07'] / 0.05 * 0.0018) * x['SUB_12'] - 94 * x['SUB_14'] * x['SUB_11']
+        + 94 * (x['SUB_07'] / 0.05 * 0.0018) * x['SUB_11'] + 357 * x['SUB_23'] * x['SUB_13']
+        + 303 * x['SUB_23'] * x['SUB_22'] + 552 * x['SUB_23'] * x['SUB_12'] - 206 * x['SUB_23'] * x['SUB_11']
+        + 173 * x['SUB_13'] * x['SUB_22'] - 4444 * x['SUB_13'] * x['SUB_12'] + 996 * x['SUB_13'] * x['SUB_11']
+        - 985 * x['SUB_22'] * x['SUB_12'] + 122 * x['SUB_22'] * x['SUB_11'] - 65 * x['SUB_12'] * x['SUB_11']
+    )
+
+
+def _model_1(x):
+    return (
+        53 - 6 * x['SUB_11'] - 5 * x['SUB_02'] + 1172 * x['SUB_01'] - 400 * x['SUB_09'] + 1874 * x['SUB_18']
+        + 23 * x['SUB_27'] + 183510 * x['SUB_19'] - 2038 * x['SUB_27'] * x['SUB_27']
+        - 199367 * x['SUB_18'] * x['SUB_18'] + 2561 * x['SUB_27'] * x['SUB_09']
+        + 130 * x['SUB_11'] * x['SUB_09'] + 2592 * x['SUB_09'] * x['SUB_09']
+        - 103429177 * x['SUB_19'] * x['SUB_19'] - 1048878 * x['SUB_19'] * x['SUB_18']
+    )
+
+
+def _model_2(x):
+    return (
+        29 + 51 * x['SUB_21'] + 42 * x['SUB_15'] + 15 * x['SUB_23'] + 25 * x['SUB_11'] + 51 * x['SUB_02']
+        + 121 * x['SUB_16'] - 139 * x['SUB_24'] - 30 * x['SUB_26'] - 80 * x['SUB_09'] + 231 * x['SUB_27']
+        - 23 * x['SUB_21'] * x['SUB_21'] - 36 * x['SUB_21'] * x['SUB_15'] - 27 * x['SUB_21'] * x['SUB_23']
+        - 21 * x['SUB_21'] * x['SUB_02'] - 37 * x['SUB_15'] * x['SUB_02'] - 36 * x['SUB_23'] * x['SUB_23']
+        - 14 * x['SUB_23'] * x['SUB_11'] - 1602 * x['SUB_16'] * x['SUB_16'] + 29 * x['SUB_21'] * x['SUB_24']
+        - 5 * x['SUB_21'] * x['SUB_11'] + 178 * x['SUB_24'] * x['SUB_16'] + 54 * x['SUB_24'] * x['SUB_26']
+        - 25 * x['SUB_15'] * x['SUB_11'] - 2912 * x['SUB_27'] * x['SUB_27'] + 68 * x['SUB_27'] * x['SUB_11']
+        - 20 * x['SUB_11'] * x['SUB_02'] + 85 * x['SUB_24'] * x['SUB_27'] - 16 * x['SUB_15'] * x['SUB_15']
+        + 86 * x['SUB_27'] * x['SUB_23'] - 50 * x['SUB_27'] * x['SUB_02'] + 222 * x['SUB_27'] * x['SUB_26']
+        + 1447 * x['SUB_27'] * x['SUB_09'] - 57 * x['SUB_11'] * x['SUB_16'] + 37 * x['SUB_11'] * x['SUB_26']
+    )
+
+
+def _model_3(x):
+    return (
+        9 + 12 * x['SUB_21'] - 0.5 * x['SUB_15'] + 10 * x['SUB_23'] + 7 * x['SUB_11'] + 12 * x['SUB_02']
+        + 34 * x['SUB_03'] - 13976 * x['SUB_01'] + 9 * x['SUB_26'] + 4069 * x['SUB_18']
+        - 8 * x['SUB_21'] * x['SUB_21'] - 2 * x['SUB_21'] * x['SUB_15'] - 23 * x['SUB_21'] * x['SUB_23']
+        - 8 * x['SUB_21'] * x['SUB_02'] - 7 * x['SUB_15'] * x['SUB_02'] + 1754 * x['SUB_15'] * x['SUB_18']
+        + 0.4 * x['SUB_23'] * x['SUB_03'] + 120 * x['SUB_26'] * x['SUB_26']
+        + 17776885 * x['SUB_01'] * x['SUB_01'] - 7 * x['SUB_11'] * x['SUB_02']
+        - 364999 * x['SUB_18'] * x['SUB_18'] - 564 * x['SUB_03'] * x['SUB_03']
+    )
+
+
+SURFACES = [(MODEL_5, _model_5), (MODEL_1, _model_1), (MODEL_2, _model_2), (MODEL_3, _model_3)]
+
+
+def _points(surface, n=16, seed=0):
+    # SUB totals and RM quantities of a recipe stay well inside [0, 0.1]
+    return np.random.default_rng(seed).random((n, len(surface.features))) * 0.1
+
+
+@pytest.mark.parametrize('surface, polynomial', SURFACES)
+def test_evaluate_matches_the_original_polynomial(surface, polynomial):
+    X = _points(surface)
+    expected = [polynomial(dict(zip(surface.features, x))) for x in X]
+    np.testing.assert_allclose(surface.evaluate(X), expected, rtol=1e-9, atol=1e-9)
+
+
+@pytest.mark.parametrize('surface, polynomial', SURFACES)
+def test_expression_matches_evaluate(surface, polynomial):
+    m = ConcreteModel()
+    m.x = Var(surface.features)
+    expr = surface.expression(lambda f: m.x[f])
+    for x in _points(surface, n=4):
+        for f, v in zip(surface.features, x):
+            m.x[f].set_value(v)
+        assert value(expr) == pytest.approx(surface.evaluate(x), rel=1e-12)
+        assert value(expr) == pytest.approx(polynomial(dict(zip(surface.features, x))), rel=1e-9)
+
+
+def test_gradient_matches_finite_differences():
+    x = _points(MODEL_1, n=1)[0]
+    h = 1e-7
+    numeric = [(MODEL_1.evaluate(x + h * e) - MODEL_1.evaluate(x - h * e)) / (2 * h)
+               for e in np.eye(len(x))]
+    np.testing.assert_allclose(MODEL_1.gradient(x), numeric, rtol=1e-5, atol=1e-3)
+
+
+def test_asymmetric_quadratic_is_rejected():
+    with pytest.raises(ValueError):
+        QuadraticSurface(['a', 'b'], 0.0, [0.0, 0.0], [[1.0, 2.0], [0.0, 1.0]])